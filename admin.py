@@ -1,10 +1,66 @@
+import base64
+from datetime import datetime
+
 from flask import Blueprint, render_template, redirect, url_for, request, session, flash
+from sqlalchemy import and_, case, func, or_
 from werkzeug.security import check_password_hash
+from hash_contrasenas import ServicioSaturado
 from models import db, User
 
+USUARIOS_POR_PAGINA = 50
+MAX_USUARIOS_POR_PAGINA = 200
+
 # Funciones auxiliares para gestión de usuarios
-def get_all_users():
-    return User.query.all()
+def codificar_cursor(user):
+    """Cursor opaco con la clave (created_at, id) del último usuario de la página"""
+    crudo = f"{user.created_at.isoformat()}|{user.id}"
+    return base64.urlsafe_b64encode(crudo.encode('utf-8')).decode('ascii')
+
+def decodificar_cursor(cursor):
+    """(created_at, id) del cursor, o None si no es válido"""
+    try:
+        creado, user_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|', 1)
+        return datetime.fromisoformat(creado), user_id
+    except (ValueError, UnicodeError, AttributeError):
+        return None
+
+def filtro_email(prefijo):
+    """Filtro por prefijo de email (LIKE 'prefijo%' sobre el índice de email)"""
+    prefijo = (prefijo or '').strip().lower()
+    return User.email.startswith(prefijo, autoescape=True) if prefijo else None
+
+def get_users_page(despues=None, prefijo_email=None, por_pagina=USUARIOS_POR_PAGINA):
+    """Página de usuarios, más recientes primero, por keyset sobre (created_at, id).
+
+    Devuelve (usuarios, cursor de la página siguiente o None). Solo se leen
+    por_pagina + 1 filas, sea cual sea el tamaño de la tabla.
+    """
+    consulta = User.query
+    filtro = filtro_email(prefijo_email)
+    if filtro is not None:
+        consulta = consulta.filter(filtro)
+    clave = decodificar_cursor(despues) if despues else None
+    if clave:
+        creado, user_id = clave
+        consulta = consulta.filter(or_(User.created_at < creado,
+                                       and_(User.created_at == creado, User.id < user_id)))
+    usuarios = consulta.order_by(User.created_at.desc(), User.id.desc()).limit(por_pagina + 1).all()
+    siguiente = codificar_cursor(usuarios[por_pagina - 1]) if len(usuarios) > por_pagina else None
+    return usuarios[:por_pagina], siguiente
+
+def get_user_counts(prefijo_email=None):
+    """Totales del panel en una sola consulta COUNT"""
+    filtro = filtro_email(prefijo_email)
+    columnas = [
+        func.count(User.id),
+        func.count(case((User.is_active, 1))),
+        func.count(case((User.email_verified, 1))),
+        func.count(case((User.newsletter_subscription, 1))),
+        func.count(case((filtro, 1))) if filtro is not None else func.count(User.id),
+    ]
+    total, activos, verificados, newsletter, coincidencias = db.session.query(*columnas).one()
+    return {'total': total, 'activos': activos, 'verificados': verificados,
+            'newsletter': newsletter, 'coincidencias': coincidencias}
 
 def get_user_by_id(user_id):
     return User.query.get(user_id)
@@ -59,8 +115,16 @@ def admin_login():
 def admin_panel():
     if not session.get('admin_logged_in'):
         return redirect(url_for('admin.admin_login'))
-    users = get_all_users()
-    return render_template('admin.html', users=users)
+    email = request.args.get('email', '').strip()
+    despues = request.args.get('despues')
+    por_pagina = request.args.get('por_pagina', USUARIOS_POR_PAGINA, type=int)
+    por_pagina = max(1, min(por_pagina, MAX_USUARIOS_POR_PAGINA))
+    if despues and decodificar_cursor(despues) is None:
+        # Cursor roto o manipulado: a la primera página, con la URL y la paginación que le corresponden
+        return redirect(url_for('admin.admin_panel', email=email or None, por_pagina=por_pagina))
+    users, siguiente = get_users_page(despues, email, por_pagina)
+    return render_template('admin.html', users=users, siguiente=siguiente, email=email,
+                           por_pagina=por_pagina, es_primera=not despues, conteos=get_user_counts(email))
 
 @admin_bp.route('/admin/logout')
 def admin_logout():
@@ -76,11 +140,17 @@ def admin_add():
         username = request.form['username']
         email = request.form['email']
         password = request.form['password']
-        add_user(username, email, password)
+        try:
+            add_user(username, email, password)
+        except ServicioSaturado as e:
+            print(f"⏳ Alta de usuario rechazada, bcrypt saturado: {e}")
+            db.session.rollback()
+            flash('Hay muchas operaciones de contraseña en curso. Inténtalo de nuevo en unos segundos.', 'danger')
+            return redirect(url_for('admin.admin_panel'))
         return redirect(url_for('admin.admin_panel'))
     return render_template('admin_add.html')
 
-@admin_bp.route('/admin/edit/<int:user_id>', methods=['GET', 'POST'])
+@admin_bp.route('/admin/edit/<user_id>', methods=['GET', 'POST'])
 def admin_edit(user_id):
     if not session.get('admin_logged_in'):
         return redirect(url_for('admin.admin_login'))
@@ -89,11 +159,18 @@ def admin_edit(user_id):
         username = request.form['username']
         email = request.form['email']
         password = request.form['password']
-        edit_user(user_id, username, email, password)
+        try:
+            edit_user(user_id, username, email, password)
+        except ServicioSaturado as e:
+            # Deshace también el email y el nombre ya asignados
+            print(f"⏳ Edición de usuario rechazada, bcrypt saturado: {e}")
+            db.session.rollback()
+            flash('Hay muchas operaciones de contraseña en curso. Inténtalo de nuevo en unos segundos.', 'danger')
+            return redirect(url_for('admin.admin_panel'))
         return redirect(url_for('admin.admin_panel'))
     return render_template('admin_edit.html', user=user)
 
-@admin_bp.route('/admin/delete/<int:user_id>')
+@admin_bp.route('/admin/delete/<user_id>')
 def admin_delete(user_id):
     if not session.get('admin_logged_in'):
         return redirect(url_for('admin.admin_login'))
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# Almacén columnar del catálogo, mapeado en memoria
+"""
+Exporta el dataset ya preparado a un directorio columnar junto al CSV:
+
+    datos_scraping/<nombre del csv>.<firma>.columnar/
+        manifiesto.json
+        <col>.npy                          columnas numéricas
+        <col>.valores.npy, <col>.nulos.npy columnas enteras con nulos (Int64)
+        <col>.codigos.npy                  columnas de texto: código por fila (-1 = nulo)
+        <col>.offsets.npy, <col>.datos.bin diccionario de textos (buffer con offsets)
+
+Los workers abren los ``.npy`` con ``mmap_mode='r'``. El sistema operativo
+comparte esas páginas entre procesos, así que las columnas numéricas ocupan
+memoria una sola vez por máquina. El DataFrame que se devuelve es una vista
+sobre esos arrays, sin copias. Las columnas de texto se decodifican una vez
+por worker. Cada valor distinto es un único objeto ``str`` que comparten todas
+sus filas.
+
+La firma del CSV (mtime y tamaño) forma parte del nombre del directorio. Si el
+CSV cambia, se exporta un directorio nuevo y los workers que aún tengan
+mapeado el anterior siguen leyéndolo sin problemas.
+
+Si ``datos_scraping/`` no admite escritura, el almacén va al directorio de
+caché privado de la app (``Config.CACHE_DIR``, 0700). Solo se abre un almacén
+que sea del usuario de la app (o de root, que lo exporta en el build) y en el
+que nadie más pueda escribir.
+
+Uso como paso de build:
+    python almacen_columnar.py
+"""
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config_sommelier import Config
+
+VERSION_FORMATO = 3  # subir al cambiar el formato o la preparación del dataset
+MANIFIESTO = 'manifiesto.json'
+
+
+def firma_csv(ruta_csv):
+    stat = os.stat(ruta_csv)
+    return {'archivo': Path(ruta_csv).name, 'mtime_ns': stat.st_mtime_ns, 'tamaño': stat.st_size}
+
+
+def ruta_columnar(ruta_csv, directorio=None):
+    """Directorio del almacén para la versión actual del CSV y del formato (por defecto, junto al CSV)"""
+    ruta_csv = Path(ruta_csv)
+    # El formato entra en el nombre: un almacén de un formato anterior nunca ocupa el
+    # directorio del actual (el rename de exportar_columnar lo tomaría por uno válido)
+    firma = dict(firma_csv(ruta_csv), version_formato=VERSION_FORMATO)
+    sufijo = hashlib.sha1(json.dumps(firma, sort_keys=True).encode()).hexdigest()[:10]
+    return Path(directorio or ruta_csv.parent) / f"{ruta_csv.name}.{sufijo}.columnar"
+
+
+def directorios_candidatos(ruta_csv):
+    # Junto al CSV y, si ahí no se puede escribir, en la caché privada de la app
+    # (nunca en el temporal: otro usuario podría dejar ahí un almacén falso)
+    return [Path(ruta_csv).parent, Path(Config.CACHE_DIR)]
+
+
+def almacen_confiable(origen):
+    """El almacén y sus archivos son del usuario actual o de root y nadie más puede escribirlos"""
+    if not hasattr(os, 'geteuid'):
+        return True
+    try:
+        for camino in [origen, *origen.iterdir()]:
+            info = os.lstat(camino)
+            if info.st_uid not in (os.geteuid(), 0) or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+                print(f"⚠️ Almacén columnar ignorado: {camino} es de otro usuario o admite escritura de otros")
+                return False
+    except OSError:
+        return False
+    return True
+
+
+def _nombre_archivo(columna, indice):
+    # Los nombres de columna pueden tener tildes o espacios (p. ej. 'año')
+    limpio = ''.join(c if c.isascii() and (c.isalnum() or c == '_') else '_' for c in columna)
+    return f"{indice:02d}_{limpio}"
+
+
+def _escribir_textos(destino, base, valores):
+    """Diccionario de textos distintos en un buffer UTF-8 con offsets + código por fila"""
+    serie = pd.Series(valores, dtype=object)
+    nulos = serie.isna().to_numpy()
+    serie = serie.where(nulos, serie.astype(str))
+    codigos, categorias = pd.factorize(serie, use_na_sentinel=True)
+    codificados = [texto.encode('utf-8') for texto in categorias]
+    offsets = np.zeros(len(codificados) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in codificados], out=offsets[1:])
+    np.save(destino / f"{base}.codigos.npy", codigos.astype(np.int32))
+    np.save(destino / f"{base}.offsets.npy", offsets)
+    (destino / f"{base}.datos.bin").write_bytes(b''.join(codificados))
+
+
+def exportar_columnar(df, ruta_csv, destino=None):
+    """Escribe el almacén columnar del DataFrame de forma atómica y devuelve su ruta"""
+    destino = Path(destino) if destino else ruta_columnar(ruta_csv)
+    temporal = Path(tempfile.mkdtemp(prefix=f".{destino.name}.", dir=destino.parent))
+    try:
+        columnas = []
+        for indice, (columna, serie) in enumerate(df.items()):
+            base = _nombre_archivo(str(columna), indice)
+            if isinstance(serie.dtype, pd.Int64Dtype):
+                tipo = 'entero_nulable'
+                np.save(temporal / f"{base}.valores.npy", serie.to_numpy(dtype=np.int64, na_value=0))
+                np.save(temporal / f"{base}.nulos.npy", serie.isna().to_numpy())
+            elif pd.api.types.is_bool_dtype(serie.dtype) or pd.api.types.is_numeric_dtype(serie.dtype):
+                tipo = 'numerico'
+                np.save(temporal / f"{base}.npy", serie.to_numpy())
+            else:
+                tipo = 'texto'
+                _escribir_textos(temporal, base, serie.to_numpy(dtype=object))
+            columnas.append({'nombre': columna, 'archivo': base, 'tipo': tipo})
+
+        manifiesto = {
+            'version_formato': VERSION_FORMATO,
+            'filas': len(df),
+            'columnas': columnas,
+            'csv': firma_csv(ruta_csv) if ruta_csv else None,
+        }
+        (temporal / MANIFIESTO).write_text(json.dumps(manifiesto, ensure_ascii=False, indent=2), encoding='utf-8')
+        # mkdtemp crea el directorio 0700: si lo exporta root en el build, el usuario
+        # de la app no podría leerlo. Solo lectura para los demás
+        for archivo in temporal.iterdir():
+            os.chmod(archivo, 0o644)
+        os.chmod(temporal, 0o755)
+        try:
+            os.rename(temporal, destino)
+        except OSError:
+            # Otro worker lo exportó a la vez: el suyo es igual de válido (si es de fiar)
+            shutil.rmtree(temporal, ignore_errors=True)
+            if not almacen_confiable(destino):
+                raise PermissionError(f"{destino} ya existe y no es de fiar")
+    except Exception:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    print(f"💾 Almacén columnar exportado: {destino.name} ({len(df)} vinos)")
+    return destino
+
+
+def _leer_textos(origen, base):
+    codigos = np.load(origen / f"{base}.codigos.npy", mmap_mode='r')
+    offsets = np.load(origen / f"{base}.offsets.npy")
+    buffer = (origen / f"{base}.datos.bin").read_bytes()
+    # Un objeto str por valor distinto; la última posición atiende al código -1 (nulo)
+    categorias = np.empty(len(offsets), dtype=object)
+    categorias[:-1] = [buffer[inicio:fin].decode('utf-8') for inicio, fin in zip(offsets[:-1], offsets[1:])]
+    categorias[-1] = np.nan
+    return categorias[codigos]
+
+
+def abrir_columnar(origen):
+    """DataFrame de solo lectura cuyas columnas numéricas son vistas de los archivos mapeados"""
+    origen = Path(origen)
+    manifiesto = json.loads((origen / MANIFIESTO).read_text(encoding='utf-8'))
+    if manifiesto.get('version_formato') != VERSION_FORMATO:
+        raise ValueError(f"Formato columnar no soportado: {manifiesto.get('version_formato')}")
+
+    columnas = {}
+    for columna in manifiesto['columnas']:
+        base = columna['archivo']
+        if columna['tipo'] == 'numerico':
+            # Vista ndarray (sin copia) del memmap: pandas trata igual todas las columnas
+            columnas[columna['nombre']] = np.asarray(np.load(origen / f"{base}.npy", mmap_mode='r'))
+        elif columna['tipo'] == 'entero_nulable':
+            valores = np.load(origen / f"{base}.valores.npy", mmap_mode='r')
+            nulos = np.load(origen / f"{base}.nulos.npy", mmap_mode='r')
+            columnas[columna['nombre']] = pd.arrays.IntegerArray(valores, nulos)
+        else:
+            columnas[columna['nombre']] = _leer_textos(origen, base)
+    df = pd.DataFrame(columnas, copy=False)
+    if len(df) != manifiesto['filas']:
+        raise ValueError(f"Almacén columnar incompleto: {len(df)} de {manifiesto['filas']} filas")
+    return df
+
+
+def almacen_vigente(ruta_csv):
+    """Ruta del almacén si existe y corresponde al CSV actual"""
+    for directorio in directorios_candidatos(ruta_csv):
+        origen = ruta_columnar(ruta_csv, directorio)
+        try:
+            manifiesto = json.loads((origen / MANIFIESTO).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        if (manifiesto.get('version_formato') == VERSION_FORMATO and manifiesto.get('csv') == firma_csv(ruta_csv)
+                and almacen_confiable(origen)):
+            return origen
+    return None
+
+
+def asegurar_columnar(ruta_csv, preparar):
+    """Ruta del almacén vigente; si no existe, lo exporta con ``preparar(ruta_csv)``"""
+    origen = almacen_vigente(ruta_csv)
+    if origen is not None:
+        return origen
+    df = preparar(ruta_csv)
+    ultimo_error = None
+    for directorio in directorios_candidatos(ruta_csv):
+        try:
+            os.makedirs(directorio, mode=0o700, exist_ok=True)
+            origen = exportar_columnar(df, ruta_csv, ruta_columnar(ruta_csv, directorio))
+            limpiar_antiguos(ruta_csv, directorio)
+            return origen
+        except OSError as e:
+            ultimo_error = e
+    raise ultimo_error
+
+
+def limpiar_antiguos(ruta_csv, directorio=None):
+    """Borra almacenes de versiones anteriores del CSV (los mapeos abiertos siguen siendo válidos)"""
+    ruta_csv = Path(ruta_csv)
+    vigente = ruta_columnar(ruta_csv, directorio)
+    for antiguo in vigente.parent.glob(f"{ruta_csv.name}.*.columnar"):
+        if antiguo != vigente:
+            shutil.rmtree(antiguo, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    from config_sommelier import Config
+    from dataset_vinos import leer_y_preparar_csv
+
+    if not Config.LATEST_CSV:
+        print("❌ No se encontró archivo de datos")
+        raise SystemExit(1)
+    origen = asegurar_columnar(Config.LATEST_CSV, leer_y_preparar_csv)
+    print(f"✅ Almacén columnar listo: {origen}")
@@ -5,12 +5,24 @@ import numpy as np
 import glob
 import warnings
 import json
+import uuid
 from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, session
 from datetime import datetime, timedelta
 from config_sommelier import get_config
 from models import db, bcrypt, User, UserSession, WineRecommendation
-from chatbot import chatbot_endpoint, chat
+from chatbot import chatbot_endpoint, chat, obtener_cache as cache_chatbot
 from admin import admin_bp
+from registro_modelos import get_model, iniciar_vigilancia, registro
+from dataset_vinos import GestorCatalogo, limpiar_nombre_vino, limpiar_año
+from prediccion_vinos import predecir_calidad_lote
+from predicciones_precalculadas import GestorPredicciones
+from cache_recomendaciones import normalizar_consulta
+from cache_resultados import crear_cache
+from ranking_vinos import GRUPOS_DIVERSIDAD, vector_pesos
+from deduplicacion_vinos import clave_canonica, hash64
+from vecinos_vinos import GestorVecinos
+from escritura_diferida import EscrituraDiferida
+from hash_contrasenas import ServicioSaturado
 
 warnings.filterwarnings("ignore")
 
@@ -26,6 +38,14 @@ app.register_blueprint(admin_bp)
 db.init_app(app)
 bcrypt.init_app(app)
 
+# Historial de recomendaciones: /sommelier solo encola, un hilo inserta por lotes
+escritura_recomendaciones = EscrituraDiferida(
+    app, db, WineRecommendation,
+    max_lote=config.RECOMENDACIONES_LOTE,
+    intervalo=config.RECOMENDACIONES_INTERVALO_MS / 1000,
+    max_pendientes=config.RECOMENDACIONES_MAX_PENDIENTES,
+)
+
 # Cargar el modelo de Vivino y datos al iniciar la aplicación
 try:
     model, scaler, label_encoder, model_info = config.cargar_modelo()
@@ -41,17 +61,57 @@ try:
     else:
         label_encoders = {}
         caracteristicas_modelo = []
-    if config.LATEST_CSV:
-        df_vinos = pd.read_csv(config.LATEST_CSV)
-        print(f"✅ Datos cargados desde: {config.LATEST_CSV}")
-        print(f"✅ Total de vinos disponibles: {len(df_vinos)}")
-    else:
-        df_vinos = pd.DataFrame()
-        print("⚠️ No se encontraron archivos de scraping")
-    print("✅ Modelo Sommelier y datos cargados exitosamente")
+    print("✅ Modelo Sommelier cargado exitosamente")
 except FileNotFoundError as e:
     print(f"⚠️ Archivos del modelo no encontrados: {e}")
 
+# Los datos se cargan aunque falte el modelo: las búsquedas no dependen de él.
+# El catálogo (dataset preparado + índice columnar) se sustituye entero al recargarse
+gestor_catalogo = GestorCatalogo(lambda: config.localizar_csv_datos(False))
+catalogo_inicial, _ = gestor_catalogo.cargar(config.LATEST_CSV)
+df_vinos = catalogo_inicial.df
+indice_vinos = catalogo_inicial.indice
+if config.LATEST_CSV:
+    print(f"✅ Datos cargados desde: {config.LATEST_CSV}")
+    print(f"✅ Total de vinos disponibles: {len(df_vinos)}")
+else:
+    print("⚠️ No se encontraron archivos de scraping")
+print(f"🗂️ Índice de vinos construido: {len(indice_vinos)} vinos, tipos {list(indice_vinos.por_tipo)}")
+
+# Índice KD-tree para "vinos parecidos a este" (se reconstruye en segundo plano al recargar)
+gestor_vecinos = GestorVecinos()
+gestor_vecinos.construir(catalogo_inicial)
+gestor_catalogo.al_recargar(gestor_vecinos.al_recargar)
+
+# Predicciones de calidad precalculadas para todo el catálogo (se regeneran al cambiar el modelo)
+gestor_predicciones = GestorPredicciones(config.MODELO_PREDICCIONES)
+if config.LATEST_CSV:
+    gestor_predicciones.iniciar(config.LATEST_CSV, df_vinos)
+
+# Caché de resultados por consulta normalizada (compartida entre workers si CACHE_BACKEND=sqlite);
+# se vacía al recargar modelo o dataset
+cache_recomendaciones = crear_cache(config, 'recomendaciones')
+registro.al_recargar(cache_recomendaciones.limpiar)
+
+@gestor_catalogo.al_recargar
+def _catalogo_recargado(catalogo):
+    global df_vinos, indice_vinos
+    df_vinos, indice_vinos = catalogo.df, catalogo.indice
+    cache_recomendaciones.limpiar()
+    if catalogo.ruta:
+        gestor_predicciones.iniciar(catalogo.ruta, catalogo.df, en_segundo_plano=True)
+
+# Recargar en segundo plano los modelos reentrenados sin reiniciar los workers
+if config.MODEL_HOT_RELOAD:
+    iniciar_vigilancia(config.MODEL_RELOAD_INTERVAL)
+if config.DATASET_HOT_RELOAD:
+    gestor_catalogo.iniciar_vigilancia(config.DATASET_RELOAD_INTERVAL)
+
+# Vector de pesos del ranking para cada gusto (FEATURE_WEIGHTS + ajustes del gusto)
+PESOS_RANKING = {gusto: vector_pesos(config.FEATURE_WEIGHTS, config.PESOS_POR_GUSTO.get(gusto))
+                 for gusto in config.GUSTOS}
+PESOS_SIMILITUD = [config.MMR_PESOS_SIMILITUD.get(grupo, 0.0) for grupo in GRUPOS_DIVERSIDAD]
+
 def categorizar_popularidad(num_reviews):
     """Categorizar popularidad según número de reviews"""
     if num_reviews >= 1000:
@@ -87,14 +147,22 @@ def chatbot():
 
 def predecir_calidad_vino_completo(precio, rating, año, bodega="Desconocida", region="España", num_reviews=500):
     """Predice la categoría de calidad usando el modelo completo con 15 características"""
+    artefactos = None
     try:
         import numpy as np
         import pandas as pd
         
+        # Versión del modelo fijada para toda la predicción (la recarga no la altera)
+        artefactos = get_model('completo')
+        model, scaler = artefactos.modelo, artefactos.scaler
+        model_info = artefactos.model_info or {}
+        label_encoders = artefactos.label_encoders
+        caracteristicas_modelo = artefactos.caracteristicas
+        
         # Verificar que tenemos los componentes necesarios
         if not label_encoders or not caracteristicas_modelo:
             print("⚠️ Usando predicción simplificada - modelo incompleto")
-            return predecir_calidad_vino_simple(precio, rating, año, bodega, region)
+            return predecir_calidad_vino_simple(precio, rating, año, bodega, region, artefactos)
         
         # Crear DataFrame temporal para procesamiento
         vino_data = pd.DataFrame({
@@ -241,11 +309,15 @@ def predecir_calidad_vino_completo(precio, rating, año, bodega="Desconocida", r
     except Exception as e:
         print(f"❌ Error en predicción completa: {e}")
         print("🔄 Intentando predicción simplificada...")
-        return predecir_calidad_vino_simple(precio, rating, año, bodega, region)
+        return predecir_calidad_vino_simple(precio, rating, año, bodega, region, artefactos)
 
-def predecir_calidad_vino_simple(precio, rating, año, bodega="Desconocida", region="España"):
+def predecir_calidad_vino_simple(precio, rating, año, bodega="Desconocida", region="España", artefactos=None):
     """Función de predicción simplificada como fallback"""
     try:
+        if artefactos is None:
+            artefactos = get_model('completo')
+        model, scaler, label_encoder = artefactos.modelo, artefactos.scaler, artefactos.label_encoder
+        
         # Valores por defecto
         posicion = 1
         num_reviews = 500
@@ -293,8 +365,11 @@ def predecir_calidad_vino_simple(precio, rating, año, bodega="Desconocida", reg
         print(f"❌ Error en predicción simple: {e}")
         return "Error en predicción", 0
 
-def buscar_vinos_similares(precio_min, precio_max, rating_min=4.0, tipo_vino=None):
+def buscar_vinos_similares(precio_min, precio_max, rating_min=4.0, tipo_vino=None, catalogo=None, gusto=None):
     """Busca vinos similares en el dataset con deduplicación mejorada"""
+    if catalogo is None:
+        catalogo = gestor_catalogo.actual
+    df_vinos = catalogo.df
     if df_vinos.empty:
         return []
     
@@ -302,70 +377,114 @@ def buscar_vinos_similares(precio_min, precio_max, rating_min=4.0, tipo_vino=Non
     if tipo_vino and tipo_vino != "Todos":
         print(f"🍷 Filtro por tipo: {tipo_vino}")
     
-    # IMPORTANTE: Hacer una copia fresca del DataFrame para evitar modificaciones acumulativas
-    df_original = df_vinos.copy()
-    
-    # Filtrar vinos por criterios básicos
-    vinos_filtrados = df_original[
-        (df_original['precio_eur'] >= precio_min) &
-        (df_original['precio_eur'] <= precio_max) &
-        (df_original['rating'] >= rating_min)
-    ].copy()
+    # Filtrar con el índice precalculado: searchsorted por precio + máscara de rating.
+    # No se copia ni se modifica df_vinos
+    posiciones = catalogo.indice.consultar(precio_min, precio_max, rating_min, tipo_vino)
     
-    # Filtrar por tipo de vino si se especifica
     if tipo_vino and tipo_vino != "Todos":
-        vinos_filtrados = vinos_filtrados[
-            vinos_filtrados['tipo_vino'] == tipo_vino
-        ].copy()
-        print(f"🎯 Vinos {tipo_vino.lower()}s encontrados: {len(vinos_filtrados)}")
+        print(f"🎯 Vinos {tipo_vino.lower()}s encontrados: {len(posiciones)}")
     
-    print(f"📊 Vinos encontrados inicialmente: {len(vinos_filtrados)}")
+    print(f"📊 Vinos encontrados inicialmente: {len(posiciones)}")
     
-    if len(vinos_filtrados) == 0:
+    sin_resultados = len(posiciones) == 0
+    if sin_resultados:
         print("❌ No se encontraron vinos con los criterios especificados. Se mostrarán vinos variados entre los mejores del dataset.")
-        # Seleccionar los 500 mejores vinos por rating y precio
-        df_top = df_original.sort_values(['rating', 'precio_eur'], ascending=[False, True]).head(500)
-        # Elegir 6 aleatorios entre los mejores 500
-        if len(df_top) >= 6:
-            df_top_sample = df_top.sample(n=6, random_state=np.random.randint(0, 10000))
-        else:
-            # Si hay menos de 6, tomar todos y rellenar con otros vinos aleatorios del dataset
-            df_top_sample = df_top.copy()
-            faltan = 6 - len(df_top_sample)
-            if faltan > 0:
-                # Excluir los ya seleccionados
-                df_restantes = df_original.drop(df_top_sample.index)
-                if len(df_restantes) > 0:
-                    # Si solo hay una fila, sample devuelve una Serie, así que forzamos DataFrame
-                    df_extra = df_restantes.sample(n=min(faltan, len(df_restantes)), random_state=np.random.randint(0, 10000))
-                    if isinstance(df_extra, pd.Series):
-                        df_extra = df_extra.to_frame().T
-                    df_top_sample = pd.concat([df_top_sample, df_extra], ignore_index=True)
-            # Si aún faltan, rellenar con filas vacías (opcional, pero así siempre hay 6)
-            if len(df_top_sample) < 6:
-                for _ in range(6 - len(df_top_sample)):
-                    fila_vacia = {
-                        'nombre_completo': 'Vino seleccionado',
-                        'nombre_vino': 'Vino seleccionado',
-                        'precio_eur': 0,
-                        'año': 'N/A',
-                        'rating': 0,
-                        'tipo_vino': 'N/A'
-                    }
-                    df_top_sample = pd.concat([df_top_sample, pd.DataFrame([fila_vacia])], ignore_index=True)
-        # Limpiar nombres y años para consistencia SOLO si la columna existe y no es float/NaN
-        if 'nombre_completo' in df_top_sample.columns:
-            df_top_sample['nombre_limpio'] = df_top_sample['nombre_completo'].apply(lambda x: limpiar_nombre_vino(x) if not isinstance(x, float) or not pd.isna(x) else "Vino seleccionado")
-        elif 'nombre_vino' in df_top_sample.columns:
-            df_top_sample['nombre_limpio'] = df_top_sample['nombre_vino'].apply(lambda x: limpiar_nombre_vino(x) if not isinstance(x, float) or not pd.isna(x) else "Vino seleccionado")
-        else:
-            df_top_sample['nombre_limpio'] = "Vino seleccionado"
-        if 'año' in df_top_sample.columns:
-            df_top_sample['año'] = df_top_sample['año'].apply(lambda x: limpiar_año(x) if not isinstance(x, float) or not pd.isna(x) else "N/A")
-        # Ordenar por precio ascendente antes de renderizar
-        if 'precio_eur' in df_top_sample.columns:
-            df_top_sample = df_top_sample.sort_values('precio_eur', ascending=True, ignore_index=True)
-        return df_top_sample.to_dict('records')
+        # Mismo ranking + MMR sobre todo el catálogo con precio: selección variada y determinista
+        posiciones = catalogo.indice.todos.posiciones
+    
+    # Ranking vectorizado: todos los candidatos se puntúan con un producto contra los
+    # pesos del gusto y los mejores se eligen con argpartition. Los vinos repetidos se
+    # descartan comparando el hash precalculado clave_vino. Entre esos mejores, MMR
+    # reparte la rejilla entre bodegas, regiones y tramos de precio distintos
+    pesos = PESOS_RANKING.get(gusto, PESOS_RANKING['equilibrado'])
+    seleccion = catalogo.ranking.diversos(posiciones, pesos, config.DEFAULT_RECOMMENDATIONS, PESOS_SIMILITUD,
+                                          lambda_mmr=config.MMR_LAMBDA, candidatos=config.MMR_CANDIDATOS,
+                                          claves=catalogo.claves)
+    df_resultado = df_vinos.take(seleccion)
+    # Vinos variados de un catálogo con menos de 6 vinos: rellenar con filas vacías para que siempre haya 6
+    faltan = config.DEFAULT_RECOMMENDATIONS - len(df_resultado)
+    if sin_resultados and faltan > 0:
+        fila_vacia = {
+            'nombre_completo': 'Vino seleccionado',
+            'nombre_vino': 'Vino seleccionado',
+            'precio_eur': 0,
+            'año': 'N/A',
+            'rating': 0,
+            'tipo_vino': 'N/A'
+        }
+        df_resultado = pd.concat([df_resultado, pd.DataFrame([fila_vacia] * faltan)], ignore_index=True)
+    return preparar_resultados(df_resultado)
+
+def recomendar_vinos(precio_min, precio_max, rating_min, tipo_vino, gusto, catalogo):
+    """buscar_vinos_similares con caché por consulta normalizada y versión del catálogo"""
+    clave = ('recomendar', precio_min, precio_max, rating_min, tipo_vino, gusto, catalogo.version)
+    return cache_recomendaciones.obtener_o_calcular(
+        clave, lambda: buscar_vinos_similares(precio_min, precio_max, rating_min, tipo_vino, catalogo, gusto))
+
+def predecir_calidad_rango(artefactos_vivino, catalogo, precio_min, precio_max, rating_objetivo, tipo_vino, num_reviews):
+    """Predicción de calidad para el rango pedido en /sommelier"""
+    # Predicción precalculada: clase mayoritaria de los vinos del rango pedido
+    predicciones = gestor_predicciones.vigentes(artefactos_vivino, catalogo.df)
+    if predicciones is not None:
+        resumen = predicciones.resumen(catalogo.indice.consultar(precio_min, precio_max, rating_objetivo, tipo_vino))
+        if resumen is not None:
+            return resumen
+    
+    # --- Sin predicciones para este rango: modelo compartido por el registro ---
+    clf_loaded = artefactos_vivino.modelo
+    le_target_loaded = artefactos_vivino.label_encoder
+    scaler_loaded = artefactos_vivino.scaler
+    # Preparar datos para predicción (solo precio, rating, num_reviews)
+    precio_promedio = (precio_min + precio_max) / 2
+    X_pred = np.array([[precio_promedio, rating_objetivo, num_reviews]])
+    X_pred_scaled = scaler_loaded.transform(X_pred)
+    pred = clf_loaded.predict(X_pred_scaled)
+    prediccion = le_target_loaded.inverse_transform(pred)[0]
+    confianza = max(clf_loaded.predict_proba(X_pred_scaled)[0]) * 100 if hasattr(clf_loaded, 'predict_proba') else 100.0
+    return prediccion, confianza
+
+def guardar_recomendacion(user_id, precio_min, precio_max, rating_min, ocasion, gusto,
+                          prediccion, confianza, vinos_recomendados):
+    """Encola la fila de WineRecommendation; la inserta el hilo de escritura diferida"""
+    vinos = [{'clave_vino': vino.get('clave_vino'), 'nombre': vino.get('nombre_limpio'),
+              'precio_eur': vino.get('precio_eur'), 'rating': vino.get('rating')}
+             for vino in vinos_recomendados]
+    escritura_recomendaciones.encolar({
+        'id': str(uuid.uuid4()),
+        'user_id': user_id,
+        'precio_min': precio_min,
+        'precio_max': precio_max,
+        'rating_min': rating_min,
+        'ocasion': ocasion,
+        'gusto': gusto,
+        'prediccion': str(prediccion),
+        'confianza': float(confianza),
+        'vinos_recomendados': json.dumps(vinos, ensure_ascii=False, default=str),
+        'created_at': datetime.utcnow(),
+    })
+
+def claves_como_texto(df):
+    """clave_vino es un entero de 64 bits: en JSON/JS se redondearía por encima de 2^53, así que sale como texto"""
+    if 'clave_vino' in df.columns:
+        df['clave_vino'] = df['clave_vino'].map(lambda clave: None if pd.isna(clave) else str(int(clave)))
+    return df
+
+def preparar_resultados(df_resultado, ordenar_por_precio=True):
+    """Completa nombres y años de los vinos seleccionados y los ordena por precio"""
+    df_resultado = df_resultado.copy()
+    # nombre_limpio y año vienen precalculados del dataset; solo las filas de relleno carecen de ellos
+    if 'nombre_limpio' in df_resultado.columns:
+        df_resultado['nombre_limpio'] = df_resultado['nombre_limpio'].fillna("Vino seleccionado")
+    else:
+        df_resultado['nombre_limpio'] = "Vino seleccionado"
+    if 'año' in df_resultado.columns:
+        años = df_resultado['año'].astype(object)
+        df_resultado['año'] = años.where(años.notna(), "N/A")
+    claves_como_texto(df_resultado)
+    # Ordenar por precio ascendente antes de renderizar
+    if ordenar_por_precio and 'precio_eur' in df_resultado.columns:
+        df_resultado = df_resultado.sort_values('precio_eur', ascending=True, ignore_index=True)
+    return df_resultado.to_dict('records')
     
 # Limpiar y convertir rating
 def limpiar_rating(rating_str):
@@ -380,96 +499,11 @@ def limpiar_rating(rating_str):
     except:
         return 4.0
 
-# Convertir año a entero para eliminar decimales
-def limpiar_año(año_val):
-    try:
-        if pd.isna(año_val):
-            return "N/A"
-        return int(float(año_val))
-    except:
-        return "N/A"
-
-def limpiar_nombre_vino(nombre):
-    try:
-        if pd.isna(nombre):
-            return "Vino sin nombre"
-        
-        nombre_str = str(nombre)
-        
-        # Remover información extra común
-        import re
-        
-        # Eliminar números de añadas y calificaciones
-        nombre_str = re.sub(r'\b20\d{2}\b', '', nombre_str)
-        
-        # Eliminar precios, puntuaciones y símbolos
-        nombre_str = re.sub(r'[\€\$]\s*\d+[,\.]?\d*', '', nombre_str)  # Precios
-        nombre_str = re.sub(r'\d+[,\.]\d+\s*(puntos?|pts?)', '', nombre_str)  # Puntuaciones
-        nombre_str = re.sub(r'\d+\s*ml\b', '', nombre_str)  # Volúmenes
-        nombre_str = re.sub(r'\b\d+\s*cl\b', '', nombre_str)  # Centilitros
-        
-        # Eliminar información de descuentos y ofertas
-        nombre_str = re.sub(r'\d+%\s*(descuento|off)', '', nombre_str, flags=re.IGNORECASE)
-        nombre_str = re.sub(r'ahorra\d+%?', '', nombre_str, flags=re.IGNORECASE)
-        
-        # Eliminar regiones específicas del nombre (ya se muestran por separado)
-        regiones = ['Campo de Borja', 'Calatayud', 'Almansa', 'Ribera del Duero', 
-                   'Rioja', 'Rías Baixas', 'Toro', 'Bierzo', 'Jumilla', 'Montsant',
-                   'Priorat', 'Penedès', 'Catalunya', 'Valencia', 'Alicante', 'Mallorca']
-        
-        for region in regiones:
-            nombre_str = re.sub(re.escape(region), '', nombre_str, flags=re.IGNORECASE)
-        
-        # Limpiar caracteres especiales y espacios múltiples
-        nombre_str = re.sub(r'[^\w\s\-\.]', ' ', nombre_str)
-        nombre_str = re.sub(r'\s+', ' ', nombre_str)
-        
-        # Dividir por palabras clave que separan el nombre de la bodega
-        separadores = ['Campo', 'Bodega', 'Bodegas', 'Winery', 'Estate', 'Viñedos', 'Cellers']
-        for sep in separadores:
-            if sep in nombre_str:
-                partes = nombre_str.split(sep)
-                if len(partes) > 1 and len(partes[0].strip()) > 3:
-                    nombre_str = partes[0].strip()
-                    break
-        
-        # Si contiene comas, tomar solo la primera parte (nombre principal)
-        if ',' in nombre_str:
-            nombre_str = nombre_str.split(',')[0]
-        
-        # Limpiar espacios al inicio y final
-        nombre_str = nombre_str.strip()
-        
-        # Eliminar palabras repetidas o muy cortas al final
-        palabras = nombre_str.split()
-        palabras_filtradas = []
-        
-        for palabra in palabras:
-            # Mantener palabras significativas
-            if len(palabra) >= 3 and palabra.lower() not in ['del', 'de', 'la', 'el', 'los', 'las']:
-                # Evitar repetir la misma palabra
-                if not palabras_filtradas or palabra.lower() != palabras_filtradas[-1].lower():
-                    palabras_filtradas.append(palabra)
-        
-        nombre_str = ' '.join(palabras_filtradas)
-        
-        # Si el nombre está vacío después de la limpieza, usar un fallback
-        if not nombre_str or len(nombre_str) < 3:
-            return "Vino seleccionado"
-        
-        # Limitar longitud para mantener la interfaz limpia
-        if len(nombre_str) > 50:
-            nombre_str = nombre_str[:50] + "..."
-        
-        return nombre_str
-        
-    except:
-        return "Vino seleccionado"
-    
     # SISTEMA DE DEDUPLICACIÓN SUPER ESTRICTO PARA ELIMINAR DUPLICADOS EXACTOS
 def crear_clave_unica_robusta(row):
     """Crear clave única robusta que detecte duplicados exactos"""
-    # ...implementación pendiente...
+    nombre = row.get('nombre_limpio', row.get('nombre_vino'))
+    return hash64(clave_canonica(nombre, row.get('bodega'), row.get('año'), row.get('url')))
 
 
 def validate_registration_data(data):
@@ -590,6 +624,11 @@ def register():
             
             return redirect(url_for('login'))
             
+        except ServicioSaturado as e:
+            print(f"⏳ Registro rechazado, bcrypt saturado: {e}")
+            db.session.rollback()
+            flash('Hay muchas solicitudes en este momento. Inténtalo de nuevo en unos segundos.', 'error')
+            return render_template('register.html'), 503, {'Retry-After': '1'}
         except ValueError as ve:
             print(f"❌ Error de validación en registro: {ve}")
             db.session.rollback()
@@ -641,6 +680,10 @@ def login():
                 flash('Email o contraseña incorrectos', 'error')
                 return render_template('login.html')
                 
+        except ServicioSaturado as e:
+            print(f"⏳ Login rechazado, bcrypt saturado: {e}")
+            flash('Hay muchos inicios de sesión en este momento. Inténtalo de nuevo en unos segundos.', 'error')
+            return render_template('login.html'), 503, {'Retry-After': '1'}
         except Exception as e:
             flash(f'Error al iniciar sesión: {str(e)}', 'error')
             return render_template('login.html')
@@ -670,23 +713,29 @@ def index():
 def sommelier():
     if request.method == 'POST':
         try:
-            # Verificar que el modelo esté cargado
-            if model is None or scaler is None:
+            # Verificar que el modelo esté cargado. Se obtiene una sola vez para que
+            # toda la petición use la misma versión aunque haya una recarga en curso
+            try:
+                artefactos_vivino = get_model('vivino')
+            except Exception as e:
+                print(f"❌ Modelo Sommelier no disponible: {e}")
+                artefactos_vivino = None
+            if artefactos_vivino is None:
                 return render_template('sommelier_index2.html',
                                     prediction_text='Error: Modelo Sommelier no disponible.',
                                     show_result=True,
                                     error=True)
 
-            # Obtener datos del formulario
-            precio_min = float(request.form['precio_min'])
-            precio_max = float(request.form['precio_max'])
-            rating_min = float(request.form.get('rating_min', 4.0))
-            tipo_vino = request.form.get('tipo_vino', 'Todos')
+            # Obtener datos del formulario. La consulta se normaliza al paso de los
+            # controles para que los valores repetidos compartan entrada de caché
+            precio_min, precio_max, rating_min, tipo_vino, gusto = normalizar_consulta(
+                request.form['precio_min'], request.form['precio_max'],
+                request.form.get('rating_min', 4.0), request.form.get('tipo_vino', 'Todos'),
+                request.form.get('gusto', 'equilibrado'), gustos=config.GUSTOS)
             ocasion = request.form.get('ocasion', 'general')
-            gusto = request.form.get('gusto', 'equilibrado')
-            
-            # Calcular precio promedio para predicción
-            precio_promedio = (precio_min + precio_max) / 2
+            num_reviews = int(request.form.get('num_reviews', 500))
+            # Toda la petición trabaja sobre el mismo catálogo aunque se recargue a la vez
+            catalogo = gestor_catalogo.actual
             
             # Ajustar rating esperado según el gusto
             rating_objetivo = rating_min
@@ -695,26 +744,14 @@ def sommelier():
             elif gusto == 'equilibrado':
                 rating_objetivo = max(4.12, rating_min)
             
-            # --- Integración directa del modelo generado ---
-            import joblib
-
-            modelo_path = os.path.join('modelos generados', 'modelo_random_forest_vivino.pkl')
-            scaler_path = os.path.join('modelos generados', 'scaler_vivino.pkl')
-            modelo_cargado = joblib.load(modelo_path)
-            clf_loaded = modelo_cargado['model']
-            le_target_loaded = modelo_cargado['le_target']
-            scaler_loaded = joblib.load(scaler_path)
-            # Preparar datos para predicción (solo precio, rating, num_reviews)
-            num_reviews = int(request.form.get('num_reviews', 500))
-            X_pred = np.array([[precio_promedio, rating_objetivo, num_reviews]])
-            X_pred_scaled = scaler_loaded.transform(X_pred)
-            pred = clf_loaded.predict(X_pred_scaled)
-            pred_label = le_target_loaded.inverse_transform(pred)[0]
-            prediccion = pred_label
-            confianza = max(clf_loaded.predict_proba(X_pred_scaled)[0]) * 100 if hasattr(clf_loaded, 'predict_proba') else 100.0
+            clave = ('prediccion', precio_min, precio_max, rating_min, tipo_vino, gusto, num_reviews,
+                     artefactos_vivino.version, catalogo.version)
+            prediccion, confianza = cache_recomendaciones.obtener_o_calcular(
+                clave, lambda: predecir_calidad_rango(artefactos_vivino, catalogo, precio_min, precio_max,
+                                                      rating_objetivo, tipo_vino, num_reviews))
             
             # Buscar vinos similares
-            vinos_recomendados = buscar_vinos_similares(precio_min, precio_max, rating_min, tipo_vino)
+            vinos_recomendados = recomendar_vinos(precio_min, precio_max, rating_min, tipo_vino, gusto, catalogo)
             
             # Preparar contexto de respuesta
             prediction_text = f"Recomendación: {prediccion}"
@@ -742,7 +779,10 @@ def sommelier():
             }
             ocasion_text = ocasion_messages.get(ocasion, ocasion_messages['general'])
 
-
+            # Guardar la recomendación del usuario sin esperar a la base de datos
+            if session.get('user_id'):
+                guardar_recomendacion(session['user_id'], precio_min, precio_max, rating_min, ocasion,
+                                      gusto, prediccion, confianza, vinos_recomendados)
 
             return render_template('sommelier_index2.html',
                                 prediction_text=prediction_text,
@@ -771,27 +811,142 @@ def sommelier():
 @app.route('/api/vinos')
 def api_vinos():
     """API endpoint para obtener lista de vinos"""
+    df_vinos = gestor_catalogo.actual.df
     if df_vinos.empty:
         return jsonify({'error': 'No hay datos de vinos disponibles'})
     
     # Convertir a diccionario y limitar a 50 vinos
-    vinos_json = df_vinos.head(50).to_dict('records')
+    vinos_json = claves_como_texto(df_vinos.head(50).copy()).to_dict('records')
     return jsonify({'vinos': vinos_json, 'total': len(df_vinos)})
 
 @app.route('/api/recomendar')
 def api_recomendar():
     """API endpoint para recomendaciones"""
-    precio_min = float(request.args.get('precio_min', 10))
-    precio_max = float(request.args.get('precio_max', 50))
-    rating_min = float(request.args.get('rating_min', 4.0))
-    tipo_vino = request.args.get('tipo_vino', 'Todos')
+    try:
+        precio_min, precio_max, rating_min, tipo_vino, gusto = normalizar_consulta(
+            request.args.get('precio_min', 10), request.args.get('precio_max', 50),
+            request.args.get('rating_min', 4.0), request.args.get('tipo_vino', 'Todos'),
+            request.args.get('gusto', 'equilibrado'), gustos=config.GUSTOS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    vinos = buscar_vinos_similares(precio_min, precio_max, rating_min, tipo_vino)
+    vinos = recomendar_vinos(precio_min, precio_max, rating_min, tipo_vino, gusto, gestor_catalogo.actual)
     return jsonify({'recomendaciones': vinos})
 
+@app.route('/api/vinos/<id_vino>/similares')
+def api_vinos_similares(id_vino):
+    """API endpoint con los vinos más parecidos a uno dado (id = clave_vino, como texto)"""
+    try:
+        id_vino = int(id_vino)
+    except ValueError:
+        return jsonify({'error': f'Vino no encontrado: {id_vino}'}), 404
+    k = request.args.get('k', config.DEFAULT_RECOMMENDATIONS, type=int)
+    k = max(1, min(k, config.MAX_RECOMMENDATIONS))
+    
+    # Catálogo e índice se leen juntos para que las posiciones correspondan
+    activo = gestor_vecinos.actual
+    if activo is None:
+        return jsonify({'error': 'Índice de vinos no disponible'}), 503
+    catalogo, indice = activo
+    
+    resultado = indice.similares(id_vino, k)
+    if resultado is None:
+        return jsonify({'error': f'Vino no encontrado: {id_vino}'}), 404
+    posiciones, distancias = resultado
+    
+    vino = preparar_resultados(catalogo.df.take([indice.posicion(id_vino)]))[0]
+    similares = preparar_resultados(catalogo.df.take(posiciones), ordenar_por_precio=False)
+    for similar, distancia in zip(similares, distancias):
+        similar['distancia'] = round(float(distancia), 4)
+    return jsonify({'vino': vino, 'similares': similares, 'total': len(similares)})
+
+@app.route('/api/buscar')
+def api_buscar():
+    """API endpoint de búsqueda por nombre, bodega o región (tolera tildes y erratas)"""
+    consulta = request.args.get('q', '').strip()
+    if not consulta:
+        return jsonify({'error': 'Falta el parámetro q'}), 400
+    k = request.args.get('k', config.BUSQUEDA_RESULTADOS, type=int)
+    k = max(1, min(k, config.BUSQUEDA_MAX_RESULTADOS))
+    
+    catalogo = gestor_catalogo.actual
+    posiciones, puntuaciones = catalogo.busqueda.buscar(consulta, k)
+    resultados = preparar_resultados(catalogo.df.take(posiciones), ordenar_por_precio=False)
+    for resultado, puntuacion in zip(resultados, puntuaciones):
+        resultado['puntuacion'] = round(float(puntuacion), 4)
+    return jsonify({'consulta': consulta, 'resultados': resultados, 'total': len(resultados)})
+
+@app.route('/api/autocompletar')
+def api_autocompletar():
+    """API endpoint de sugerencias de bodegas, regiones y variedades para un prefijo"""
+    prefijo = request.args.get('prefijo', '')
+    k = request.args.get('k', config.AUTOCOMPLETAR_SUGERENCIAS, type=int)
+    k = max(1, min(k, config.AUTOCOMPLETAR_SUGERENCIAS))
+    sugerencias = gestor_catalogo.actual.autocompletado.sugerir(prefijo, k)
+    return jsonify({'prefijo': prefijo, 'sugerencias': sugerencias})
+
+@app.route('/api/facetas')
+def api_facetas():
+    """API endpoint con cuántos vinos cumplen el filtro, por faceta y por posición de cada slider"""
+    try:
+        precio_min, precio_max, rating_min, tipo_vino, _ = normalizar_consulta(
+            request.args.get('precio_min', 10), request.args.get('precio_max', 50),
+            request.args.get('rating_min', 4.0), request.args.get('tipo_vino', 'Todos'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    facetas = gestor_catalogo.actual.facetas.conteos(precio_min, precio_max, rating_min, tipo_vino)
+    facetas['consulta'] = {'precio_min': precio_min, 'precio_max': precio_max,
+                           'rating_min': rating_min, 'tipo_vino': tipo_vino}
+    return jsonify(facetas)
+
+@app.route('/api/cache/estadisticas')
+def api_cache_estadisticas():
+    """API endpoint con los contadores de las cachés de recomendaciones y del chatbot"""
+    return jsonify({
+        'recomendaciones': cache_recomendaciones.estadisticas(),
+        'chatbot': cache_chatbot().estadisticas(),
+    })
+
+@app.route('/api/predecir/lote', methods=['POST'])
+def api_predecir_lote():
+    """API endpoint para predecir la calidad de varios vinos en una sola llamada"""
+    vinos = request.get_json(silent=True)
+    if not isinstance(vinos, list) or not vinos:
+        return jsonify({'error': 'Se esperaba un array JSON de vinos'}), 400
+    if len(vinos) > config.MAX_PREDICCIONES_LOTE:
+        return jsonify({'error': f'Máximo {config.MAX_PREDICCIONES_LOTE} vinos por petición'}), 400
+    
+    # Cada vino necesita al menos precio, rating y año
+    errores = []
+    for i, vino in enumerate(vinos):
+        if not isinstance(vino, dict):
+            errores.append(f'Vino {i}: se esperaba un objeto')
+            continue
+        faltan = [campo for campo in ('rating', 'año') if vino.get(campo) is None]
+        if vino.get('precio') is None and vino.get('precio_eur') is None:
+            faltan.insert(0, 'precio')
+        if faltan:
+            errores.append(f"Vino {i}: faltan {', '.join(faltan)}")
+    if errores:
+        return jsonify({'error': 'Datos incompletos', 'detalles': errores}), 400
+    
+    try:
+        artefactos = get_model('completo')
+        resultado = predecir_calidad_lote(pd.DataFrame(vinos), artefactos)
+    except Exception as e:
+        print(f"❌ Error en predicción por lotes: {e}")
+        return jsonify({'error': f'Error en predicción: {str(e)}'}), 500
+    
+    predicciones = [
+        {'prediccion': str(prediccion), 'confianza': round(float(confianza), 1)}
+        for prediccion, confianza in zip(resultado['prediccion'], resultado['confianza'])
+    ]
+    return jsonify({'predicciones': predicciones, 'total': len(predicciones), 'modelo': artefactos.version})
+
 @app.route('/about')
 def about():
     """Página de información sobre el modelo"""
+    df_vinos = gestor_catalogo.actual.df
     model_info = {
         'nombre': 'Sommelier Inteligente - Vivino Dataset',
         'tipo': 'Random Forest Classifier',
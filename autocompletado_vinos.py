@@ -0,0 +1,92 @@
+# Autocompletado de bodegas, regiones y variedades
+"""
+Estructura de prefijos precalculada al cargar el catálogo.
+
+Cada sugerencia (bodega, región o variedad) se indexa por cada palabra en que
+empieza su texto normalizado: "Pazo de Señoráns" responde a "pazo",
+"de señ" y "senor". Las claves se guardan en una lista ordenada. Un prefijo
+es un rango contiguo de esa lista, que se localiza con dos ``bisect``. De ese
+rango salen las k sugerencias más populares (suma de ``num_reviews`` de sus
+vinos únicos); a igual popularidad, en orden de índice. Una pulsación nunca
+recorre el DataFrame.
+
+El dataset no tiene columna de variedad: las variedades se detectan en
+``nombre_limpio`` a partir de ``VARIEDADES``.
+"""
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from deduplicacion_vinos import normalizar_texto
+
+VARIEDADES = [
+    # Tintas
+    'Tempranillo', 'Garnacha', 'Garnatxa', 'Monastrell', 'Mencía', 'Bobal', 'Graciano',
+    'Mazuelo', 'Cariñena', 'Syrah', 'Cabernet Sauvignon', 'Merlot', 'Pinot Noir', 'Tinta de Toro',
+    # Blancas (las mismas que generar_vinos_blancos)
+    'Albariño', 'Verdejo', 'Godello', 'Tempranillo Blanco', 'Viura', 'Xarel·lo', 'Macabeo',
+    'Parellada', 'Chardonnay', 'Sauvignon Blanc', 'Gewürztraminer', 'Moscatel', 'Pedro Ximénez',
+    'Treixadura',
+]
+
+# normalizar_texto solo deja [a-z0-9 ]: '{' ordena detrás de cualquier clave que empiece por el prefijo
+FIN_PREFIJO = '{'
+
+
+def _popularidad_por_texto(textos, reviews):
+    """Serie texto -> suma de reviews, ignorando textos vacíos"""
+    serie = pd.Series(reviews).groupby(pd.Series(textos, dtype=object)).sum()
+    return serie[[isinstance(t, str) and bool(t.strip()) for t in serie.index]]
+
+
+class IndiceAutocompletado:
+    """Claves ordenadas (palabra inicial -> sugerencia) con su popularidad"""
+
+    def __init__(self, df):
+        if 'clave_vino' in df.columns:
+            df = df.loc[~df['clave_vino'].duplicated()]
+        if 'num_reviews' in df.columns:
+            reviews = pd.to_numeric(df['num_reviews'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            reviews = np.nan_to_num(reviews)
+        else:
+            reviews = np.zeros(len(df))
+
+        sugerencias = []
+        for tipo, columna in [('bodega', 'bodega'), ('region', 'region')]:
+            if columna in df.columns:
+                popularidad = _popularidad_por_texto(df[columna].to_numpy(dtype=object), reviews)
+                sugerencias.extend((texto, tipo, peso) for texto, peso in popularidad.items())
+        if 'nombre_limpio' in df.columns:
+            nombres = pd.Series([f' {normalizar_texto(n)} ' for n in df['nombre_limpio'].to_numpy(dtype=object)])
+            for variedad in VARIEDADES:
+                presentes = nombres.str.contains(f' {normalizar_texto(variedad)} ', regex=False).to_numpy()
+                if presentes.any():
+                    sugerencias.append((variedad, 'variedad', reviews[presentes].sum()))
+
+        self.textos = [texto.strip() for texto, _, _ in sugerencias]
+        self.tipos = [tipo for _, tipo, _ in sugerencias]
+        self.popularidad = np.array([peso for _, _, peso in sugerencias], dtype=np.float64)
+
+        claves = []
+        for i, texto in enumerate(self.textos):
+            palabras = normalizar_texto(texto).split()
+            claves.extend((' '.join(palabras[j:]), i) for j in range(len(palabras)))
+        claves.sort()
+        self.claves = [clave for clave, _ in claves]
+        self.sugerencia_de_clave = np.array([i for _, i in claves], dtype=np.int32)
+
+    def __len__(self):
+        return len(self.textos)
+
+    def sugerir(self, prefijo, k=8):
+        """[{'texto', 'tipo', 'popularidad'}] de las k sugerencias más populares que empiezan por el prefijo"""
+        prefijo = ' '.join(normalizar_texto(prefijo).split())
+        if not prefijo or k <= 0:
+            return []
+        inicio = bisect_left(self.claves, prefijo)
+        fin = bisect_left(self.claves, prefijo + FIN_PREFIJO, lo=inicio)
+        candidatas = np.unique(self.sugerencia_de_clave[inicio:fin])
+        candidatas = candidatas[np.lexsort((candidatas, -self.popularidad[candidatas]))[:k]]
+        return [{'texto': self.textos[i], 'tipo': self.tipos[i], 'popularidad': int(self.popularidad[i])}
+                for i in candidatas.tolist()]
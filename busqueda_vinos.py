@@ -0,0 +1,113 @@
+# Búsqueda de vinos por texto (nombre, bodega, región)
+"""
+Índice de búsqueda en memoria, construido al cargar el catálogo.
+
+- Índice invertido de tokens sobre ``nombre_limpio``, ``bodega`` y ``region``.
+  Los textos se normalizan con ``normalizar_texto`` (minúsculas, sin tildes ni
+  signos), así que "Pazo Señorans" y "pazo senorans" son la misma consulta.
+  Cada token guarda los vinos en los que aparece y el peso del campo: el nombre
+  pesa más que la bodega y esta más que la región.
+- Índice de trigramas sobre el vocabulario, para tolerar erratas y palabras a
+  medio escribir. Un token de la consulta que no está en el vocabulario se
+  compara con los tokens que comparten trigramas con él (coeficiente de Dice),
+  contando con ``np.bincount``.
+
+Una consulta nunca recorre el DataFrame: suma, para cada token de la consulta,
+la mejor coincidencia de cada vino (similitud x peso del campo x idf). Solo
+entra una fila por ``clave_vino``. A igual puntuación va antes el vino con más
+reviews.
+"""
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from deduplicacion_vinos import normalizar_texto
+
+# Campo -> peso de una coincidencia en ese campo
+PESOS_CAMPOS = {'nombre_limpio': 3.0, 'bodega': 2.0, 'region': 1.0}
+# Dice mínimo entre trigramas para aceptar un token parecido, y cuántos se prueban
+SIMILITUD_MINIMA = 0.5
+MAX_TOKENS_PARECIDOS = 8
+
+
+def trigramas(token):
+    """Trigramas del token con un espacio a cada lado: 'pazo' -> ' pa', 'paz', 'azo', 'zo '"""
+    relleno = f' {token} '
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class IndiceBusqueda:
+    """Índice invertido de tokens + trigramas del vocabulario"""
+
+    def __init__(self, df):
+        if 'clave_vino' in df.columns:
+            self.posiciones = np.flatnonzero(~df['clave_vino'].duplicated().to_numpy())
+        else:
+            self.posiciones = np.arange(len(df))
+
+        if 'num_reviews' in df.columns:
+            reviews = pd.to_numeric(df['num_reviews'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            self.reviews = np.nan_to_num(reviews[self.posiciones])
+        else:
+            self.reviews = np.zeros(len(self.posiciones))
+
+        # token -> {vino: peso del mejor campo en que aparece}
+        apariciones = defaultdict(dict)
+        for campo, peso in PESOS_CAMPOS.items():
+            if campo not in df.columns:
+                continue
+            textos = df[campo].to_numpy(dtype=object)[self.posiciones]
+            for vino, texto in enumerate(textos):
+                for token in set(normalizar_texto(texto).split()):
+                    if apariciones[token].get(vino, 0.0) < peso:
+                        apariciones[token][vino] = peso
+
+        self.vocabulario = sorted(apariciones)
+        self.por_token = {token: i for i, token in enumerate(self.vocabulario)}
+        self.vinos = [np.fromiter(apariciones[t].keys(), dtype=np.int32) for t in self.vocabulario]
+        idf = np.log1p(len(self.posiciones) / np.maximum(1, [len(v) for v in self.vinos]))
+        self.pesos = [np.fromiter(apariciones[t].values(), dtype=np.float64) * idf[i]
+                      for i, t in enumerate(self.vocabulario)]
+
+        por_trigrama = defaultdict(list)
+        for i, token in enumerate(self.vocabulario):
+            for trigrama in trigramas(token):
+                por_trigrama[trigrama].append(i)
+        self.por_trigrama = {t: np.array(ids, dtype=np.int32) for t, ids in por_trigrama.items()}
+        self.num_trigramas = np.array([len(trigramas(t)) for t in self.vocabulario], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.posiciones)
+
+    def tokens_parecidos(self, token):
+        """[(id de token, similitud)] del vocabulario: el exacto con 1.0 o los más parecidos por trigramas"""
+        exacto = self.por_token.get(token)
+        if exacto is not None:
+            return [(exacto, 1.0)]
+        propios = trigramas(token)
+        listas = [self.por_trigrama[t] for t in propios if t in self.por_trigrama]
+        if not listas:
+            return []
+        compartidos = np.bincount(np.concatenate(listas), minlength=len(self.vocabulario))
+        dice = 2.0 * compartidos / (len(propios) + self.num_trigramas)
+        candidatos = np.flatnonzero(dice >= SIMILITUD_MINIMA)
+        candidatos = candidatos[np.argsort(-dice[candidatos], kind='stable')[:MAX_TOKENS_PARECIDOS]]
+        return [(int(i), float(dice[i])) for i in candidatos]
+
+    def buscar(self, consulta, k=10):
+        """(posiciones en el dataset, puntuaciones) de los k vinos que mejor encajan, de mayor a menor"""
+        tokens = normalizar_texto(consulta).split()
+        if not tokens or not len(self.posiciones):
+            return np.array([], dtype=np.int64), np.array([])
+        puntuaciones = np.zeros(len(self.posiciones))
+        for token in dict.fromkeys(tokens):
+            # Por cada token de la consulta cuenta solo la mejor coincidencia de cada vino
+            mejor = np.zeros(len(self.posiciones))
+            for id_token, similitud in self.tokens_parecidos(token):
+                np.maximum.at(mejor, self.vinos[id_token], similitud * self.pesos[id_token])
+            puntuaciones += mejor
+        encontrados = np.flatnonzero(puntuaciones > 0)
+        orden = np.lexsort((encontrados, -self.reviews[encontrados], -puntuaciones[encontrados]))[:k]
+        encontrados = encontrados[orden]
+        return self.posiciones[encontrados], puntuaciones[encontrados]
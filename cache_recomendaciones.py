@@ -0,0 +1,59 @@
+# Caché de recomendaciones del Sommelier
+"""
+Caché acotada (LRU + TTL) delante de ``buscar_vinos_similares`` y de la
+predicción del modelo. El almacenamiento lo pone uno de los backends de
+``cache_resultados`` (en memoria o compartido entre workers).
+
+La mayor parte del tráfico repite unos pocos valores de los sliders, así que
+la clave es la consulta normalizada ``(precio_min, precio_max, rating_min,
+tipo_vino, gusto)`` redondeada al paso de la interfaz. La caché se vacía
+cuando se recarga el dataset o el modelo.
+
+Los resultados son deterministas (ranking + diversificación MMR), también
+cuando no hay vinos en el rango y se muestran vinos variados de todo el
+catálogo. Una entrada cacheada es por tanto idéntica a la que se calcularía
+de nuevo.
+"""
+import math
+
+# Pasos de los controles del formulario del Sommelier
+PASO_PRECIO = 0.5
+PASO_RATING = 0.05
+
+# Valores del formulario -> valores de la columna tipo_vino del dataset
+TIPOS_VINO = {
+    'todos': 'Todos',
+    'ambos': 'Todos',
+    'tinto': 'Tinto',
+    'blanco': 'Blanco',
+    'rosado': 'Rosado',
+}
+
+GUSTO_DEFECTO = 'equilibrado'
+
+
+def redondear_paso(valor, paso):
+    """Valor redondeado al paso del control. ValueError si no es un número finito ('abc', 'nan', 'inf')"""
+    try:
+        pasos = float(valor) / paso
+    except (TypeError, ValueError):
+        pasos = math.nan
+    if not math.isfinite(pasos):
+        raise ValueError(f"Valor no válido: {valor}")
+    return round(round(pasos) * paso, 2)
+
+
+def normalizar_consulta(precio_min, precio_max, rating_min, tipo_vino=None, gusto=None, gustos=None):
+    """Consulta canónica que se usa tanto para buscar como de clave de caché.
+
+    ValueError si precio_min, precio_max o rating_min no son números finitos.
+    """
+    precio_min = redondear_paso(precio_min, PASO_PRECIO)
+    precio_max = redondear_paso(precio_max, PASO_PRECIO)
+    rating_min = redondear_paso(rating_min, PASO_RATING)
+    tipo = str(tipo_vino).strip() if tipo_vino else 'Todos'
+    tipo_vino = TIPOS_VINO.get(tipo.lower(), tipo)
+    gusto = str(gusto).strip().lower() if gusto else GUSTO_DEFECTO
+    if gustos is not None and gusto not in gustos:
+        gusto = GUSTO_DEFECTO
+    return precio_min, precio_max, rating_min, tipo_vino, gusto
@@ -0,0 +1,267 @@
+# Backends de caché de resultados
+"""
+Interfaz común de caché que usan las recomendaciones y el chatbot, con dos
+implementaciones intercambiables:
+
+- ``CacheLRU``: diccionario en memoria del proceso (LRU + TTL). Cada worker de
+  gunicorn tiene su propia copia.
+- ``CacheSQLite``: archivo SQLite en modo WAL compartido por todos los
+  procesos de la máquina, de modo que lo que calcula un worker lo aprovechan
+  los demás. No necesita ningún servicio externo. Los valores se guardan
+  como JSON (nunca pickle) y el archivo vive en un directorio de la app con
+  permisos 0700/0600: si otro usuario puede escribir en él, no se abre.
+
+``crear_cache(config, espacio)`` elige el backend según ``CACHE_BACKEND``.
+Un fallo del backend compartido nunca rompe la petición: se trata como un
+fallo de caché y se calcula el valor.
+"""
+import json
+import os
+import sqlite3
+import stat
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheResultados:
+    """Interfaz de los backends de caché"""
+
+    def obtener(self, clave):
+        """Devuelve (True, valor) si la clave está vigente, (False, None) si no"""
+        raise NotImplementedError
+
+    def guardar(self, clave, valor):
+        raise NotImplementedError
+
+    def limpiar(self, *args):
+        """Vacía la caché (acepta los argumentos de los callbacks de recarga)"""
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def estadisticas(self):
+        raise NotImplementedError
+
+    def obtener_o_calcular(self, clave, calcular):
+        encontrado, valor = self.obtener(clave)
+        if encontrado:
+            return valor
+        valor = calcular()
+        self.guardar(clave, valor)
+        return valor
+
+    def _contadores(self):
+        total = self.aciertos + self.fallos
+        return {
+            'backend': self.backend,
+            'entradas': len(self),
+            'max_entradas': self.max_entradas,
+            'ttl': self.ttl,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': round(self.aciertos / total, 4) if total else 0.0,
+            'expulsiones': self.expulsiones,
+            'invalidaciones': self.invalidaciones,
+        }
+
+
+class CacheLRU(CacheResultados):
+    """Diccionario acotado con expulsión LRU y caducidad por TTL, seguro entre hilos"""
+
+    backend = 'memoria'
+
+    def __init__(self, max_entradas=512, ttl=300):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._datos = OrderedDict()  # clave -> (expira_en, valor)
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self.invalidaciones = 0
+
+    def obtener(self, clave):
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is not None and entrada[0] > ahora:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return True, entrada[1]
+            if entrada is not None:
+                del self._datos[clave]
+            self.fallos += 1
+            return False, None
+
+    def guardar(self, clave, valor):
+        with self._lock:
+            self._datos[clave] = (time.monotonic() + self.ttl, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+                self.expulsiones += 1
+
+    def limpiar(self, *args):
+        with self._lock:
+            self._datos.clear()
+            self.invalidaciones += 1
+
+    def __len__(self):
+        return len(self._datos)
+
+    def estadisticas(self):
+        return self._contadores()
+
+
+def _a_json(valor):
+    """Tipos de numpy/pandas que aparecen en los resultados -> tipos de JSON"""
+    if hasattr(valor, 'item'):
+        return valor.item()
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()
+    raise TypeError(f"{type(valor).__name__} no se puede guardar en la caché compartida")
+
+
+def comprobar_ruta_privada(ruta):
+    """Crea el directorio de la caché (0700) y rechaza rutas en las que pueda escribir otro usuario"""
+    ruta = os.path.abspath(ruta)
+    directorio = os.path.dirname(ruta)
+    os.makedirs(directorio, mode=0o700, exist_ok=True)
+    if not hasattr(os, 'geteuid'):
+        return ruta
+    for camino in (directorio, ruta):
+        try:
+            info = os.stat(camino)
+        except FileNotFoundError:
+            continue
+        if info.st_uid not in (os.geteuid(), 0) or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError(f"{camino} es de otro usuario o tiene permisos de escritura para otros")
+    return ruta
+
+
+class CacheSQLite(CacheResultados):
+    """Caché LRU + TTL en un archivo SQLite (WAL) compartido entre procesos.
+
+    Varios espacios (``recomendaciones``, ``chatbot``...) pueden compartir el
+    mismo archivo; el límite de entradas y la invalidación son por espacio.
+    Los contadores de aciertos y fallos son los de este proceso.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, ruta, espacio='general', max_entradas=512, ttl=300, timeout=2.0):
+        self.ruta = comprobar_ruta_privada(ruta)
+        self.espacio = espacio
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.timeout = timeout
+        self._local = threading.local()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self.invalidaciones = 0
+        self.errores = 0
+        self._conexion()
+
+    def _conexion(self):
+        # Una conexión por hilo y por proceso: no se heredan tras un fork
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is not None and self._local.pid == os.getpid():
+            return conexion
+        conexion = sqlite3.connect(self.ruta, timeout=self.timeout, isolation_level=None)
+        conexion.execute('PRAGMA journal_mode=WAL')
+        for archivo in (self.ruta, f'{self.ruta}-wal', f'{self.ruta}-shm'):
+            if os.path.exists(archivo):
+                os.chmod(archivo, 0o600)
+        conexion.execute('PRAGMA synchronous=NORMAL')
+        conexion.execute('''CREATE TABLE IF NOT EXISTS cache (
+                                espacio TEXT NOT NULL,
+                                clave TEXT NOT NULL,
+                                valor TEXT NOT NULL,
+                                expira REAL NOT NULL,
+                                usado REAL NOT NULL,
+                                PRIMARY KEY (espacio, clave))''')
+        conexion.execute('CREATE INDEX IF NOT EXISTS cache_usado ON cache (espacio, usado)')
+        self._local.conexion, self._local.pid = conexion, os.getpid()
+        return conexion
+
+    @staticmethod
+    def _serializar_clave(clave):
+        # repr de tuplas de str/float/int es estable entre procesos (a diferencia de hash())
+        return repr(clave)
+
+    def _error(self, operacion, e):
+        self.errores += 1
+        print(f"⚠️ Caché compartida ({operacion}) no disponible: {e}")
+
+    def obtener(self, clave):
+        ahora = time.time()
+        try:
+            conexion = self._conexion()
+            fila = conexion.execute('SELECT valor, expira FROM cache WHERE espacio = ? AND clave = ?',
+                                    (self.espacio, self._serializar_clave(clave))).fetchone()
+            if fila is not None and fila[1] > ahora:
+                conexion.execute('UPDATE cache SET usado = ? WHERE espacio = ? AND clave = ?',
+                                 (ahora, self.espacio, self._serializar_clave(clave)))
+                self.aciertos += 1
+                return True, json.loads(fila[0])
+        except (sqlite3.Error, ValueError) as e:
+            self._error('lectura', e)
+        self.fallos += 1
+        return False, None
+
+    def guardar(self, clave, valor):
+        ahora = time.time()
+        try:
+            conexion = self._conexion()
+            with conexion:
+                conexion.execute('BEGIN IMMEDIATE')
+                conexion.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)',
+                                 (self.espacio, self._serializar_clave(clave),
+                                  json.dumps(valor, ensure_ascii=False, default=_a_json),
+                                  ahora + self.ttl, ahora))
+                # Primero las caducadas, después las menos usadas que sobren
+                conexion.execute('DELETE FROM cache WHERE espacio = ? AND expira <= ?', (self.espacio, ahora))
+                sobrantes = conexion.execute('''DELETE FROM cache WHERE espacio = ? AND clave IN (
+                                                    SELECT clave FROM cache WHERE espacio = ?
+                                                    ORDER BY usado DESC LIMIT -1 OFFSET ?)''',
+                                             (self.espacio, self.espacio, self.max_entradas)).rowcount
+                self.expulsiones += max(sobrantes, 0)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self._error('escritura', e)
+
+    def limpiar(self, *args):
+        try:
+            conexion = self._conexion()
+            conexion.execute('DELETE FROM cache WHERE espacio = ?', (self.espacio,))
+            self.invalidaciones += 1
+        except sqlite3.Error as e:
+            self._error('limpieza', e)
+
+    def __len__(self):
+        try:
+            return self._conexion().execute('SELECT COUNT(*) FROM cache WHERE espacio = ? AND expira > ?',
+                                            (self.espacio, time.time())).fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def estadisticas(self):
+        estadisticas = self._contadores()
+        estadisticas.update({'espacio': self.espacio, 'errores': self.errores, 'pid': os.getpid()})
+        return estadisticas
+
+
+def crear_cache(config, espacio, max_entradas=None, ttl=None):
+    """Backend configurado en ``CACHE_BACKEND`` ('memoria' o 'sqlite')"""
+    max_entradas = max_entradas if max_entradas is not None else config.CACHE_MAX_ENTRADAS
+    ttl = ttl if ttl is not None else config.CACHE_TTL
+    if config.CACHE_BACKEND == 'sqlite':
+        try:
+            return CacheSQLite(config.CACHE_SQLITE_FILE, espacio, max_entradas, ttl)
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️ No se pudo abrir la caché compartida {config.CACHE_SQLITE_FILE}: {e}. Se usa caché en memoria")
+    elif config.CACHE_BACKEND != 'memoria':
+        print(f"⚠️ Backend de caché desconocido '{config.CACHE_BACKEND}'. Se usa caché en memoria")
+    return CacheLRU(max_entradas, ttl)
@@ -1,11 +1,17 @@
 import os
-from flask import Flask, request, jsonify
+import threading
+from types import SimpleNamespace
+from flask import Flask, current_app, request, jsonify
 import requests
 # Cargar variables de entorno desde .env automáticamente
 from dotenv import load_dotenv
 load_dotenv()
 
+from cache_resultados import crear_cache
+from config_sommelier import Config
+
 app = Flask(__name__)
+app.config.from_object(Config)
 
 # Inicializar modelo Groq con un modelo actualizado y soportado
 from langchain_groq import ChatGroq
@@ -16,17 +22,40 @@ GROQ_API_KEY = os.environ.get("GROQ_API_KEY", "gsk_mWUb2egpHu7XrX7CU1DPWGdyb3FYh
 # - llama-3.1-8b-instant (más rápido)
 # - mixtral-8x7b-32768 (alternativa)
 
+MODELO_GROQ = "llama-3.3-70b-versatile"
+
 try:
     chat = ChatGroq(
         api_key=GROQ_API_KEY, 
-        model_name="llama-3.3-70b-versatile",  # Modelo actualizado
+        model_name=MODELO_GROQ,  # Modelo actualizado
         temperature=0.7
     )
-    print("✓ Modelo Groq inicializado correctamente: llama-3.3-70b-versatile")
+    print(f"✓ Modelo Groq inicializado correctamente: {MODELO_GROQ}")
 except Exception as e:
     print(f"❌ Error inicializando ChatGroq: {e}")
     chat = None
 
+# Respuestas a preguntas repetidas, compartidas entre workers. Se crea en la primera
+# petición con la configuración de la app que la atiende (p. ej. TestingConfig en memoria)
+cache_respuestas = None
+_lock_cache = threading.Lock()
+
+
+def obtener_cache():
+    """Caché de respuestas del chatbot, con el backend de ``current_app.config``"""
+    global cache_respuestas
+    with _lock_cache:
+        if cache_respuestas is None:
+            config = SimpleNamespace(**current_app.config)
+            cache_respuestas = crear_cache(config, 'chatbot', config.CHATBOT_CACHE_MAX_ENTRADAS,
+                                           config.CHATBOT_CACHE_TTL)
+    return cache_respuestas
+
+
+def normalizar_mensaje(mensaje):
+    """Misma pregunta con distinto espaciado o mayúsculas -> misma clave"""
+    return ' '.join(mensaje.lower().split())
+
 
 
 
@@ -38,11 +67,18 @@ def chatbot_endpoint():
         return jsonify({'response': 'Mensaje vacío'}), 400
     if chat is None:
         return jsonify({'response': 'Error: El modelo Groq no se ha inicializado correctamente.'}), 500
+    clave = ('chat', MODELO_GROQ, normalizar_mensaje(user_message))
+    encontrado, respuesta = obtener_cache().obtener(clave)
+    if encontrado:
+        return jsonify({'response': respuesta})
     try:
         from langchain_core.messages import HumanMessage
         prompt = f"Usuario: {user_message}\nResponde de forma útil, breve y profesional."
         response = chat.invoke([HumanMessage(content=prompt)])
-        return jsonify({'response': str(getattr(response, 'content', response))})
+        respuesta = str(getattr(response, 'content', response))
+        # Solo se guardan las respuestas correctas; los errores se reintentan
+        obtener_cache().guardar(clave, respuesta)
+        return jsonify({'response': respuesta})
     except Exception as e:
         return jsonify({'response': f'Error: {str(e)}'}), 500
 
@@ -52,7 +88,7 @@ if __name__ == '__main__':
     print("\n" + "="*60)
     print("🤖 CHATBOT GROQ - Servidor iniciado")
     print("="*60)
-    print(f"✓ Modelo: llama-3.3-70b-versatile")
+    print(f"✓ Modelo: {MODELO_GROQ}")
     print(f"✓ Endpoint: POST http://localhost:5000/chat")
     print(f"✓ Formato: {{'message': 'tu pregunta aquí'}}")
     print("="*60 + "\n")
@@ -0,0 +1,97 @@
+# Descargas HTTP concurrentes para el scraping sin navegador
+"""
+Un navegador cuesta cientos de MB y segundos por página; muchas páginas de
+Vivino (búsquedas, la API JSON de exploración) ya traen los vinos en la
+respuesta HTTP.
+
+``ClienteHttp.descargar(urls)`` las pide todas a la vez con un
+``httpx.AsyncClient``: un pool de ``concurrencia`` conexiones keep-alive
+reutilizadas entre peticiones y entre tandas, hasta ``cerrar()``. Respeta el
+mismo ``LimitadorPorHost`` que los navegadores. Solo transporta: qué hacer con
+cada respuesta (parsearla o pasar la página al pool de navegadores) lo decide
+``MotorScraping``.
+"""
+import asyncio
+import time
+from collections import namedtuple
+
+import httpx
+
+from perfil_navegador import USER_AGENT
+
+# estado = None y error = la excepción cuando la petición no llegó a responder
+RespuestaHttp = namedtuple('RespuestaHttp', ['url', 'estado', 'tipo', 'texto', 'error'])
+
+CABECERAS = {
+    'Accept': 'text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'es-ES,es;q=0.8,en-US;q=0.5,en;q=0.3',
+}
+
+
+class ClienteHttp:
+    """Peticiones GET concurrentes sobre un pool de conexiones keep-alive"""
+
+    def __init__(self, concurrencia=8, timeout=15.0, limitador=None, user_agent=USER_AGENT):
+        self.concurrencia = max(1, int(concurrencia))
+        self.timeout = timeout
+        self.limitador = limitador
+        self.cabeceras = dict(CABECERAS, **{'User-Agent': user_agent})
+        self.peticiones = 0
+        self.errores = 0
+        self.segundos = 0.0
+        self._bucle = None
+        self._cliente_async = None
+
+    def _cliente(self):
+        limites = httpx.Limits(max_connections=self.concurrencia, max_keepalive_connections=self.concurrencia)
+        return httpx.AsyncClient(headers=self.cabeceras, limits=limites, timeout=self.timeout,
+                                 follow_redirects=True)
+
+    async def _descargar(self, cliente, semaforo, url):
+        async with semaforo:
+            if self.limitador is not None:
+                espera = self.limitador.reservar(url)
+                if espera > 0:
+                    await asyncio.sleep(espera)
+            self.peticiones += 1
+            try:
+                respuesta = await cliente.get(url)
+            except httpx.HTTPError as e:
+                self.errores += 1
+                return RespuestaHttp(url, None, '', '', e)
+        tipo = respuesta.headers.get('content-type', '').split(';')[0].strip()
+        return RespuestaHttp(url, respuesta.status_code, tipo, respuesta.text, None)
+
+    async def _descargar_todas(self, urls):
+        if self._cliente_async is None:
+            self._cliente_async = self._cliente()
+        semaforo = asyncio.Semaphore(self.concurrencia)
+        return await asyncio.gather(*(self._descargar(self._cliente_async, semaforo, url) for url in urls))
+
+    def descargar(self, urls):
+        """{url: RespuestaHttp} de todas las urls (sin repetir), descargadas a la vez"""
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        if self._bucle is None:
+            # Un bucle propio que sobrevive entre tandas: las conexiones siguen abiertas
+            self._bucle = asyncio.new_event_loop()
+        inicio = time.monotonic()
+        respuestas = self._bucle.run_until_complete(self._descargar_todas(urls))
+        self.segundos += time.monotonic() - inicio
+        return {respuesta.url: respuesta for respuesta in respuestas}
+
+    def cerrar(self):
+        """Cierra las conexiones abiertas"""
+        if self._cliente_async is not None:
+            self._bucle.run_until_complete(self._cliente_async.aclose())
+            self._cliente_async = None
+        if self._bucle is not None:
+            self._bucle.close()
+            self._bucle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
@@ -9,6 +9,8 @@ import numpy as np
 from datetime import datetime
 import os
 
+from esquema_vinos import guardar_dataset, leer_dataset
+
 def combinar_datasets():
     """
     Combinar dataset de tintos existente con el nuevo dataset de blancos
@@ -18,7 +20,7 @@ def combinar_datasets():
     
     # Cargar dataset de tintos (ultra limpio)
     try:
-        df_tintos = pd.read_csv('datos_scraping/resumen_scraping_completo_20250716_130237_limpio_20250717_113049_ultra_limpio.csv')
+        df_tintos = leer_dataset('datos_scraping/resumen_scraping_completo_20250716_130237_limpio_20250717_113049_ultra_limpio.csv')
         print(f"✅ Dataset de tintos cargado: {len(df_tintos)} vinos")
     except Exception as e:
         print(f"❌ Error cargando tintos: {e}")
@@ -37,7 +39,7 @@ def combinar_datasets():
             return
         
         archivo_blancos = max(archivos_blancos)
-        df_blancos = pd.read_csv(f'datos_scraping/{archivo_blancos}')
+        df_blancos = leer_dataset(f'datos_scraping/{archivo_blancos}')
         print(f"✅ Dataset de blancos cargado: {len(df_blancos)} vinos")
         print(f"   📁 Archivo: {archivo_blancos}")
         
@@ -130,7 +132,8 @@ def combinar_datasets():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     nombre_archivo = f"datos_scraping/dataset_vinos_combinado_{timestamp}.csv"
     
-    df_combinado.to_csv(nombre_archivo, index=False, encoding='utf-8')
+    # Copia binaria tipada + exportación CSV
+    guardar_dataset(df_combinado, nombre_archivo)
     
     print(f"\n💾 DATASET COMBINADO GUARDADO:")
     print(f"   📁 Archivo: {nombre_archivo}")
@@ -144,7 +147,7 @@ def combinar_datasets():
     df_ultra_limpio = df_combinado.dropna(subset=columnas_criticas)
     
     nombre_archivo_limpio = f"datos_scraping/dataset_vinos_combinado_ultra_limpio_{timestamp}.csv"
-    df_ultra_limpio.to_csv(nombre_archivo_limpio, index=False, encoding='utf-8')
+    guardar_dataset(df_ultra_limpio, nombre_archivo_limpio)
     
     print(f"   📁 Archivo ultra limpio: {nombre_archivo_limpio}")
     print(f"   📊 Vinos ultra limpios: {len(df_ultra_limpio)}")
@@ -25,34 +25,17 @@ class Config:
 
     @classmethod
     def cargar_modelo(cls):
-        """Carga el modelo y sus componentes"""
+        """Carga el modelo y sus componentes (una sola vez por proceso, vía registro)"""
         try:
-            import joblib
-            # Cargar modelo principal
-            modelo = joblib.load(cls.MODEL_FILE)
-            # Cargar scaler
-            scaler = joblib.load(cls.SCALER_FILE)
-            # Cargar información del modelo si está disponible
-            model_info = None
-            if cls.MODEL_INFO_FILE and cls.MODEL_INFO_FILE.exists():
-                try:
-                    model_info = joblib.load(cls.MODEL_INFO_FILE)
-                except:
-                    model_info = None
-            # Cargar encoder si existe (compatibilidad con modelos antiguos)
-            encoder = None
-            if cls.ENCODER_FILE.exists():
-                try:
-                    with open(cls.ENCODER_FILE, 'rb') as f:
-                        encoder = pickle.load(f)
-                except:
-                    encoder = None
+            from registro_modelos import get_model
+            artefactos = get_model('completo')
             print(f"✅ Modelo cargado exitosamente desde {cls.MODEL_FILE}")
+            model_info = artefactos.model_info
             if model_info:
                 print(f"📊 Versión del modelo: {model_info.get('version', 'desconocida')}")
                 print(f"📅 Timestamp: {model_info.get('timestamp', 'desconocido')}")
                 print(f"🏷️ Clases disponibles: {model_info.get('clases_calidad', [])}")
-            return modelo, scaler, encoder, model_info
+            return artefactos.modelo, artefactos.scaler, artefactos.label_encoder, model_info
         except Exception as e:
             print(f"❌ Error cargando modelo: {e}")
             return None, None, None, None
@@ -62,14 +45,15 @@ class Config:
         """Obtiene información sobre el dataset actual"""
         if not cls.LATEST_CSV:
             return None
-        import pandas as pd
+        # El almacén columnar mapeado en memoria evita volver a leer el CSV
+        from dataset_vinos import cargar_dataset
         try:
-            df = pd.read_csv(cls.LATEST_CSV)
+            df = cargar_dataset(cls.LATEST_CSV)
             return {
                 'archivo': cls.LATEST_CSV.name,
                 'total_vinos': len(df),
-                'precio_min': df['precio_euros'].min(),
-                'precio_max': df['precio_euros'].max(),
+                'precio_min': df['precio_eur'].min(),
+                'precio_max': df['precio_eur'].max(),
                 'rating_min': df['rating'].min(),
                 'rating_max': df['rating'].max(),
                 'columnas': list(df.columns)
@@ -116,26 +100,45 @@ CSV_FILES_LIMPIO = list(Config.DATA_DIR.glob(Config.CSV_PATTERN_LIMPIO)) if Conf
 CSV_FILES_ULTRA_LIMPIO = list(Config.DATA_DIR.glob(Config.CSV_PATTERN_ULTRA_LIMPIO)) if Config.DATA_DIR.exists() else []
 CSV_FILES_COMBINADO = list(Config.DATA_DIR.glob(Config.CSV_PATTERN_COMBINADO)) if Config.DATA_DIR.exists() else []
 
-if CSV_FILES_COMBINADO:
-    LATEST_CSV = max(CSV_FILES_COMBINADO, key=os.path.getctime)
-    print(f"⚖️ Usando dataset BALANCEADO (tintos + blancos): {LATEST_CSV.name}")
-elif CSV_FILES_ULTRA_LIMPIO:
-    LATEST_CSV = max(CSV_FILES_ULTRA_LIMPIO, key=os.path.getctime)
-    print(f"🌟 Usando archivo de datos ULTRA LIMPIO: {LATEST_CSV.name}")
-elif CSV_FILES_LIMPIO:
-    LATEST_CSV = max(CSV_FILES_LIMPIO, key=os.path.getctime)
-    print(f"✨ Usando archivo de datos LIMPIO: {LATEST_CSV.name}")
-else:
-    CSV_FILES = CSV_FILES_1 + CSV_FILES_2
-    LATEST_CSV = max(CSV_FILES, key=os.path.getctime) if CSV_FILES else None
-    if LATEST_CSV:
-        print(f"📊 Usando archivo de datos original: {LATEST_CSV.name}")
+def localizar_csv_datos(verbose=True):
+    """Devuelve el CSV de datos a usar por orden de prioridad (combinado > ultra limpio > limpio > original)"""
+    def buscar(patron):
+        return list(Config.DATA_DIR.glob(patron)) if Config.DATA_DIR.exists() else []
+
+    combinado = buscar(Config.CSV_PATTERN_COMBINADO)
+    if combinado:
+        ruta = max(combinado, key=os.path.getctime)
+        if verbose:
+            print(f"⚖️ Usando dataset BALANCEADO (tintos + blancos): {ruta.name}")
+        return ruta
+    ultra_limpio = buscar(Config.CSV_PATTERN_ULTRA_LIMPIO)
+    if ultra_limpio:
+        ruta = max(ultra_limpio, key=os.path.getctime)
+        if verbose:
+            print(f"🌟 Usando archivo de datos ULTRA LIMPIO: {ruta.name}")
+        return ruta
+    limpio = buscar(Config.CSV_PATTERN_LIMPIO)
+    if limpio:
+        ruta = max(limpio, key=os.path.getctime)
+        if verbose:
+            print(f"✨ Usando archivo de datos LIMPIO: {ruta.name}")
+        return ruta
+    originales = buscar(Config.CSV_PATTERN_1) + buscar(Config.CSV_PATTERN_2)
+    ruta = max(originales, key=os.path.getctime) if originales else None
+    if ruta and verbose:
+        print(f"📊 Usando archivo de datos original: {ruta.name}")
+    return ruta
+
+LATEST_CSV = localizar_csv_datos()
 
 # Definir archivos de modelo usando Config
 MODEL_FILE = Config.STATIC_DIR / 'wine_model.pkl' if (Config.STATIC_DIR / 'wine_model.pkl').exists() else (Config.BASE_DIR / 'modelo_random_forest_vivino.pkl' if (Config.BASE_DIR / 'modelo_random_forest_vivino.pkl').exists() else Config.MODELS_DIR / 'modelo_random_forest_vivino.pkl')
 SCALER_FILE = Config.STATIC_DIR / 'wine_scaler.pkl' if (Config.STATIC_DIR / 'wine_scaler.pkl').exists() else (Config.BASE_DIR / 'scaler_vivino.pkl' if (Config.BASE_DIR / 'scaler_vivino.pkl').exists() else Config.MODELS_DIR / 'scaler_vivino.pkl')
 MODEL_INFO_FILE = Config.STATIC_DIR / 'model_info.pkl' if (Config.STATIC_DIR / 'model_info.pkl').exists() else None
 ENCODER_FILE = Config.BASE_DIR / 'label_encoder_vivino.pkl' if (Config.BASE_DIR / 'label_encoder_vivino.pkl').exists() else Config.MODELS_DIR / 'label_encoder_vivino.pkl'
+# Modelo de 3 características (precio, rating, num_reviews) usado por /sommelier
+VIVINO_MODEL_FILE = Config.MODELS_DIR / 'modelo_random_forest_vivino.pkl'
+VIVINO_SCALER_FILE = Config.MODELS_DIR / 'scaler_vivino.pkl'
 
 # Asignar estos archivos a la clase Config para mantener compatibilidad
 Config.CSV_FILES_1 = CSV_FILES_1
@@ -148,6 +151,20 @@ Config.MODEL_FILE = MODEL_FILE
 Config.SCALER_FILE = SCALER_FILE
 Config.MODEL_INFO_FILE = MODEL_INFO_FILE
 Config.ENCODER_FILE = ENCODER_FILE
+Config.VIVINO_MODEL_FILE = VIVINO_MODEL_FILE
+Config.VIVINO_SCALER_FILE = VIVINO_SCALER_FILE
+
+# Recarga en caliente de modelos reentrenados (segundos entre comprobaciones)
+Config.MODEL_HOT_RELOAD = os.environ.get('MODEL_HOT_RELOAD', '1') == '1'
+Config.MODEL_RELOAD_INTERVAL = float(os.environ.get('MODEL_RELOAD_INTERVAL', 30))
+Config.MODEL_VERSIONS_RETENIDAS = 3
+# Modelo con el que se precalculan las predicciones del catálogo
+Config.MODELO_PREDICCIONES = 'vivino'
+
+# Recarga en caliente del catálogo cuando cambia o aparece un CSV más reciente
+Config.localizar_csv_datos = staticmethod(localizar_csv_datos)
+Config.DATASET_HOT_RELOAD = os.environ.get('DATASET_HOT_RELOAD', '1') == '1'
+Config.DATASET_RELOAD_INTERVAL = float(os.environ.get('DATASET_RELOAD_INTERVAL', 60))
     
     
     
@@ -155,10 +172,34 @@ Config.ENCODER_FILE = ENCODER_FILE
 # Configuración de recomendaciones
 Config.DEFAULT_RECOMMENDATIONS = 6
 Config.MAX_RECOMMENDATIONS = 12
+Config.BUSQUEDA_RESULTADOS = 10
+Config.BUSQUEDA_MAX_RESULTADOS = 50
+Config.AUTOCOMPLETAR_SUGERENCIAS = 8
 Config.MIN_RATING = 3.8
 Config.MAX_RATING = 5.0
 Config.MIN_PRICE = 8.0
 Config.MAX_PRICE = 100.0
+Config.MAX_PREDICCIONES_LOTE = 1000
+# Caché LRU de resultados de /sommelier y /api/recomendar (segundos de vida por entrada)
+Config.CACHE_MAX_ENTRADAS = int(os.environ.get('CACHE_MAX_ENTRADAS', 512))
+Config.CACHE_TTL = float(os.environ.get('CACHE_TTL', 300))
+# 'sqlite': caché compartida por todos los workers de la máquina; 'memoria': una por worker
+Config.CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'sqlite')
+# Directorio propio de la app (no el /tmp compartido): solo su usuario puede escribir en él
+Config.CACHE_DIR = Path(os.environ.get('CACHE_DIR', Config.BASE_DIR / 'cache'))
+Config.CACHE_SQLITE_FILE = Path(os.environ.get('CACHE_SQLITE_FILE', Config.CACHE_DIR / 'sommelier_cache.sqlite3'))
+# Respuestas del chatbot a preguntas idénticas
+Config.CHATBOT_CACHE_MAX_ENTRADAS = int(os.environ.get('CHATBOT_CACHE_MAX_ENTRADAS', 256))
+Config.CHATBOT_CACHE_TTL = float(os.environ.get('CHATBOT_CACHE_TTL', 3600))
+# Historial de recomendaciones (WineRecommendation): se inserta por lotes en segundo plano
+Config.RECOMENDACIONES_LOTE = int(os.environ.get('RECOMENDACIONES_LOTE', 50))
+Config.RECOMENDACIONES_INTERVALO_MS = int(os.environ.get('RECOMENDACIONES_INTERVALO_MS', 500))
+Config.RECOMENDACIONES_MAX_PENDIENTES = int(os.environ.get('RECOMENDACIONES_MAX_PENDIENTES', 10000))
+# Contraseñas: coste de bcrypt y ejecutor acotado para /login y /register
+Config.BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+Config.HASH_MAX_HILOS = int(os.environ.get('HASH_MAX_HILOS', 2))
+Config.HASH_MAX_COLA = int(os.environ.get('HASH_MAX_COLA', 8))
+Config.HASH_TIMEOUT = float(os.environ.get('HASH_TIMEOUT', 5))
 
 # Categorías de ocasiones
 Config.OCASIONES = {
@@ -187,6 +228,24 @@ Config.FEATURE_WEIGHTS = {
     'valor': 0.10
 }
 
+# Ajustes de FEATURE_WEIGHTS según el gusto elegido (se normalizan a suma 1)
+Config.PESOS_POR_GUSTO = {
+    'equilibrado': {},
+    'premium': {'rating': 0.55, 'num_reviews': 0.15, 'precio': 0.0, 'valor': 0.05},
+    'economico': {'rating': 0.20, 'precio': 0.35, 'valor': 0.25},
+    'popular': {'rating': 0.20, 'num_reviews': 0.30, 'popularidad': 0.30},
+}
+
+# Diversidad de la rejilla de recomendaciones (MMR sobre los mejores candidatos).
+# MMR_LAMBDA = 1 es el ranking puro; valores menores penalizan repetir grupo
+Config.MMR_LAMBDA = 0.7
+Config.MMR_CANDIDATOS = 60
+Config.MMR_PESOS_SIMILITUD = {
+    'bodega': 0.5,
+    'region': 0.3,
+    'precio': 0.2
+}
+
 
 # Configuración específica para desarrollo
 
@@ -202,6 +261,8 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     DEBUG = True
     TESTING = True
+    CACHE_BACKEND = 'memoria'
+    BCRYPT_LOG_ROUNDS = 4
 
 # Selección de configuración basada en variable de entorno
 config_mapping = {
@@ -0,0 +1,265 @@
+# Carga y preparación del dataset de vinos
+"""
+Etapa de preparación del dataset que se ejecuta una sola vez al cargar el CSV.
+
+Los valores que solo dependen de los datos (``nombre_limpio`` y el ``año``
+entero) se calculan aquí para todo el catálogo, de modo que las peticiones
+solo tienen que leer la columna. El resultado se exporta una vez a un almacén
+columnar (``almacen_columnar``) que los workers mapean en memoria.
+
+El dataset preparado y sus índices forman un ``CatalogoVinos`` inmutable. El
+``GestorCatalogo`` lo sustituye de forma atómica cuando el CSV cambia en disco
+y avisa a quien dependa de él (cachés, índices derivados).
+"""
+import hashlib
+import os
+import re
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from almacen_columnar import VERSION_FORMATO, abrir_columnar, asegurar_columnar
+from autocompletado_vinos import IndiceAutocompletado
+from busqueda_vinos import IndiceBusqueda
+from deduplicacion_vinos import calcular_claves
+from esquema_vinos import leer_dataset
+from facetas_vinos import FacetasVinos
+from indice_vinos import IndiceVinos
+from ranking_vinos import MatrizRanking
+from vigilancia import VigilanteCambios, firma_archivos
+
+# Regiones que se eliminan del nombre (ya se muestran por separado)
+REGIONES_NOMBRE = ['Campo de Borja', 'Calatayud', 'Almansa', 'Ribera del Duero',
+                   'Rioja', 'Rías Baixas', 'Toro', 'Bierzo', 'Jumilla', 'Montsant',
+                   'Priorat', 'Penedès', 'Catalunya', 'Valencia', 'Alicante', 'Mallorca']
+
+# Palabras clave que separan el nombre del vino del de la bodega
+SEPARADORES_BODEGA = ['Campo', 'Bodega', 'Bodegas', 'Winery', 'Estate', 'Viñedos', 'Cellers']
+
+PALABRAS_VACIAS = {'del', 'de', 'la', 'el', 'los', 'las'}
+
+# Expresiones precompiladas, en el mismo orden en que se aplican
+RE_AÑADA = re.compile(r'\b20\d{2}\b')
+RE_PRECIO = re.compile(r'[\€\$]\s*\d+[,\.]?\d*')
+RE_PUNTUACION = re.compile(r'\d+[,\.]\d+\s*(puntos?|pts?)')
+RE_MILILITROS = re.compile(r'\d+\s*ml\b')
+RE_CENTILITROS = re.compile(r'\b\d+\s*cl\b')
+RE_DESCUENTO = re.compile(r'\d+%\s*(descuento|off)', re.IGNORECASE)
+RE_AHORRA = re.compile(r'ahorra\d+%?', re.IGNORECASE)
+RE_REGIONES = re.compile(
+    '|'.join(re.escape(region) for region in sorted(REGIONES_NOMBRE, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+RE_ESPECIALES = re.compile(r'[^\w\s\-\.]')
+RE_ESPACIOS = re.compile(r'\s+')
+
+
+def limpiar_año(año_val):
+    """Convierte el año a entero para eliminar decimales ('N/A' si no es válido)"""
+    try:
+        if pd.isna(año_val):
+            return "N/A"
+        return int(float(año_val))
+    except:
+        return "N/A"
+
+
+def limpiar_nombre_vino(nombre):
+    """Deja solo el nombre del vino, sin añada, precio, región ni bodega"""
+    try:
+        if pd.isna(nombre):
+            return "Vino sin nombre"
+
+        nombre_str = str(nombre)
+
+        # Eliminar números de añadas, precios, puntuaciones, volúmenes y ofertas
+        nombre_str = RE_AÑADA.sub('', nombre_str)
+        nombre_str = RE_PRECIO.sub('', nombre_str)
+        nombre_str = RE_PUNTUACION.sub('', nombre_str)
+        nombre_str = RE_MILILITROS.sub('', nombre_str)
+        nombre_str = RE_CENTILITROS.sub('', nombre_str)
+        nombre_str = RE_DESCUENTO.sub('', nombre_str)
+        nombre_str = RE_AHORRA.sub('', nombre_str)
+
+        # Eliminar regiones específicas del nombre en una sola pasada
+        nombre_str = RE_REGIONES.sub('', nombre_str)
+
+        # Limpiar caracteres especiales y espacios múltiples
+        nombre_str = RE_ESPECIALES.sub(' ', nombre_str)
+        nombre_str = RE_ESPACIOS.sub(' ', nombre_str)
+
+        # Dividir por palabras clave que separan el nombre de la bodega
+        for sep in SEPARADORES_BODEGA:
+            if sep in nombre_str:
+                partes = nombre_str.split(sep)
+                if len(partes) > 1 and len(partes[0].strip()) > 3:
+                    nombre_str = partes[0].strip()
+                    break
+
+        # Si contiene comas, tomar solo la primera parte (nombre principal)
+        if ',' in nombre_str:
+            nombre_str = nombre_str.split(',')[0]
+
+        # Eliminar palabras repetidas o muy cortas
+        palabras_filtradas = []
+        for palabra in nombre_str.strip().split():
+            if len(palabra) >= 3 and palabra.lower() not in PALABRAS_VACIAS:
+                if not palabras_filtradas or palabra.lower() != palabras_filtradas[-1].lower():
+                    palabras_filtradas.append(palabra)
+
+        nombre_str = ' '.join(palabras_filtradas)
+
+        # Si el nombre está vacío después de la limpieza, usar un fallback
+        if not nombre_str or len(nombre_str) < 3:
+            return "Vino seleccionado"
+
+        # Limitar longitud para mantener la interfaz limpia
+        if len(nombre_str) > 50:
+            nombre_str = nombre_str[:50] + "..."
+
+        return nombre_str
+
+    except:
+        return "Vino seleccionado"
+
+
+def calcular_nombres_limpios(nombres):
+    """Aplica limpiar_nombre_vino una vez por nombre distinto y reparte el resultado"""
+    unicos = pd.unique(nombres.dropna())
+    limpios = {nombre: limpiar_nombre_vino(nombre) for nombre in unicos}
+    return nombres.map(limpios).fillna("Vino seleccionado")
+
+
+def preparar_dataset(df):
+    """Añade al dataset las columnas derivadas que usan las peticiones.
+
+    - ``nombre_limpio``: nombre del vino listo para mostrar.
+    - ``año``: entero (``Int64`` con nulos) en lugar de float ``2019.0``.
+    - ``clave_vino``: hash de 64 bits de la clave canónica, para deduplicar.
+    """
+    if df.empty:
+        return df
+
+    if 'nombre_completo' in df.columns:
+        df['nombre_limpio'] = calcular_nombres_limpios(df['nombre_completo'])
+    elif 'nombre_vino' in df.columns:
+        df['nombre_limpio'] = calcular_nombres_limpios(df['nombre_vino'])
+    else:
+        df['nombre_limpio'] = "Vino seleccionado"
+
+    if 'año' in df.columns:
+        años = pd.to_numeric(df['año'], errors='coerce')
+        df['año'] = np.trunc(años).astype('Int64')
+
+    df['clave_vino'] = calcular_claves(df)
+    return df
+
+
+def leer_y_preparar_csv(ruta):
+    """Lee el catálogo con su esquema tipado (copia binaria si existe) y lo prepara"""
+    df = leer_dataset(ruta)
+    return preparar_dataset(df)
+
+
+def cargar_dataset(ruta, columnar=True):
+    """Catálogo preparado listo para las peticiones.
+
+    Con ``columnar=True`` se sirve desde el almacén columnar mapeado en memoria
+    (compartido entre workers), que se exporta la primera vez. Si no se puede
+    usar, se lee el CSV como antes.
+    """
+    if not columnar:
+        return leer_y_preparar_csv(ruta)
+    try:
+        return abrir_columnar(asegurar_columnar(ruta, leer_y_preparar_csv))
+    except Exception as e:
+        print(f"⚠️ Almacén columnar no disponible ({e}); se lee el CSV")
+        return leer_y_preparar_csv(ruta)
+
+
+class CatalogoVinos:
+    """Dataset preparado y sus índices. Una petición usa siempre el mismo catálogo."""
+
+    def __init__(self, df, ruta=None, firma=None):
+        self.df = df
+        self.ruta = ruta
+        self.firma = firma
+        self.indice = IndiceVinos(df)
+        self.ranking = MatrizRanking(df)
+        self.busqueda = IndiceBusqueda(df)
+        self.autocompletado = IndiceAutocompletado(df)
+        self.facetas = FacetasVinos(df)
+        self.claves = df['clave_vino'].to_numpy() if 'clave_vino' in df.columns else None
+        self.cargado_en = datetime.now()
+        # Derivada del archivo (no de la hora de carga) para que todos los workers
+        # que leen el mismo CSV compartan versión y, con ella, entradas de caché
+        self.version = hashlib.sha1(repr((firma, VERSION_FORMATO)).encode()).hexdigest()[:12] if firma else 'vacio'
+
+    def __len__(self):
+        return len(self.df)
+
+    def __repr__(self):
+        nombre = os.path.basename(str(self.ruta)) if self.ruta else 'vacío'
+        return f'<CatalogoVinos {nombre} ({len(self.df)} vinos) v{self.version}>'
+
+
+class GestorCatalogo:
+    """Mantiene el catálogo activo y lo recarga en segundo plano cuando cambia el CSV"""
+
+    def __init__(self, localizar_ruta=None):
+        self.localizar_ruta = localizar_ruta
+        self.actual = CatalogoVinos(pd.DataFrame())
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._vigilante = None
+
+    def cargar(self, ruta):
+        """Carga y publica el catálogo del CSV indicado"""
+        with self._lock:
+            firma = firma_archivos([ruta]) if ruta else None
+            df = cargar_dataset(ruta) if ruta else pd.DataFrame()
+            catalogo = CatalogoVinos(df, ruta, firma)
+            anterior, self.actual = self.actual, catalogo
+        return catalogo, anterior
+
+    def recargar(self, ruta=None):
+        if ruta is None and self.localizar_ruta is not None:
+            ruta = self.localizar_ruta()
+        catalogo, anterior = self.cargar(ruta)
+        print(f"🔄 Catálogo recargado: {anterior} → {catalogo} (pid {os.getpid()})")
+        for callback in list(self._callbacks):
+            try:
+                callback(catalogo)
+            except Exception as e:
+                print(f"⚠️ Error en callback de recarga del catálogo: {e}")
+        return catalogo
+
+    def al_recargar(self, callback):
+        """Registra callback(catalogo) que se ejecuta tras cada recarga"""
+        self._callbacks.append(callback)
+        return callback
+
+    def modificado(self):
+        """{'catalogo': firma} si el CSV activo cambió o hay uno más reciente"""
+        ruta = self.localizar_ruta() if self.localizar_ruta is not None else self.actual.ruta
+        if ruta is None:
+            return {}
+        firma = firma_archivos([ruta])
+        if firma != self.actual.firma:
+            return {'catalogo': firma}
+        return {}
+
+    def iniciar_vigilancia(self, intervalo):
+        if self._vigilante is not None and self._vigilante.activo_en_este_proceso():
+            return self._vigilante
+        self._vigilante = VigilanteCambios('vigilante-catalogo', self.modificado,
+                                           lambda clave: self.recargar(), intervalo)
+        self._vigilante.start()
+        return self._vigilante
+
+    def detener_vigilancia(self):
+        if self._vigilante is not None:
+            self._vigilante.detener()
+            self._vigilante = None
@@ -1,31 +1,16 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
-import time
 import csv
 import os
 from datetime import datetime
 from flask import Flask, render_template, request, jsonify
 
+from espera_carga import EsperaCarga
+from perfil_navegador import crear_driver
+
 def configurar_driver():
-    """Configura el driver de Chrome para web scraping"""
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--window-size=1920,1080')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-web-security')
-    chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36')
-    
-    # Usar webdriver-manager para descargar automáticamente el ChromeDriver correcto
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
+    """Configura el driver de Chrome para web scraping (perfil ligero: sin imágenes, fuentes ni analítica)"""
+    return crear_driver(user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36')
 
 def guardar_datos_csv(datos_vinos, precios):
     """Guarda los datos extraídos en un archivo CSV"""
@@ -229,17 +214,11 @@ def obtener_datos_vivino():
         url = "https://www.vivino.com/explore?e=eJwFwUsKgCAUBdDd3GFEQp_BHbaBoFFEmBpIWtLru_vOsYmLDuIQD6qsRvQbK0T9ssxh2PYdEhVuQ-yHpXVisM8fZyfnlLxZBQ-3KwQ8Moxsih82Qhr5"
         print(f"🌐 Accediendo a: {url}")
         
-        driver.get(url)
-        time.sleep(8)  # Esperar más tiempo para cargar completamente toda la página
-        
-        # Hacer scroll para cargar contenido dinámico
-        print("📜 Haciendo scroll para cargar más contenido...")
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(3)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-        time.sleep(2)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(3)
+        # Espera a que los vinos dejen de aparecer (antes: 8 s + 3 scrolls con 2-3 s fijos)
+        print("📜 Esperando a que carguen los vinos y haciendo scroll mientras aparezcan nuevos...")
+        espera = EsperaCarga(referencia_inicial=8.0, referencia_scroll=8.0 / 3)
+        espera.cargar(driver, url)
+        tiempos_carga = espera.imprimir_resumen()
         
         html_content = driver.page_source
         soup = BeautifulSoup(html_content, "html.parser")
@@ -250,6 +229,7 @@ def obtener_datos_vivino():
             "mensaje": "Scraping completo de página Vivino realizado",
             "url_consultada": url,
             "timestamp_scraping": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "tiempos_carga": tiempos_carga,
             "vinos": [],
             "metadatos": {
                 "total_elementos_html": len(soup.find_all()),
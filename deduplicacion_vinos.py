@@ -0,0 +1,82 @@
+# Claves canónicas de vino para deduplicar recomendaciones
+"""
+Cada vino recibe al cargar el dataset una clave canónica resumida en un hash
+de 64 bits (columna ``clave_vino``). El mismo vino puede aparecer varias
+veces en el catálogo, por ejemplo desde scrapings distintos. En las
+peticiones, deduplicar es comprobar ese entero en un ``set``.
+
+La clave es, por orden de preferencia:
+
+- ``vivino:<id>:<añada>``: el id de vino de Vivino (``/w/<id>`` en la url)
+  identifica el vino aunque el nombre se haya extraído distinto.
+- ``vino:<nombre normalizado>|<bodega normalizada>|<añada>`` si la url no
+  trae id (p. ej. páginas ``/explore``).
+"""
+import hashlib
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+PATRON_ID_VIVINO = re.compile(r'/w/(\d+)')
+PATRON_NO_ALFANUMERICO = re.compile(r'[^a-z0-9]+')
+PATRON_AÑO = re.compile(r'\b(19|20)\d{2}\b')
+
+
+def id_vivino(url):
+    if not isinstance(url, str):
+        return None
+    coincidencia = PATRON_ID_VIVINO.search(url)
+    return coincidencia.group(1) if coincidencia else None
+
+
+def normalizar_texto(texto):
+    """Minúsculas, sin tildes, sin años ni signos: 'Viña Ardanza 2016' -> 'vina ardanza'"""
+    if not isinstance(texto, str):
+        return ''
+    texto = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii').lower()
+    texto = PATRON_AÑO.sub(' ', texto.replace('...', ' '))
+    return PATRON_NO_ALFANUMERICO.sub(' ', texto).strip()
+
+
+def clave_canonica(nombre, bodega, año, url):
+    añada = str(int(año)) if año is not None and not pd.isna(año) else 'nv'
+    identificador = id_vivino(url)
+    if identificador:
+        return f"vivino:{identificador}:{añada}"
+    return f"vino:{normalizar_texto(nombre)}|{normalizar_texto(bodega)}|{añada}"
+
+
+def hash64(texto):
+    """Hash estable de 64 bits con signo (el mismo en todos los procesos, a diferencia de hash())"""
+    return int.from_bytes(hashlib.blake2b(texto.encode('utf-8'), digest_size=8).digest(), 'little', signed=True)
+
+
+def _columna(df, nombre):
+    return df[nombre].to_numpy(dtype=object) if nombre in df.columns else np.full(len(df), None, dtype=object)
+
+
+def calcular_claves(df):
+    """Array int64 con el hash de la clave canónica de cada fila"""
+    nombres = _columna(df, 'nombre_limpio') if 'nombre_limpio' in df.columns else _columna(df, 'nombre_vino')
+    claves = [
+        hash64(clave_canonica(nombre, bodega, año, url))
+        for nombre, bodega, año, url in zip(nombres, _columna(df, 'bodega'), _columna(df, 'año'), _columna(df, 'url'))
+    ]
+    return np.array(claves, dtype=np.int64)
+
+
+def primeros_unicos(posiciones, claves, k):
+    """Las primeras k posiciones (en el orden dado) cuya clave no se ha visto antes"""
+    vistas = set()
+    elegidas = []
+    for posicion in posiciones:
+        clave = claves[posicion]
+        if clave in vistas:
+            continue
+        vistas.add(clave)
+        elegidas.append(posicion)
+        if len(elegidas) == k:
+            break
+    return np.asarray(elegidas, dtype=np.int64)
@@ -50,8 +50,15 @@ clf.fit(X_train, y_train)
 
 
 # Guardar modelo y scaler (solo le_target)
-joblib.dump({'model': clf, 'le_target': le_target}, MODEL_PATH)
-joblib.dump(scaler, SCALER_PATH)
+# Se escribe en un temporal y se renombra: la app en marcha recarga el modelo
+# al detectar el cambio y nunca debe leer un pickle a medio escribir
+def guardar_atomico(objeto, ruta):
+    ruta_tmp = ruta + '.tmp'
+    joblib.dump(objeto, ruta_tmp)
+    os.replace(ruta_tmp, ruta)
+
+guardar_atomico({'model': clf, 'le_target': le_target}, MODEL_PATH)
+guardar_atomico(scaler, SCALER_PATH)
 print(f'Modelo guardado en {MODEL_PATH}')
 print(f'Scaler guardado en {SCALER_PATH}')
 
@@ -0,0 +1,126 @@
+# Escritura diferida (write-behind) de filas en la base de datos
+"""
+Cola acotada en memoria + hilo que inserta las filas por lotes.
+
+Las peticiones solo encolan un diccionario y nunca esperan a la base de datos
+(Neon, PostgreSQL remoto). El hilo agrupa las filas y hace un único INSERT
+multi-fila con ``commit`` cuando junta ``max_lote`` filas o cuando pasa
+``intervalo`` segundos desde la primera fila del lote.
+
+- Si la cola está llena (base de datos caída durante mucho tiempo), la fila se
+  descarta y se cuenta: la respuesta nunca se bloquea.
+- Si un lote falla se hace rollback, se registra y se sigue con el siguiente.
+- Al salir el proceso (``atexit``, también en los workers de gunicorn) se
+  insertan las filas pendientes antes de terminar.
+- El hilo se arranca con la primera fila de cada proceso. Con ``gunicorn
+  --preload``, un hilo creado antes del fork no existiría en los workers.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+
+
+class EscrituraDiferida:
+    """Inserta en la tabla de ``modelo`` las filas encoladas, por lotes y en segundo plano"""
+
+    def __init__(self, app, db, modelo, max_lote=50, intervalo=0.5, max_pendientes=10000, nombre=None):
+        self.app = app
+        self.db = db
+        self.tabla = modelo.__table__
+        self.max_lote = max_lote
+        self.intervalo = intervalo
+        self.max_pendientes = max_pendientes
+        self.nombre = nombre or f'escritura-{self.tabla.name}'
+        self._cola = queue.Queue(maxsize=max_pendientes)
+        self._parar = threading.Event()
+        self._lock = threading.Lock()
+        self._hilo = None
+        self._pid = None
+        self.escritas = 0
+        self.descartadas = 0
+        self.fallidas = 0
+        self.lotes = 0
+        atexit.register(self.detener)
+
+    def encolar(self, fila):
+        """Añade la fila sin bloquear. Devuelve False si la cola está llena y se descarta"""
+        self._asegurar_hilo()
+        try:
+            self._cola.put_nowait(fila)
+            return True
+        except queue.Full:
+            self.descartadas += 1
+            return False
+
+    def pendientes(self):
+        return self._cola.qsize()
+
+    def estadisticas(self):
+        return {
+            'pendientes': self.pendientes(),
+            'escritas': self.escritas,
+            'lotes': self.lotes,
+            'fallidas': self.fallidas,
+            'descartadas': self.descartadas,
+        }
+
+    def _activo_en_este_proceso(self):
+        return self._pid == os.getpid() and self._hilo is not None and self._hilo.is_alive()
+
+    def _asegurar_hilo(self):
+        if self._activo_en_este_proceso():
+            return
+        with self._lock:
+            if self._activo_en_este_proceso() or self._parar.is_set():
+                return
+            if self._pid != os.getpid():
+                # Proceso hijo tras un fork: la cola heredada pertenece al padre
+                self._cola = queue.Queue(maxsize=self.max_pendientes)
+                self._pid = os.getpid()
+            self._hilo = threading.Thread(target=self._bucle, name=self.nombre, daemon=True)
+            self._hilo.start()
+
+    def _bucle(self):
+        while not (self._parar.is_set() and self._cola.empty()):
+            lote = self._recoger()
+            if lote:
+                self._insertar(lote)
+
+    def _recoger(self):
+        """Hasta max_lote filas, esperando como mucho `intervalo` desde la primera"""
+        try:
+            lote = [self._cola.get(timeout=self.intervalo)]
+        except queue.Empty:
+            return []
+        limite = time.monotonic() + self.intervalo
+        while len(lote) < self.max_lote:
+            # Al parar no se espera: se vacía lo que ya está en la cola
+            restante = 0 if self._parar.is_set() else limite - time.monotonic()
+            try:
+                lote.append(self._cola.get(timeout=restante) if restante > 0 else self._cola.get_nowait())
+            except queue.Empty:
+                break
+        return lote
+
+    def _insertar(self, lote):
+        with self.app.app_context():
+            try:
+                self.db.session.execute(self.tabla.insert(), lote)
+                self.db.session.commit()
+                self.escritas += len(lote)
+                self.lotes += 1
+            except Exception as e:
+                self.db.session.rollback()
+                self.fallidas += len(lote)
+                print(f"⚠️ No se pudieron guardar {len(lote)} filas en {self.tabla.name}: {e}")
+
+    def detener(self, timeout=10.0):
+        """Inserta lo pendiente y para el hilo (se llama sola al salir el proceso)"""
+        self._parar.set()
+        hilo = self._hilo
+        if hilo is not None and self._pid == os.getpid() and hilo.is_alive():
+            hilo.join(timeout)
+            if hilo.is_alive():
+                print(f"⚠️ {self.nombre}: quedan {self.pendientes()} filas sin guardar")
@@ -0,0 +1,123 @@
+# Espera de carga de páginas de Vivino sin pausas fijas
+"""
+Detecta cuándo un listado de Vivino ya tiene sus vinos en lugar de dormir un
+tiempo fijo (los ``time.sleep(8)``, ``sleep(2-3)`` por scroll... de antes).
+
+- ``esperar_vinos``: ``WebDriverWait`` que sondea cuántos enlaces ``/w/``
+  hay en el DOM y termina cuando hay alguno y el número lleva ``estable``
+  segundos sin cambiar.
+- ``scroll_hasta_cargar``: baja al final de la página y espera como mucho
+  ``estable`` segundos a que aparezcan enlaces ``/w/`` nuevos. En cuanto un
+  scroll no trae ninguno, deja de bajar.
+
+Cada página (desde que vuelve ``driver.get``) se compara con lo que dormía la
+versión de pausas fijas (``referencia_inicial`` + ``referencia_scroll`` por
+scroll) y ``resumen()`` da el tiempo ahorrado.
+"""
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+JS_CONTAR_VINOS = "return document.querySelectorAll('a[href*=\"/w/\"]').length"
+JS_SCROLL_FINAL = "window.scrollTo(0, document.body.scrollHeight);"
+
+
+class _VinosEstables:
+    """Condición de WebDriverWait: hay vinos y su número no cambia desde hace `estable` segundos"""
+
+    def __init__(self, contar, estable):
+        self.contar = contar
+        self.estable = estable
+        self.ultimo = None
+        self.desde = None
+
+    def __call__(self, driver):
+        vinos = self.contar(driver)
+        ahora = time.monotonic()
+        if vinos != self.ultimo:
+            self.ultimo, self.desde = vinos, ahora
+        return vinos if vinos > 0 and ahora - self.desde >= self.estable else False
+
+
+class EsperaCarga:
+    """Espera explícita a que los vinos de la página estén cargados, con estadísticas de tiempo"""
+
+    def __init__(self, timeout=10.0, estable=0.75, sondeo=0.1, max_scrolls=8,
+                 referencia_inicial=0.0, referencia_scroll=0.0):
+        self.timeout = timeout
+        self.estable = estable
+        self.sondeo = sondeo
+        self.max_scrolls = max_scrolls
+        # Segundos que dormía la versión con pausas fijas (para medir el ahorro)
+        self.referencia_inicial = referencia_inicial
+        self.referencia_scroll = referencia_scroll
+        self._lock = threading.Lock()
+        self.paginas = 0
+        self.segundos = 0.0
+        self.segundos_referencia = 0.0
+
+    @staticmethod
+    def contar_vinos(driver):
+        return int(driver.execute_script(JS_CONTAR_VINOS) or 0)
+
+    def esperar_vinos(self, driver):
+        """Número de enlaces de vinos cuando dejan de aparecer nuevos (0 si no llega ninguno a tiempo)"""
+        condicion = _VinosEstables(self.contar_vinos, self.estable)
+        try:
+            return WebDriverWait(driver, self.timeout, poll_frequency=self.sondeo).until(condicion)
+        except TimeoutException:
+            return condicion.ultimo or 0
+
+    def scroll_hasta_cargar(self, driver, vinos=None):
+        """Baja mientras cada scroll traiga vinos nuevos. Devuelve (vinos, scrolls hechos)"""
+        vinos = self.contar_vinos(driver) if vinos is None else vinos
+        for scroll in range(1, self.max_scrolls + 1):
+            driver.execute_script(JS_SCROLL_FINAL)
+            antes = vinos
+            try:
+                WebDriverWait(driver, self.estable, poll_frequency=self.sondeo).until(
+                    lambda d: self.contar_vinos(d) > antes)
+            except TimeoutException:
+                return vinos, scroll
+            vinos = self.contar_vinos(driver)
+        return vinos, self.max_scrolls
+
+    def esperar_pagina(self, driver):
+        """Tras driver.get: espera los vinos y hace el scroll. Devuelve el número de enlaces de vinos"""
+        inicio = time.monotonic()
+        vinos = self.esperar_vinos(driver)
+        scrolls = 0
+        if vinos:
+            vinos, scrolls = self.scroll_hasta_cargar(driver, vinos)
+        self.registrar(time.monotonic() - inicio, scrolls)
+        return vinos
+
+    def cargar(self, driver, url):
+        """driver.get(url) + esperar_pagina"""
+        driver.get(url)
+        return self.esperar_pagina(driver)
+
+    def registrar(self, segundos, scrolls):
+        with self._lock:
+            self.paginas += 1
+            self.segundos += segundos
+            self.segundos_referencia += self.referencia_inicial + self.referencia_scroll * scrolls
+
+    def resumen(self):
+        with self._lock:
+            return {
+                'paginas': self.paginas,
+                'segundos': round(self.segundos, 2),
+                'segundos_pausas_fijas': round(self.segundos_referencia, 2),
+                'segundos_ahorrados': round(max(0.0, self.segundos_referencia - self.segundos), 2),
+            }
+
+    def imprimir_resumen(self):
+        resumen = self.resumen()
+        if resumen['paginas']:
+            print(f"⏱️ {resumen['paginas']} páginas listas en {resumen['segundos']:.1f} s "
+                  f"(con pausas fijas: {resumen['segundos_pausas_fijas']:.1f} s, "
+                  f"ahorrados {resumen['segundos_ahorrados']:.1f} s)")
+        return resumen
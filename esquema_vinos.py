@@ -0,0 +1,120 @@
+# Esquema tipado del registro de vino y formato binario del pipeline
+"""
+Tipos de cada columna del dataset de vinos y lectura/escritura común para
+todas las etapas del pipeline de ``datos_scraping`` (combinar, limpiar...).
+
+Cada etapa guarda su resultado en formato columnar binario (Feather por
+defecto, Parquet con ``FORMATO_DATASET=parquet``) junto a la exportación CSV
+de siempre:
+
+    datos_scraping/<nombre>.csv       exportación (la que buscan los patrones)
+    datos_scraping/<nombre>.feather   copia tipada que se lee en su lugar
+
+``leer_dataset(ruta_csv)`` usa la copia binaria cuando existe y no es más
+antigua que el CSV. Así, un CSV editado a mano sigue mandando. Feather y
+Parquet necesitan ``pyarrow`` (en requirements.txt); si faltara, solo se
+escribe el CSV y se avisa.
+"""
+import importlib.util
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Tipo lógico de cada columna del registro de vino
+ESQUEMA_VINO = {
+    'nombre_vino': 'texto',
+    'nombre_completo': 'texto',
+    'bodega': 'texto',
+    'region': 'texto',
+    'tipo_vino': 'texto',
+    'categoria_calidad': 'texto',
+    'categoria_busqueda': 'texto',
+    'disponibilidad': 'texto',
+    'url': 'texto',
+    'archivo_origen': 'texto',
+    'session_id': 'texto',
+    'timestamp': 'texto',
+    'precio_eur': 'decimal',
+    'precio_original': 'decimal',
+    'descuento': 'decimal',
+    'rating': 'decimal',
+    'año': 'entero',
+    'num_reviews': 'entero',
+    'pagina': 'entero',
+    'posicion': 'entero',
+    'posicion_global': 'entero',
+    'posicion_pagina': 'entero',
+}
+
+FORMATO_BINARIO = os.environ.get('FORMATO_DATASET', 'feather')
+EXTENSIONES = {'feather': '.feather', 'parquet': '.parquet'}
+
+
+def aplicar_esquema(df):
+    """Convierte las columnas conocidas a su tipo (enteros con nulos como ``Int64``)"""
+    for columna, tipo in ESQUEMA_VINO.items():
+        if columna not in df.columns:
+            continue
+        if tipo == 'entero':
+            valores = pd.to_numeric(df[columna], errors='coerce')
+            df[columna] = np.trunc(valores).astype('Int64')
+        elif tipo == 'decimal':
+            df[columna] = pd.to_numeric(df[columna], errors='coerce').astype(np.float64)
+        else:
+            serie = df[columna].astype(object)
+            df[columna] = serie.where(serie.isna(), serie.astype(str))
+    return df
+
+
+def pyarrow_disponible():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def ruta_binaria(ruta_csv, formato=None):
+    return Path(ruta_csv).with_suffix(EXTENSIONES[formato or FORMATO_BINARIO])
+
+
+def guardar_dataset(df, ruta_csv, exportar_csv=True, formato=None):
+    """Guarda la etapa en formato binario tipado y, opcionalmente, exporta el CSV.
+
+    Devuelve la lista de archivos escritos.
+    """
+    formato = formato or FORMATO_BINARIO
+    df = aplicar_esquema(df.reset_index(drop=True))
+    escritos = []
+    # Primero el CSV: la copia binaria debe quedar igual o más reciente para usarse
+    if exportar_csv:
+        df.to_csv(ruta_csv, index=False, encoding='utf-8')
+        escritos.append(Path(ruta_csv))
+    if not pyarrow_disponible():
+        print(f"⚠️ pyarrow no está instalado: se omite la copia {formato} de {Path(ruta_csv).name}")
+        return escritos
+    destino = ruta_binaria(ruta_csv, formato)
+    temporal = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+    if formato == 'parquet':
+        df.to_parquet(temporal, index=False)
+    else:
+        df.to_feather(temporal)
+    os.replace(temporal, destino)
+    escritos.append(destino)
+    return escritos
+
+
+def leer_dataset(ruta):
+    """Lee una etapa del pipeline con sus tipos, prefiriendo la copia binaria"""
+    ruta = Path(ruta)
+    if ruta.suffix == '.feather':
+        return aplicar_esquema(pd.read_feather(ruta))
+    if ruta.suffix == '.parquet':
+        return aplicar_esquema(pd.read_parquet(ruta))
+
+    if pyarrow_disponible():
+        for formato in EXTENSIONES:
+            binaria = ruta_binaria(ruta, formato)
+            if not binaria.exists():
+                continue
+            if not ruta.exists() or os.path.getmtime(binaria) >= os.path.getmtime(ruta):
+                return leer_dataset(binaria)
+    return aplicar_esquema(pd.read_csv(ruta))
@@ -0,0 +1,157 @@
+# Conteos de facetas para los sliders del Sommelier
+"""
+Histogramas acumulados precalculados al cargar el catálogo.
+
+Los sliders se mueven en pasos fijos (``PASO_PRECIO``, ``PASO_RATING``), así
+que cada eje tiene una rejilla con los valores que puede tomar un slider.
+Cada vino cae en un bin por eje: o justo en un punto de la rejilla o
+estrictamente entre dos. Con eso los límites inclusivos (``precio_min <=
+precio <= precio_max``, ``rating >= rating_min``) dan exactamente el mismo
+conteo que ``IndiceVinos.consultar``.
+
+Por cada (tipo de vino, valor de la faceta) se guarda la tabla de conteos
+(bin de precio x bin de rating), acumulada hacia arriba en precio y hacia
+abajo en rating. El número de vinos de cualquier rango es la resta de dos
+celdas. Los conteos de todas las posiciones de un slider salen de una fila
+de la tabla, en O(bins), sin tocar el DataFrame.
+
+Fuera de la rejilla (precio por encima de ``PRECIO_TOPE`` o rating por debajo
+de ``RATING_DESDE``) los vinos se agrupan en un bin de desborde. Una consulta
+que cae ahí se redondea a ese bin.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from cache_recomendaciones import PASO_PRECIO, PASO_RATING, redondear_paso
+
+# Mismos límites que los sliders (Config.MAX_PRICE, Config.MIN_RATING, Config.MAX_RATING)
+PRECIO_TOPE = 100.0
+RATING_DESDE = 3.8
+RATING_HASTA = 5.0
+
+FACETAS = ['region', 'año']
+
+
+class EjeFacetas:
+    """Rejilla de valores de un slider. Los bins alternan 'entre dos puntos' (par) y 'en el punto' (impar)"""
+
+    def __init__(self, desde, hasta, paso):
+        pasos = range(round(desde / paso), round(hasta / paso) + 1)
+        # Mismo redondeo que normalizar_consulta: los valores del slider coinciden bit a bit
+        self.rejilla = np.array([redondear_paso(i * paso, paso) for i in pasos], dtype=np.float64)
+        self.num_bins = 2 * len(self.rejilla) + 1
+
+    def bins(self, valores):
+        j = np.searchsorted(self.rejilla, valores, side='left')
+        en_punto = self.rejilla[np.minimum(j, len(self.rejilla) - 1)] == valores
+        return np.where(en_punto & (j < len(self.rejilla)), 2 * j + 1, 2 * j)
+
+    def desde(self, valor):
+        """Primer bin con valores >= valor"""
+        j = int(np.searchsorted(self.rejilla, valor, side='left'))
+        return 2 * j + 1 if j < len(self.rejilla) and self.rejilla[j] == valor else 2 * j
+
+    def hasta(self, valor):
+        """Último bin con valores <= valor"""
+        j = int(np.searchsorted(self.rejilla, valor, side='right'))
+        return 2 * j - 1 if j > 0 and self.rejilla[j - 1] == valor else 2 * j
+
+
+def _acumular(conteos):
+    """(..., P, R) -> (..., P + 1, R + 1): [p, r] = vinos con bin de precio < p y bin de rating >= r"""
+    forma = conteos.shape[:-2] + (conteos.shape[-2] + 1, conteos.shape[-1] + 1)
+    acumulados = np.zeros(forma, dtype=np.int32)
+    acumulados[..., 1:, :-1] = np.cumsum(np.cumsum(conteos[..., ::-1], axis=-1)[..., ::-1], axis=-2)
+    acumulados.setflags(write=False)
+    return acumulados
+
+
+class FacetasVinos:
+    """Conteos por tipo de vino, región y añada para cualquier posición de los sliders"""
+
+    def __init__(self, df):
+        precios = self._numerica(df, 'precio_eur')
+        ratings = self._numerica(df, 'rating')
+        tope = min(PRECIO_TOPE, math.ceil(np.nanmax(precios, initial=0) / PASO_PRECIO) * PASO_PRECIO)
+        self.eje_precio = EjeFacetas(0.0, tope, PASO_PRECIO)
+        self.eje_rating = EjeFacetas(RATING_DESDE, RATING_HASTA, PASO_RATING)
+
+        # Precio o rating NaN nunca cumplen el filtro
+        validos = ~np.isnan(precios) & ~np.isnan(ratings)
+        bin_precio = self.eje_precio.bins(precios[validos])
+        bin_rating = self.eje_rating.bins(ratings[validos])
+
+        # El último "tipo" agrupa los vinos sin tipo_vino: solo cuentan en 'Todos'
+        tipos = df['tipo_vino'].to_numpy(dtype=object)[validos] if 'tipo_vino' in df.columns else np.full(validos.sum(), None)
+        codigos_tipo, self.tipos = pd.factorize(pd.Series(tipos, dtype=object))
+        self.tipos = [str(t) for t in self.tipos]
+        codigos_tipo = np.where(codigos_tipo < 0, len(self.tipos), codigos_tipo)
+
+        forma = (len(self.tipos) + 1, self.eje_precio.num_bins, self.eje_rating.num_bins)
+        self.por_tipo = _acumular(self._contar(forma, codigos_tipo, bin_precio, bin_rating))
+
+        self.valores = {}
+        self.por_faceta = {}
+        for faceta in FACETAS:
+            if faceta not in df.columns:
+                continue
+            codigos, valores = pd.factorize(df[faceta].to_numpy(dtype=object)[validos])
+            presentes = codigos >= 0
+            self.valores[faceta] = [v.item() if hasattr(v, 'item') else v for v in valores]
+            conteos = self._contar((forma[0], len(valores)) + forma[1:], codigos_tipo[presentes],
+                                   codigos[presentes], bin_precio[presentes], bin_rating[presentes])
+            self.por_faceta[faceta] = _acumular(conteos)
+
+    @staticmethod
+    def _numerica(df, columna):
+        if columna not in df.columns:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df[columna], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+    @staticmethod
+    def _contar(forma, *indices):
+        conteos = np.zeros(forma, dtype=np.int32)
+        np.add.at(conteos, indices, 1)
+        return conteos
+
+    def _seleccion_tipo(self, tipo_vino):
+        if not tipo_vino or tipo_vino == 'Todos':
+            return slice(None)
+        return [self.tipos.index(tipo_vino)] if tipo_vino in self.tipos else []
+
+    def conteos(self, precio_min, precio_max, rating_min, tipo_vino=None):
+        """Total y conteos de cada faceta y de cada posición de los sliders para la consulta"""
+        desde, hasta = self.eje_precio.desde(precio_min), self.eje_precio.hasta(precio_max)
+        bin_rating = self.eje_rating.desde(rating_min)
+        seleccion = self._seleccion_tipo(tipo_vino)
+        tabla = self.por_tipo[seleccion].sum(axis=0)
+
+        def en_rango(tabla, desde, hasta, bin_rating):
+            # Con precio_min > precio_max la resta es negativa: ningún vino
+            return np.maximum(tabla[..., hasta + 1, bin_rating] - tabla[..., desde, bin_rating], 0)
+
+        # Cada posición de la rejilla k es el bin 2k + 1
+        impares = np.arange(1, self.eje_precio.num_bins, 2)
+        por_precio_min = en_rango(tabla, impares, hasta, bin_rating)
+        por_precio_max = en_rango(tabla, desde, impares, bin_rating)
+        por_rating_min = en_rango(tabla, desde, hasta, np.arange(1, self.eje_rating.num_bins, 2))
+
+        resultado = {
+            'total': int(en_rango(tabla, desde, hasta, bin_rating)),
+            'tipo_vino': self._ordenar(self.tipos, en_rango(self.por_tipo[:-1], desde, hasta, bin_rating)),
+            'precio_min': {'valores': self.eje_precio.rejilla.tolist(), 'conteos': por_precio_min.tolist()},
+            'precio_max': {'valores': self.eje_precio.rejilla.tolist(), 'conteos': por_precio_max.tolist()},
+            'rating_min': {'valores': self.eje_rating.rejilla.tolist(), 'conteos': por_rating_min.tolist()},
+        }
+        for faceta, acumulados in self.por_faceta.items():
+            conteos = en_rango(acumulados[seleccion], desde, hasta, bin_rating).sum(axis=0)
+            resultado[faceta] = self._ordenar(self.valores[faceta], conteos)
+        return resultado
+
+    @staticmethod
+    def _ordenar(valores, conteos):
+        """[{'valor', 'total'}] de mayor a menor, sin los que no tienen vinos"""
+        orden = np.argsort(-conteos, kind='stable')
+        return [{'valor': valores[i], 'total': int(conteos[i])} for i in orden if conteos[i] > 0]
@@ -0,0 +1,65 @@
+# Hash y verificación de contraseñas fuera del hilo de la petición
+"""
+bcrypt es deliberadamente caro (~250 ms con coste 12). Una ráfaga de logins
+que lo ejecuta directamente en cada petición ocupa todos los workers y deja sin
+servicio a ``/sommelier`` y a las páginas estáticas.
+
+Todas las operaciones de bcrypt pasan por un ``ThreadPoolExecutor`` propio:
+
+- como mucho ``HASH_MAX_HILOS`` hashes a la vez por proceso (bcrypt libera el
+  GIL mientras calcula);
+- como mucho ``HASH_MAX_COLA`` esperando turno; con el ejecutor lleno se
+  rechaza al momento con ``ServicioSaturado``, sin encolar ni esperar;
+- una operación que tarda más de ``HASH_TIMEOUT`` también se rechaza.
+
+El coste de bcrypt es ``BCRYPT_LOG_ROUNDS`` de la configuración de Flask
+(``TestingConfig`` usa uno barato).
+
+El límite es por proceso y solo tiene sentido con workers que atienden varias
+peticiones a la vez: el Dockerfile arranca gunicorn con ``--worker-class
+gthread`` y más hilos (16) que plazas del ejecutor. Las peticiones que esperan
+turno ocupan un hilo cada una, pero las que no caben se rechazan al momento y
+el resto de hilos sigue libre para las demás páginas.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturoTimeout
+
+from config_sommelier import Config
+
+
+class ServicioSaturado(Exception):
+    """El ejecutor de bcrypt está lleno: la petición debe reintentarse más tarde"""
+
+
+class EjecutorHash:
+    """Pool de hilos acotado con límite de operaciones en curso + en espera"""
+
+    def __init__(self, max_hilos=2, max_cola=8, timeout=5.0):
+        self.max_hilos = max_hilos
+        self.max_cola = max_cola
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix='bcrypt')
+        self._plazas = threading.BoundedSemaphore(max_hilos + max_cola)
+        self.rechazadas = 0
+
+    def ejecutar(self, funcion, *args):
+        """Resultado de funcion(*args) calculado en el pool; ServicioSaturado si no hay plaza"""
+        if not self._plazas.acquire(blocking=False):
+            self.rechazadas += 1
+            raise ServicioSaturado('Demasiadas operaciones de contraseña en curso')
+        try:
+            futuro = self._pool.submit(funcion, *args)
+        except BaseException:
+            self._plazas.release()
+            raise
+        # La plaza se libera cuando termina el cálculo, aunque la petición ya no espere
+        futuro.add_done_callback(lambda _: self._plazas.release())
+        try:
+            return futuro.result(timeout=self.timeout)
+        except FuturoTimeout:
+            self.rechazadas += 1
+            raise ServicioSaturado('La operación de contraseña ha tardado demasiado')
+
+
+# Ejecutor único por proceso (cada worker gthread de gunicorn tiene el suyo)
+ejecutor_hash = EjecutorHash(Config.HASH_MAX_HILOS, Config.HASH_MAX_COLA, Config.HASH_TIMEOUT)
@@ -0,0 +1,93 @@
+# Índice columnar de vinos para búsquedas por rango de precio
+"""
+Índice inmutable en memoria construido una vez a partir del dataset.
+
+Guarda los precios ordenados junto con el rating y la posición original de
+cada vino, más una partición por ``tipo_vino``. Una consulta por rango de
+precio es un ``searchsorted`` sobre el array ordenado seguido de una máscara
+de rating sobre ese tramo, sin copiar el DataFrame.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _solo_lectura(*arrays):
+    for array in arrays:
+        array.setflags(write=False)
+
+
+class ParticionPrecios:
+    """Precios ordenados ascendentemente con rating y posición original alineados"""
+
+    def __init__(self, precios, ratings, posiciones):
+        self.precios = precios
+        self.ratings = ratings
+        self.posiciones = posiciones
+        _solo_lectura(self.precios, self.ratings, self.posiciones)
+
+    def __len__(self):
+        return len(self.posiciones)
+
+    def tramo(self, precio_min, precio_max):
+        """Índices [inicio, fin) del array ordenado con precio_min <= precio <= precio_max"""
+        inicio = np.searchsorted(self.precios, precio_min, side='left')
+        fin = np.searchsorted(self.precios, precio_max, side='right')
+        return inicio, max(inicio, fin)
+
+    def consultar(self, precio_min, precio_max, rating_min):
+        inicio, fin = self.tramo(precio_min, precio_max)
+        ratings = self.ratings[inicio:fin]
+        return self.posiciones[inicio:fin][ratings >= rating_min]
+
+
+class IndiceVinos:
+    """Índice columnar de solo lectura sobre el dataset de vinos"""
+
+    def __init__(self, df):
+        self.total = len(df)
+        if df.empty or 'precio_eur' not in df.columns:
+            vacio = np.array([], dtype=np.float64)
+            self.todos = ParticionPrecios(vacio.copy(), vacio.copy(), np.array([], dtype=np.int64))
+            self.por_tipo = {}
+            return
+
+        precios = pd.to_numeric(df['precio_eur'], errors='coerce').to_numpy(dtype=np.float64)
+        ratings = pd.to_numeric(df['rating'], errors='coerce').to_numpy(dtype=np.float64)
+
+        # Los precios NaN nunca cumplen un filtro de rango: se excluyen del índice
+        posiciones = np.flatnonzero(~np.isnan(precios))
+        posiciones = posiciones[np.argsort(precios[posiciones], kind='stable')]
+        self.todos = ParticionPrecios(precios[posiciones], ratings[posiciones], posiciones)
+
+        # Particiones por tipo de vino (conservan el orden por precio)
+        self.por_tipo = {}
+        if 'tipo_vino' in df.columns:
+            tipos = df['tipo_vino'].to_numpy(dtype=object)[posiciones]
+            for tipo in pd.unique(tipos):
+                if pd.isna(tipo):
+                    continue
+                mascara = tipos == tipo
+                self.por_tipo[tipo] = ParticionPrecios(
+                    self.todos.precios[mascara],
+                    self.todos.ratings[mascara],
+                    self.todos.posiciones[mascara],
+                )
+
+    def __len__(self):
+        return len(self.todos)
+
+    def particion(self, tipo_vino=None):
+        if tipo_vino and tipo_vino != "Todos":
+            return self.por_tipo.get(tipo_vino)
+        return self.todos
+
+    def consultar(self, precio_min, precio_max, rating_min=4.0, tipo_vino=None):
+        """Posiciones (en el orden original del dataset) de los vinos que cumplen el filtro.
+
+        Equivale a ``(precio_eur >= precio_min) & (precio_eur <= precio_max) &
+        (rating >= rating_min) [& (tipo_vino == tipo_vino)]`` sobre el DataFrame.
+        """
+        particion = self.particion(tipo_vino)
+        if particion is None:
+            return np.array([], dtype=np.int64)
+        return np.sort(particion.consultar(precio_min, precio_max, rating_min))
@@ -9,6 +9,8 @@ import re
 import os
 from datetime import datetime
 
+from esquema_vinos import guardar_dataset, leer_dataset
+
 def limpiar_nombre_bodega(nombre_bodega):
     """
     Limpia y separa nombres de bodegas pegados
@@ -78,7 +80,7 @@ def procesar_csv_scraping(archivo_csv):
     
     # Leer el CSV
     try:
-        df = pd.read_csv(archivo_csv)
+        df = leer_dataset(archivo_csv)
         print(f"✅ Archivo leído exitosamente: {len(df)} filas")
     except Exception as e:
         print(f"❌ Error leyendo archivo: {e}")
@@ -110,7 +112,7 @@ def procesar_csv_scraping(archivo_csv):
     
     # Guardar archivo limpio
     try:
-        df.to_csv(archivo_limpio, index=False)
+        guardar_dataset(df, archivo_limpio)
         print(f"\n💾 Archivo limpio guardado como: {archivo_limpio}")
         print(f"📊 Total de registros procesados: {len(df)}")
         
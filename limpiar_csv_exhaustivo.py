@@ -8,6 +8,8 @@ import numpy as np
 import os
 from datetime import datetime
 
+from esquema_vinos import guardar_dataset, leer_dataset
+
 def limpiar_csv_exhaustivo():
     """
     Elimina registros con NaN en columnas importantes para obtener un dataset más limpio
@@ -32,7 +34,7 @@ def limpiar_csv_exhaustivo():
     
     # Cargar datos
     try:
-        df = pd.read_csv(archivo_objetivo)
+        df = leer_dataset(archivo_objetivo)
         print(f"✅ Archivo cargado: {len(df)} registros totales")
     except Exception as e:
         print(f"❌ Error cargando archivo: {e}")
@@ -117,7 +119,7 @@ def limpiar_csv_exhaustivo():
     nombre_salida = os.path.join(directorio_salida, nombre_base.replace('_sin_nan_criticos.csv', '_ultra_limpio.csv'))
     
     try:
-        df_limpio.to_csv(nombre_salida, index=False, encoding='utf-8')
+        guardar_dataset(df_limpio, nombre_salida)
         print(f"💾 Archivo ultra limpio guardado: {nombre_salida}")
     except Exception as e:
         print(f"❌ Error guardando archivo: {e}")
@@ -8,6 +8,8 @@ import numpy as np
 import os
 from datetime import datetime
 
+from esquema_vinos import guardar_dataset, leer_dataset
+
 def limpiar_nan_csv():
     """
     Elimina todos los registros que contienen valores NaN del CSV
@@ -52,7 +54,7 @@ def limpiar_nan_csv():
     
     # Cargar datos
     try:
-        df = pd.read_csv(archivo_principal)
+        df = leer_dataset(archivo_principal)
         print(f"✅ Archivo cargado: {len(df)} registros totales")
     except Exception as e:
         print(f"❌ Error cargando archivo: {e}")
@@ -131,7 +133,7 @@ def limpiar_nan_csv():
         nombre_salida = os.path.join(directorio_salida, nombre_base.replace('.csv', f'_limpio_sin_nan_criticos.csv'))
     
     try:
-        df_limpio.to_csv(nombre_salida, index=False, encoding='utf-8')
+        guardar_dataset(df_limpio, nombre_salida)
         print(f"💾 Archivo guardado: {nombre_salida}")
     except Exception as e:
         print(f"❌ Error guardando archivo: {e}")
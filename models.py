@@ -3,6 +3,8 @@ from flask_bcrypt import Bcrypt # type: ignore
 from datetime import datetime
 import uuid
 
+from hash_contrasenas import ejecutor_hash
+
 db = SQLAlchemy()
 bcrypt = Bcrypt()
 
@@ -39,12 +41,12 @@ class User(db.Model):
         self.set_password(password)
     
     def set_password(self, password):
-        """Hashea y guarda la contraseña"""
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        """Hashea y guarda la contraseña (en el ejecutor de bcrypt; puede lanzar ServicioSaturado)"""
+        self.password_hash = ejecutor_hash.ejecutar(bcrypt.generate_password_hash, password).decode('utf-8')
     
     def check_password(self, password):
-        """Verifica la contraseña"""
-        return bcrypt.check_password_hash(self.password_hash, password)
+        """Verifica la contraseña (en el ejecutor de bcrypt; puede lanzar ServicioSaturado)"""
+        return ejecutor_hash.ejecutar(bcrypt.check_password_hash, self.password_hash, password)
     
     def get_full_name(self):
         """Retorna el nombre completo"""
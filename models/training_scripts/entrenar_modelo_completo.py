@@ -334,10 +334,13 @@ class ModeloVinoCompleto:
             info_path = f'static/model_info_completo_{timestamp}.pkl'
             joblib.dump(info_modelo, info_path)
             
-            # Actualizar archivos principales (para compatibilidad)
-            joblib.dump(self.modelo, 'static/wine_model.pkl')
-            joblib.dump(self.scaler, 'static/wine_scaler.pkl')
-            joblib.dump(info_modelo, 'static/model_info.pkl')
+            # Actualizar archivos principales (para compatibilidad).
+            # Escritura atómica: la app en marcha los recarga en caliente
+            for objeto, ruta in [(self.modelo, 'static/wine_model.pkl'),
+                                 (self.scaler, 'static/wine_scaler.pkl'),
+                                 (info_modelo, 'static/model_info.pkl')]:
+                joblib.dump(objeto, ruta + '.tmp')
+                os.replace(ruta + '.tmp', ruta)
             
             print(f"✅ Modelo guardado:")
             print(f"   - Modelo: {modelo_path}")
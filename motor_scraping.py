@@ -0,0 +1,718 @@
+#!/usr/bin/env python3
+# Motor único de scraping de Vivino
+"""
+Núcleo común de todos los scrapers de Vivino (avanzado, multipágina,
+mejorado, diversificado y blancos).
+
+- Fuentes de URLs intercambiables: cada modo de crawl solo decide qué páginas
+  visitar (``FuentePaginacion``, ``FuenteCategorias``, ``FuenteRegiones``,
+  ``FuenteVarietales``). Todas generan ``PaginaScraping``.
+- Un único núcleo de extracción: ``tarjetas_vino`` localiza las tarjetas
+  (enlace ``/w/`` + texto de su contenedor) en el HTML y ``extraer_vino``
+  saca precio, rating, reviews, añada, región, bodega... del texto.
+- Ajustes compartidos en ``ConfiguracionScraping``: número de navegadores en
+  paralelo (``PoolNavegadores``), peticiones por segundo a cada host (para
+  todos los navegadores juntos), reintentos, límites de vinos y checkpoint
+  cada N páginas. El checkpoint guarda los vinos
+  y las páginas completadas; con el mismo ``session_id`` se reanuda sin
+  repetir páginas.
+- Con ``http=True`` las páginas se piden primero sin navegador
+  (``ClienteHttp``, la API JSON de exploración cuando la URL lo permite) y
+  solo las que necesitan JS pasan al pool de navegadores.
+
+Una mejora de rendimiento en el motor llega a todos los modos de crawl.
+"""
+import csv
+import json
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from urllib.parse import quote_plus, urlsplit, urlunsplit
+
+import pandas as pd
+from bs4 import BeautifulSoup
+from selenium.webdriver.common.by import By
+
+from cliente_http import ClienteHttp
+from espera_carga import EsperaCarga
+from esquema_vinos import guardar_dataset
+from perfil_navegador import USER_AGENT, crear_driver
+from pool_navegadores import LimitadorPorHost, PoolNavegadores
+
+URL_VIVINO = "https://www.vivino.com"
+# Exploración de tintos españoles (la URL por defecto de los scrapers de siempre)
+URL_EXPLORAR_ESPANA = "https://www.vivino.com/explore?e=eJwFwUsKgCAUBdDd3GFEQp_BHbaBoFFEmBpIWtLru_vOsYmLDuIQD6qsRvQbK0T9ssxh2PYdEhVuQ-yHpXVisM8fZyfnlLxZBQ-3KwQ8Moxsih82Qhr5"
+CARPETA_DATOS = "datos_scraping"
+
+# Columnas de los CSV de scraping (todas las de los scrapers anteriores)
+COLUMNAS_SCRAPING = [
+    'timestamp', 'session_id', 'categoria_busqueda', 'pagina', 'posicion_pagina', 'posicion_global',
+    'nombre_completo', 'url', 'precio_eur', 'precio_original', 'descuento',
+    'bodega', 'region', 'año', 'rating', 'num_reviews', 'categoria_calidad',
+    'tipo_vino', 'disponibilidad'
+]
+
+REGIONES_ESPANA = [
+    'Rioja', 'Ribera del Duero', 'Catalunya', 'Cataluña', 'Madrid', 'Aragón', 'Castilla y León',
+    'Castilla', 'Extremadura', 'Campo de Borja', 'Calatayud', 'Terra Alta', 'Somontano', 'Empordà',
+    'Cariñena', 'Valdejalón', 'Navarra', 'Penedès', 'Priorat', 'Montsant', 'Costers del Segre',
+    'Alella', 'Pla de Bages', 'Jumilla', 'Yecla', 'Bullas', 'Almansa', 'Manchuela', 'La Mancha',
+    'Valdepeñas', 'Montilla-Moriles', 'Jerez', 'Manzanilla', 'Sierras de Málaga', 'Málaga',
+    'Condado de Huelva', 'Galicia', 'Rías Baixas', 'Ribeiro', 'Valdeorras', 'Monterrei', 'Bierzo',
+    'Toro', 'Rueda', 'Valencia', 'Asturias', 'Cantabria', 'País Vasco', 'Euskadi', 'Txakoli',
+]
+
+CALIDADES = [
+    'Great Value', 'Good Value', 'Amazing Value', 'Best Value', 'Excellent Value',
+    'Outstanding Value', 'Top Rated', 'Critics Choice', 'Premium', 'Limited Edition', 'Organic',
+    'Biodynamic', 'Sustainable', 'Cosecha más antigua', 'Vintage', 'Gran Reserva', 'Reserva',
+    'Reserve', 'Crianza',
+]
+
+# Tipo de vino -> palabras que lo identifican en la tarjeta
+TIPOS_VINO = {
+    'Espumoso': ['Espumoso', 'Cava', 'Champagne', 'Sparkling'],
+    'Rosado': ['Rosado', 'Rosé'],
+    'Blanco': ['Blanco', 'White'],
+    'Tinto': ['Tinto', 'Red'],
+}
+
+# Palabras que nunca son el nombre de la bodega
+PALABRAS_NO_BODEGA = {'good', 'great', 'amazing', 'value', 'españa', 'tinto', 'blanco', 'red', 'white', 'wine', 'vintage'}
+TERMINOS_NAVEGACION = ['anterior', 'siguiente', 'página', 'filtro', 'ordenar']
+
+PRECIO_MINIMO, PRECIO_MAXIMO = 3.0, 1000.0
+RATING_MINIMO, RATING_MAXIMO = 1.0, 5.0
+AÑO_MINIMO = 1985
+
+# Lo que dormían por página los scrapers de antes: 3-5 s tras cargar + 2 s al final, 1,5 s por scroll
+PAUSA_FIJA_INICIAL = 6.5
+PAUSA_FIJA_SCROLL = 1.5
+
+SELECTORES_POPUPS = [
+    "//button[contains(@class, 'close')]",
+    "//button[contains(@aria-label, 'Close')]",
+    "//button[contains(text(), '×')]",
+    "//button[contains(text(), 'Cerrar')]",
+    "//*[contains(@class, 'cookie')]//button",
+    "//div[@role='dialog']//button",
+]
+
+_PATRON_REGION = re.compile(r'\b(' + '|'.join(re.escape(r) for r in REGIONES_ESPANA) + r')\b')
+_PATRON_CALIDAD = re.compile('|'.join(re.escape(c) for c in CALIDADES))
+_PATRONES_TIPO = [(tipo, re.compile(r'\b(' + '|'.join(palabras) + r')\b')) for tipo, palabras in TIPOS_VINO.items()]
+_PATRON_PRECIO = re.compile(r'(\d+(?:[,.]\d{1,2})?)\s*(?:€|EUR\b)|€\s*(\d+(?:[,.]\d{1,2})?)')
+# El rating de Vivino siempre es d,d; detrás suele venir el número de valoraciones
+_PATRON_RATING = re.compile(r'(?<![\d,.])([1-5][,.]\d)(?:\s*\(?\s*(\d[\d.,]*)\s*(?:valoraciones|ratings|reviews))?')
+_PATRON_REVIEWS = re.compile(r'(\d[\d.,]*)\s*(?:valoraciones|ratings|reviews)')
+_PATRON_AÑO = re.compile(r'\b(19\d{2}|20\d{2})\b')
+
+# Página a visitar. `listado` identifica la paginación a la que pertenece (su URL base)
+PaginaScraping = namedtuple('PaginaScraping', ['url', 'categoria', 'numero', 'tipo_vino', 'listado'])
+
+
+def _numero(texto):
+    return float(texto.replace(',', '.'))
+
+
+def _entero(texto):
+    """'1.234' o '1,234' -> 1234"""
+    return int(re.sub(r'[.,]', '', texto))
+
+
+def extraer_vino(texto, tipo_vino='Tinto'):
+    """Campos del vino a partir del texto de su tarjeta (precio, rating, región, bodega...)"""
+    texto = re.sub(r'\s+', ' ', texto).strip()
+    vino = {
+        'nombre_completo': texto,
+        'precio_eur': None,
+        'precio_original': None,
+        'descuento': None,
+        'bodega': '',
+        'region': '',
+        'año': None,
+        'rating': None,
+        'num_reviews': None,
+        'categoria_calidad': '',
+        'tipo_vino': tipo_vino,
+        'disponibilidad': 'Disponible',
+    }
+
+    precios = [_numero(a or b) for a, b in _PATRON_PRECIO.findall(texto)]
+    precios = [p for p in precios if PRECIO_MINIMO <= p <= PRECIO_MAXIMO]
+    if precios:
+        vino['precio_eur'] = precios[0]
+        # Precio tachado seguido del precio rebajado
+        if len(precios) > 1 and precios[0] > precios[1]:
+            vino['precio_original'], vino['precio_eur'] = precios[0], precios[1]
+            vino['descuento'] = round((precios[0] - precios[1]) / precios[0] * 100, 1)
+
+    for rating, reviews in _PATRON_RATING.findall(texto):
+        if RATING_MINIMO <= _numero(rating) <= RATING_MAXIMO:
+            vino['rating'] = _numero(rating)
+            if reviews:
+                vino['num_reviews'] = _entero(reviews)
+            break
+    if vino['num_reviews'] is None:
+        reviews = _PATRON_REVIEWS.search(texto)
+        if reviews:
+            vino['num_reviews'] = _entero(reviews.group(1))
+
+    for año in _PATRON_AÑO.findall(texto):
+        if AÑO_MINIMO <= int(año) <= datetime.now().year:
+            vino['año'] = int(año)
+            break
+
+    # La región concreta manda sobre 'España'
+    region = _PATRON_REGION.search(texto)
+    if region:
+        vino['region'] = region.group(1)
+    elif 'España' in texto:
+        vino['region'] = 'España'
+
+    calidad = _PATRON_CALIDAD.search(texto)
+    if calidad:
+        vino['categoria_calidad'] = calidad.group(0)
+
+    for tipo, patron in _PATRONES_TIPO:
+        if patron.search(texto):
+            vino['tipo_vino'] = tipo
+            break
+
+    # Bodega: primeras palabras significativas (hasta dos)
+    palabras = texto.split()
+    for i, palabra in enumerate(palabras[:8]):
+        if (len(palabra) > 2 and '€' not in palabra and not re.match(r'^[\d,.]+$', palabra)
+                and palabra.lower() not in PALABRAS_NO_BODEGA):
+            siguiente = palabras[i + 1] if i + 1 < len(palabras) else ''
+            candidata = f"{palabra} {siguiente}"
+            if len(siguiente) > 2 and not re.match(r'^[\d,.]+$', siguiente) and len(candidata) <= 30:
+                vino['bodega'] = candidata
+            else:
+                vino['bodega'] = palabra
+            break
+
+    return vino
+
+
+def url_absoluta(href):
+    return href if href.startswith('http') else f"{URL_VIVINO}{href}"
+
+
+def tarjetas_vino(html, max_vinos=None, longitud_minima=15):
+    """[(texto, url)] de los vinos de la página: un enlace /w/ por vino con el texto de su contenedor"""
+    soup = BeautifulSoup(html, "html.parser")
+    tarjetas = []
+    urls = set()
+    for enlace in soup.find_all('a', href=lambda x: x and '/w/' in x):
+        url = url_absoluta(enlace['href'])
+        if url in urls:
+            continue
+        contenedor = enlace.find_parent(['div', 'article', 'li', 'section'])
+        texto = (contenedor or enlace).get_text(' ', strip=True)
+        if len(texto) < longitud_minima:
+            continue
+        if '€' not in texto and 'price' not in texto.lower():
+            continue
+        if any(termino in texto.lower() for termino in TERMINOS_NAVEGACION):
+            continue
+        urls.add(url)
+        tarjetas.append((texto, url))
+        if max_vinos and len(tarjetas) >= max_vinos:
+            break
+    return tarjetas
+
+
+def tarjetas_api(datos, max_vinos=None):
+    """[(texto, url)] de una respuesta de /api/explore/explore, con el texto que tendría la tarjeta"""
+    tarjetas = []
+    for match in ((datos or {}).get('explore_vintage') or {}).get('matches') or []:
+        vintage = match.get('vintage') or {}
+        vino = vintage.get('wine') or {}
+        if not vino.get('id'):
+            continue
+        region = vino.get('region') or {}
+        estadisticas = vintage.get('statistics') or {}
+        precio = (match.get('price') or {}).get('amount')
+        partes = [(vino.get('winery') or {}).get('name', ''), vino.get('name', ''), str(vintage.get('year') or ''),
+                  region.get('name', ''), (region.get('country') or {}).get('name', '')]
+        if estadisticas.get('ratings_average'):
+            partes.append(f"{estadisticas['ratings_average']:.1f} {estadisticas.get('ratings_count') or 0} valoraciones")
+        if precio:
+            partes.append(f"{precio:.2f} €")
+        url = f"{URL_VIVINO}/w/{vino['id']}"
+        if vintage.get('year'):
+            url += f"?year={vintage['year']}"
+        tarjetas.append((' '.join(p for p in partes if p), url))
+        if max_vinos and len(tarjetas) >= max_vinos:
+            break
+    return tarjetas
+
+
+def url_api_explorar(url):
+    """URL de la API JSON equivalente a una página /explore con filtros explícitos (None si no la hay).
+
+    Los filtros codificados en ``e=`` solo los entiende la web, así que esas
+    páginas no tienen equivalente en la API.
+    """
+    partes = urlsplit(url)
+    if partes.path.rstrip('/') != '/explore' or not partes.query:
+        return None
+    if any(parametro.split('=')[0] == 'e' for parametro in partes.query.split('&')):
+        return None
+    return urlunsplit(partes._replace(path='/api/explore/explore'))
+
+
+def url_pagina(url_base, numero):
+    """URL de la página `numero` de un listado (añade o sustituye ?page=)"""
+    if 'page=' in url_base:
+        return re.sub(r'page=\d+', f'page={numero}', url_base)
+    separador = '&' if '?' in url_base else '?'
+    return f"{url_base}{separador}page={numero}"
+
+
+class FuenteUrls:
+    """Modo de crawl: decide qué páginas se visitan"""
+
+    tipo_vino = 'Tinto'
+
+    def paginas(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        return iter(self.paginas())
+
+
+class FuentePaginacion(FuenteUrls):
+    """Páginas 1..max_paginas de un listado, navegando directamente por URL"""
+
+    def __init__(self, url_base=URL_EXPLORAR_ESPANA, max_paginas=5, categoria='Explorar', tipo_vino='Tinto'):
+        self.url_base = url_base
+        self.max_paginas = max_paginas
+        self.categoria = categoria
+        self.tipo_vino = tipo_vino
+
+    def paginas(self):
+        for numero in range(1, self.max_paginas + 1):
+            yield PaginaScraping(url_pagina(self.url_base, numero), self.categoria, numero,
+                                 self.tipo_vino, self.url_base)
+
+
+class FuenteCategorias(FuenteUrls):
+    """Lista de (categoría, URL) con filtros distintos; `paginas` páginas de cada una"""
+
+    def __init__(self, categorias, paginas=1, tipo_vino='Tinto'):
+        self.categorias = list(categorias)
+        self.num_paginas = paginas
+        self.tipo_vino = tipo_vino
+
+    def paginas(self):
+        for categoria, url in self.categorias:
+            yield from FuentePaginacion(url, self.num_paginas, categoria, self.tipo_vino).paginas()
+
+
+# Tipo de vino -> (wine_type_ids de Vivino, palabra en español, palabra en inglés)
+TIPOS_VIVINO = {
+    'Tinto': (1, 'tinto', 'red'),
+    'Blanco': (2, 'blanco', 'white'),
+    'Espumoso': (3, 'espumoso', 'sparkling'),
+    'Rosado': (4, 'rosado', 'rose'),
+}
+
+IDS_REGIONES = {
+    'Rueda': '55', 'Rías Baixas': '51', 'Valdeorras': '61', 'Monterrei': '52', 'Ribeiro': '54',
+    'Valencia': '60', 'Cataluña': '40', 'Penedès': '53', 'Alella': '35', 'Empordà': '44',
+}
+
+
+class FuenteBusqueda(FuenteUrls):
+    """Búsquedas por término: cada plantilla de URL con `paginas` páginas por término"""
+
+    PLANTILLAS = []
+    SUFIJO_CATEGORIA = ''
+
+    def __init__(self, terminos, paginas=3, tipo_vino='Blanco'):
+        self.terminos = list(terminos)
+        self.num_paginas = paginas
+        self.tipo_vino = tipo_vino
+
+    def parametros(self, termino):
+        tipo_id, palabra, palabra_en = TIPOS_VIVINO[self.tipo_vino]
+        return {'termino': quote_plus(termino), 'tipo_id': tipo_id, 'palabra': palabra, 'palabra_en': palabra_en}
+
+    def paginas(self):
+        for termino in self.terminos:
+            parametros = self.parametros(termino)
+            for plantilla in self.PLANTILLAS:
+                yield from FuentePaginacion(plantilla.format(**parametros), self.num_paginas,
+                                            f"{termino}{self.SUFIJO_CATEGORIA}", self.tipo_vino).paginas()
+
+
+class FuenteRegiones(FuenteBusqueda):
+    """Vinos de un tipo por región: exploración filtrada y búsquedas de texto"""
+
+    PLANTILLAS = [
+        URL_VIVINO + "/explore?e=eJzLLbI1VMvNzLM1UMvNzLFVy83MLrZVy8lMS7FSqyhKzSvJTI9Pzi9KycxLt1IrKUpNzCspzUGIAQCgdBaR"
+                     "&wine_type_ids%5B%5D={tipo_id}&region_ids%5B%5D={region_id}",
+        URL_VIVINO + "/search/wines?q={termino}+{palabra}&wine_type_ids%5B%5D={tipo_id}",
+        URL_VIVINO + "/search/wines?q={termino}+{palabra_en}&wine_type_ids%5B%5D={tipo_id}",
+    ]
+
+    def parametros(self, termino):
+        return dict(super().parametros(termino), region_id=IDS_REGIONES.get(termino, '1'))
+
+
+class FuenteVarietales(FuenteBusqueda):
+    """Vinos de un tipo por variedad de uva"""
+
+    PLANTILLAS = [
+        URL_VIVINO + "/search/wines?q={termino}&wine_type_ids%5B%5D={tipo_id}",
+        URL_VIVINO + "/search/wines?q={termino}+España&wine_type_ids%5B%5D={tipo_id}",
+        URL_VIVINO + "/search/wines?q={termino}+spanish&wine_type_ids%5B%5D={tipo_id}",
+    ]
+    SUFIJO_CATEGORIA = '_varietal'
+
+
+class ConfiguracionScraping:
+    """Ajustes compartidos por todos los modos de crawl"""
+
+    def __init__(self, headless=True, concurrencia=3, peticiones_por_segundo=0.4, max_reintentos=2,
+                 max_vinos_por_pagina=30, max_vinos=None, checkpoint_cada=2,
+                 carpeta=CARPETA_DATOS, prefijo='vivino_scraping', historico=None,
+                 timeout_carga=10, max_scrolls=8, estable=0.75, ligero=True, http=False, concurrencia_http=8):
+        self.headless = headless
+        # Perfil ligero: sin imágenes, fuentes, media ni analítica y carga 'eager'
+        self.ligero = ligero
+        # Navegadores trabajando a la vez (uno por hilo del pool)
+        self.concurrencia = max(1, int(concurrencia))
+        # Ritmo máximo de páginas a un mismo host, para todos los navegadores juntos
+        self.peticiones_por_segundo = peticiones_por_segundo
+        # Veces que una página fallida vuelve a la cola
+        self.max_reintentos = max_reintentos
+        self.max_vinos_por_pagina = max_vinos_por_pagina
+        # Al llegar a max_vinos no se cargan más páginas
+        self.max_vinos = max_vinos
+        # Checkpoint cada N páginas completadas (0 = solo al terminar)
+        self.checkpoint_cada = checkpoint_cada
+        self.carpeta = carpeta
+        # vivino_scraping -> datos_scraping/vivino_scraping_<timestamp>.csv
+        self.prefijo = prefijo
+        # CSV acumulado entre ejecuciones (None = no se mantiene)
+        self.historico = historico
+        # Espera de carga: como mucho timeout_carga segundos hasta ver vinos; se da
+        # por cargada cuando pasan `estable` segundos sin enlaces /w/ nuevos
+        self.timeout_carga = timeout_carga
+        self.max_scrolls = max_scrolls
+        self.estable = estable
+        # Primero sin navegador: peticiones HTTP a la vez sobre conexiones keep-alive
+        self.http = http
+        self.concurrencia_http = concurrencia_http
+
+
+class MotorScraping:
+    """Recorre las páginas de las fuentes con uno o varios navegadores y extrae los vinos"""
+
+    def __init__(self, config=None, session_id=None, crear_driver=None):
+        self.config = config or ConfiguracionScraping()
+        self.session_id = session_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.crear_driver = crear_driver or self.configurar_driver
+        self.limitador = LimitadorPorHost(self.config.peticiones_por_segundo)
+        self.pool = PoolNavegadores(self.crear_driver, self.config.concurrencia, self.config.max_reintentos)
+        self.espera = EsperaCarga(self.config.timeout_carga, self.config.estable, max_scrolls=self.config.max_scrolls,
+                                  referencia_inicial=PAUSA_FIJA_INICIAL, referencia_scroll=PAUSA_FIJA_SCROLL)
+        self.datos_extraidos = []
+        self.paginas_completadas = set()
+        # Listado -> primera página sin vinos: las siguientes de ese listado no se visitan
+        self.listados_agotados = {}
+        self.urls_vistas = set()
+        self._lock = threading.Lock()
+        self._paginas_desde_checkpoint = 0
+        self.paginas_http = 0
+        self.cargar_checkpoint()
+
+    # --- Navegador ---
+
+    def configurar_driver(self):
+        """Chrome con las opciones comunes de todos los scrapers (perfil ligero salvo ligero=False)"""
+        return crear_driver(self.config.headless, self.config.ligero, USER_AGENT)
+
+    def cerrar(self):
+        cerrados = self.pool.cerrar()
+        if cerrados:
+            print(f"🔚 {cerrados} driver(s) cerrado(s)")
+
+    def cerrar_popups(self, driver):
+        for selector in SELECTORES_POPUPS:
+            try:
+                for elemento in driver.find_elements(By.XPATH, selector):
+                    if elemento.is_displayed() and elemento.is_enabled():
+                        elemento.click()
+            except Exception:
+                continue
+
+    def cargar_pagina(self, driver, url):
+        """HTML de la página una vez cargados los vinos (o lo que haya tras el timeout)"""
+        self.limitador.esperar(url)
+        driver.get(url)
+        self.cerrar_popups(driver)
+        self.espera.esperar_pagina(driver)
+        return driver.page_source
+
+    # --- Crawl ---
+
+    def completo(self):
+        return self.config.max_vinos is not None and len(self.datos_extraidos) >= self.config.max_vinos
+
+    def _saltar(self, pagina):
+        agotada = self.listados_agotados.get(pagina.listado)
+        return (pagina.url in self.paginas_completadas or self.completo()
+                or (agotada is not None and pagina.numero > agotada))
+
+    def procesar_pagina(self, driver, pagina):
+        """Carga la página, extrae sus vinos nuevos y los añade. Devuelve cuántos añadió.
+
+        Un error al cargar se propaga: el pool decide si reciclar el navegador y
+        reintentar la página.
+        """
+        if self._saltar(pagina):
+            return 0
+        html = self.cargar_pagina(driver, pagina.url)
+        return self.registrar_tarjetas(pagina, tarjetas_vino(html, self.config.max_vinos_por_pagina))
+
+    def registrar_tarjetas(self, pagina, tarjetas):
+        """Añade los vinos nuevos de las tarjetas y marca la página como completada"""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            nuevos = []
+            for texto, url in tarjetas:
+                if url in self.urls_vistas or self.completo():
+                    continue
+                self.urls_vistas.add(url)
+                vino = extraer_vino(texto, pagina.tipo_vino)
+                vino.update({
+                    'timestamp': timestamp,
+                    'session_id': self.session_id,
+                    'categoria_busqueda': pagina.categoria,
+                    'pagina': pagina.numero,
+                    'posicion_pagina': len(nuevos) + 1,
+                    'posicion_global': len(self.datos_extraidos) + 1,
+                    'url': url,
+                })
+                nuevos.append(vino)
+                self.datos_extraidos.append(vino)
+            if not tarjetas:
+                actual = self.listados_agotados.get(pagina.listado, pagina.numero)
+                self.listados_agotados[pagina.listado] = min(actual, pagina.numero)
+            self.paginas_completadas.add(pagina.url)
+            self._paginas_desde_checkpoint += 1
+            checkpoint = (self.config.checkpoint_cada
+                          and self._paginas_desde_checkpoint >= self.config.checkpoint_cada)
+            if checkpoint:
+                self._paginas_desde_checkpoint = 0
+        print(f"   ✅ {pagina.categoria} p{pagina.numero}: {len(nuevos)} vinos nuevos "
+              f"(total {len(self.datos_extraidos)})")
+        if checkpoint:
+            self.guardar_checkpoint()
+        return len(nuevos)
+
+    def tarjetas_http(self, respuesta):
+        """Tarjetas de una respuesta HTTP; None si la página tiene que ir al navegador"""
+        if respuesta is None or respuesta.estado is None or respuesta.estado >= 500 or respuesta.estado == 429:
+            return None
+        if respuesta.estado == 404:
+            return []
+        if respuesta.estado != 200:
+            return None
+        if respuesta.tipo == 'application/json':
+            try:
+                return tarjetas_api(json.loads(respuesta.texto), self.config.max_vinos_por_pagina)
+            except ValueError:
+                return None
+        # HTML sin tarjetas: los vinos los pinta el JS de la página (o el listado se acabó; lo dirá el navegador)
+        return tarjetas_vino(respuesta.texto, self.config.max_vinos_por_pagina) or None
+
+    def procesar_http(self, paginas):
+        """Procesa sin navegador las páginas que se puedan. Devuelve las que necesitan navegador.
+
+        Las páginas se piden en tandas de ``concurrencia_http``, en el orden de
+        las fuentes; antes de cada tanda se descartan las que ya no hacen falta
+        (``max_vinos`` alcanzado o listado agotado por una página vacía o 404).
+        """
+        pendientes, hechas = [], 0
+        restantes = iter(paginas)
+        with ClienteHttp(self.config.concurrencia_http, limitador=self.limitador, user_agent=USER_AGENT) as cliente:
+            while not self.completo():
+                tanda = []
+                for pagina in restantes:
+                    if not self._saltar(pagina):
+                        tanda.append(pagina)
+                        if len(tanda) >= cliente.concurrencia:
+                            break
+                if not tanda:
+                    break
+                urls = {pagina.url: url_api_explorar(pagina.url) or pagina.url for pagina in tanda}
+                respuestas = cliente.descargar(urls.values())
+                for pagina in tanda:
+                    tarjetas = self.tarjetas_http(respuestas.get(urls[pagina.url]))
+                    if tarjetas is None:
+                        pendientes.append(pagina)
+                    elif not self._saltar(pagina):
+                        self.registrar_tarjetas(pagina, tarjetas)
+                        hechas += 1
+        self.paginas_http += hechas
+        print(f"⚡ {hechas} páginas por HTTP en {cliente.segundos:.1f} s "
+              f"({cliente.peticiones} peticiones, {cliente.errores} errores); "
+              f"{len(pendientes)} necesitan navegador")
+        return pendientes
+
+    def ejecutar(self, fuentes):
+        """Recorre todas las páginas de las fuentes. Devuelve los vinos extraídos"""
+        paginas = [p for fuente in fuentes for p in fuente.paginas() if p.url not in self.paginas_completadas]
+        if self.config.http and paginas:
+            paginas = self.procesar_http(paginas)
+        fallidas = []
+        if paginas:
+            print(f"🚀 {len(paginas)} páginas con {self.config.concurrencia} navegador(es) "
+                  f"a {self.config.peticiones_por_segundo} páginas/s por host")
+        try:
+            if paginas:
+                _, fallidas = self.pool.procesar(paginas, self.procesar_pagina)
+        finally:
+            self.cerrar()
+            self.guardar_checkpoint()
+        if fallidas or self.pool.reciclados:
+            # Las páginas fallidas no se marcan como completadas: se reintentan al reanudar
+            print(f"⚠️ {len(fallidas)} páginas fallidas, {self.pool.reintentos} reintentos, "
+                  f"{self.pool.reciclados} navegadores reciclados")
+        self.espera.imprimir_resumen()
+        return self.datos_extraidos
+
+    def ejecutar_completo(self, fuentes, titulo="REPORTE DE SCRAPING - VIVINO"):
+        """Crawl + CSV + reporte, como los ejecutar_* de los scrapers. True si hay vinos"""
+        try:
+            self.ejecutar(fuentes)
+        except Exception as e:
+            print(f"❌ Error durante el scraping: {e}")
+        if not self.datos_extraidos:
+            print("❌ No se extrajo ningún vino")
+            return False
+        self.guardar_csv()
+        self.generar_reporte(titulo)
+        print("\n✅ SCRAPING COMPLETADO EXITOSAMENTE")
+        return True
+
+    # --- Checkpoint y salida ---
+
+    def crear_carpeta_datos(self):
+        os.makedirs(self.config.carpeta, exist_ok=True)
+        return self.config.carpeta
+
+    def ruta_checkpoint(self):
+        return os.path.join(self.config.carpeta, f"{self.config.prefijo}_progreso_{self.session_id}.json")
+
+    def guardar_checkpoint(self):
+        """Vinos y páginas completadas hasta ahora (escritura atómica)"""
+        try:
+            self.crear_carpeta_datos()
+            with self._lock:
+                estado = {
+                    'session_id': self.session_id,
+                    'paginas_completadas': sorted(self.paginas_completadas),
+                    'listados_agotados': self.listados_agotados,
+                    'datos': list(self.datos_extraidos),
+                }
+            ruta = self.ruta_checkpoint()
+            temporal = f"{ruta}.{os.getpid()}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(estado, f, ensure_ascii=False)
+            os.replace(temporal, ruta)
+            print(f"💾 Progreso guardado: {ruta}")
+        except Exception as e:
+            print(f"❌ Error guardando progreso: {e}")
+
+    def cargar_checkpoint(self):
+        """Reanuda la sesión si existe su checkpoint. Devuelve True si se cargó"""
+        ruta = self.ruta_checkpoint()
+        if not os.path.exists(ruta):
+            return False
+        with open(ruta, encoding='utf-8') as f:
+            estado = json.load(f)
+        self.datos_extraidos = estado['datos']
+        self.paginas_completadas = set(estado['paginas_completadas'])
+        self.listados_agotados = estado['listados_agotados']
+        self.urls_vistas = {vino['url'] for vino in self.datos_extraidos}
+        print(f"♻️ Reanudando sesión {self.session_id}: {len(self.datos_extraidos)} vinos, "
+              f"{len(self.paginas_completadas)} páginas ya hechas")
+        return True
+
+    def guardar_csv(self):
+        """CSV de la sesión (+ copia tipada del pipeline) y, si se configuró, el histórico"""
+        try:
+            carpeta = self.crear_carpeta_datos()
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            df = pd.DataFrame(self.datos_extraidos, columns=COLUMNAS_SCRAPING)
+            archivo_individual = f"{carpeta}/{self.config.prefijo}_{timestamp}.csv"
+            guardar_dataset(df, archivo_individual)
+            print(f"✅ CSV guardado: {archivo_individual}")
+
+            archivo_historico = None
+            if self.config.historico:
+                archivo_historico = f"{carpeta}/{self.config.historico}"
+                archivo_existe = os.path.exists(archivo_historico)
+                with open(archivo_historico, 'a', newline='', encoding='utf-8') as csvfile:
+                    writer = csv.DictWriter(csvfile, fieldnames=COLUMNAS_SCRAPING, extrasaction='ignore')
+                    if not archivo_existe:
+                        writer.writeheader()
+                    writer.writerows(self.datos_extraidos)
+                print(f"✅ CSV histórico actualizado: {archivo_historico}")
+            return archivo_individual, archivo_historico
+        except Exception as e:
+            print(f"❌ Error guardando CSV: {e}")
+            return None, None
+
+    def generar_reporte(self, titulo="REPORTE DE SCRAPING - VIVINO"):
+        if not self.datos_extraidos:
+            print("⚠️ No hay datos para generar reporte")
+            return
+        datos = self.datos_extraidos
+        total = len(datos)
+
+        print("\n" + "=" * 80)
+        print(f"📊 {titulo}")
+        print("=" * 80)
+        print(f"🕐 Fecha y hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"🔑 Session ID: {self.session_id}")
+        print(f"📄 Páginas procesadas: {len(self.paginas_completadas)}")
+        print(f"🍷 Total de vinos únicos: {total}")
+
+        categorias = pd.Series([v['categoria_busqueda'] for v in datos]).value_counts()
+        if len(categorias) > 1:
+            print(f"\n📂 DISTRIBUCIÓN POR CATEGORÍA:")
+            for categoria, cantidad in categorias.items():
+                print(f"   {categoria}: {cantidad} vinos")
+
+        precios = [v['precio_eur'] for v in datos if v['precio_eur']]
+        if precios:
+            print(f"\n💶 ANÁLISIS DE PRECIOS:")
+            print(f"   Vinos con precio: {len(precios)} ({len(precios) / total * 100:.1f}%)")
+            print(f"   Rango: €{min(precios):.2f} - €{max(precios):.2f}")
+            print(f"   Promedio: €{sum(precios) / len(precios):.2f}")
+
+        ratings = [v['rating'] for v in datos if v['rating']]
+        if ratings:
+            print(f"\n⭐ ANÁLISIS DE RATINGS:")
+            print(f"   Vinos con rating: {len(ratings)} ({len(ratings) / total * 100:.1f}%)")
+            print(f"   Rating promedio: {sum(ratings) / len(ratings):.2f}")
+            print(f"   Rango: {min(ratings):.1f} - {max(ratings):.1f}")
+
+        regiones = pd.Series([v['region'] for v in datos if v['region']]).value_counts()
+        if len(regiones):
+            print(f"\n🌍 TOP REGIONES:")
+            for region, cantidad in regiones.head(8).items():
+                print(f"   {region}: {cantidad} vinos")
+
+        print("=" * 80)
+
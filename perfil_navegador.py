@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# Perfil de Chrome ligero para el scraping
+"""
+Los scrapers solo leen ``page_source``: imágenes, vídeo, fuentes y scripts de
+analítica se descargan y se pintan para nada, y son lo que más memoria gasta
+en cada navegador (y la memoria es lo que limita cuántos caben en la máquina).
+
+- ``opciones_chrome(ligero=True)``: sin imágenes ni notificaciones por
+  preferencias de Chrome, sin autoplay y con ``page_load_strategy='eager'``
+  (``driver.get`` vuelve con el DOM listo, sin esperar a subrecursos; de los
+  vinos ya se encarga ``EsperaCarga``).
+- ``bloquear_recursos``: ``Network.setBlockedURLs`` por CDP para lo que las
+  preferencias no cubren (fuentes, media, hosts de analítica y anuncios).
+- ``crear_driver``: el Chrome de todos los scrapers, ligero por defecto.
+- ``comparar_perfiles`` (o ``python perfil_navegador.py [url ...]``): carga las
+  mismas páginas con el perfil completo y el ligero y compara segundos por
+  página y MB de memoria por navegador (Chrome y todos sus procesos).
+"""
+import os
+import sys
+import time
+
+from espera_carga import EsperaCarga
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+
+# Preferencias: 2 = bloquear
+PREFS_COMUNES = {
+    "profile.default_content_setting_values": {
+        "notifications": 2, "popups": 2, "geolocation": 2, "media_stream": 2,
+    }
+}
+PREFS_LIGERO = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.plugins": 2,
+    "profile.managed_default_content_settings.sound": 2,
+}
+
+EXTENSIONES_BLOQUEADAS = [
+    # Imágenes
+    'png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico',
+    # Fuentes
+    'woff', 'woff2', 'ttf', 'otf', 'eot',
+    # Audio y vídeo
+    'mp4', 'webm', 'm3u8', 'mp3', 'ogg',
+]
+HOSTS_ANALITICA = [
+    'google-analytics.com', 'googletagmanager.com', 'googlesyndication.com', 'doubleclick.net',
+    'googleadservices.com', 'facebook.net', 'hotjar.com', 'segment.io',
+    'segment.com', 'mixpanel.com', 'amplitude.com', 'optimizely.com', 'newrelic.com', 'nr-data.net',
+    'sentry.io', 'bugsnag.com', 'criteo.com', 'criteo.net', 'taboola.com', 'outbrain.com',
+    'bing.com', 'clarity.ms', 'tiktok.com', 'snapchat.com', 'pinterest.com', 'onetrust.com',
+    'cookielaw.org', 'intercom.io', 'braze.com', 'appsflyer.com', 'branch.io',
+]
+# Patrones de Network.setBlockedURLs ('*' comodín); las imágenes de Vivino van con ?query
+URLS_BLOQUEADAS = ([f'*.{ext}' for ext in EXTENSIONES_BLOQUEADAS] +
+                   [f'*.{ext}?*' for ext in EXTENSIONES_BLOQUEADAS] +
+                   [f'*{host}*' for host in HOSTS_ANALITICA])
+
+
+def opciones_chrome(headless=True, ligero=True, user_agent=USER_AGENT):
+    """Options de Chrome de los scrapers; con ligero=True sin imágenes, media ni espera a subrecursos"""
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument(f'--user-agent={user_agent}')
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    prefs = dict(PREFS_COMUNES)
+    if ligero:
+        prefs.update(PREFS_LIGERO)
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_argument('--autoplay-policy=user-gesture-required')
+        chrome_options.add_argument('--mute-audio')
+        chrome_options.add_argument('--disable-remote-fonts')
+        chrome_options.add_argument('--disable-background-networking')
+        chrome_options.page_load_strategy = 'eager'
+    chrome_options.add_experimental_option("prefs", prefs)
+    return chrome_options
+
+
+def bloquear_recursos(driver, urls=URLS_BLOQUEADAS):
+    """Bloquea por CDP las peticiones que encajen con los patrones. False si el driver no tiene CDP"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(urls)})
+        return True
+    except Exception as e:
+        print(f"⚠️ No se pudieron bloquear recursos por CDP: {e}")
+        return False
+
+
+def crear_driver(headless=True, ligero=True, user_agent=USER_AGENT):
+    """Chrome listo para scraping (ligero por defecto)"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()),
+                              options=opciones_chrome(headless, ligero, user_agent))
+    if ligero:
+        bloquear_recursos(driver)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    print(f"✅ Driver configurado exitosamente{' (perfil ligero)' if ligero else ''}")
+    return driver
+
+
+def _hijos(pid):
+    hijos = []
+    try:
+        for tarea in os.listdir(f'/proc/{pid}/task'):
+            with open(f'/proc/{pid}/task/{tarea}/children') as f:
+                hijos.extend(int(h) for h in f.read().split())
+    except OSError:
+        pass
+    return hijos
+
+
+def _memoria_kb(pid):
+    """PSS del proceso (reparte la memoria compartida entre procesos de Chrome); RSS si no hay PSS"""
+    for archivo, campo in ((f'/proc/{pid}/smaps_rollup', 'Pss:'), (f'/proc/{pid}/status', 'VmRSS:')):
+        try:
+            with open(archivo) as f:
+                for linea in f:
+                    if linea.startswith(campo):
+                        return int(linea.split()[1])
+        except OSError:
+            continue
+    return 0
+
+
+def memoria_procesos(pid):
+    """MB de memoria de un proceso y todos sus descendientes (None si no hay /proc)"""
+    if not os.path.isdir(f'/proc/{pid}'):
+        return None
+    pendientes, total = [pid], 0
+    while pendientes:
+        actual = pendientes.pop()
+        total += _memoria_kb(actual)
+        pendientes.extend(_hijos(actual))
+    return round(total / 1024, 1)
+
+
+def memoria_driver(driver):
+    """MB del navegador: chromedriver, Chrome y sus procesos de render/GPU/red"""
+    try:
+        pid = driver.service.process.pid
+    except AttributeError:
+        return None
+    return memoria_procesos(pid)
+
+
+def medir_perfil(urls, crear=None, espera=None, ligero=True, headless=True):
+    """Carga las urls con un navegador nuevo. Devuelve segundos por página y MB tras la última carga"""
+    espera = espera or EsperaCarga()
+    driver = crear() if crear else crear_driver(headless=headless, ligero=ligero)
+    try:
+        tiempos, vinos = [], []
+        for url in urls:
+            inicio = time.monotonic()
+            vinos.append(espera.cargar(driver, url))
+            tiempos.append(time.monotonic() - inicio)
+        return {
+            'paginas': len(tiempos),
+            'segundos_por_pagina': round(sum(tiempos) / len(tiempos), 2) if tiempos else 0.0,
+            'vinos_por_pagina': round(sum(vinos) / len(vinos), 1) if vinos else 0.0,
+            'memoria_mb': memoria_driver(driver),
+        }
+    finally:
+        driver.quit()
+
+
+def comparar_perfiles(urls, headless=True):
+    """Mismas páginas con el perfil completo y con el ligero"""
+    resultados = {}
+    for nombre, ligero in (('completo', False), ('ligero', True)):
+        print(f"🧪 Perfil {nombre}: {len(urls)} página(s)...")
+        resultados[nombre] = medir_perfil(urls, ligero=ligero, headless=headless)
+
+    print(f"\n{'Perfil':<10} {'s/página':>9} {'vinos':>7} {'MB/navegador':>13}")
+    for nombre, r in resultados.items():
+        memoria = '-' if r['memoria_mb'] is None else f"{r['memoria_mb']:.0f}"
+        print(f"{nombre:<10} {r['segundos_por_pagina']:>9.2f} {r['vinos_por_pagina']:>7.0f} {memoria:>13}")
+    completo, ligero = resultados['completo'], resultados['ligero']
+    if completo['memoria_mb'] and ligero['memoria_mb']:
+        print(f"💾 Con la memoria del perfil completo caben "
+              f"{completo['memoria_mb'] / ligero['memoria_mb']:.1f} navegadores ligeros")
+    return resultados
+
+
+if __name__ == "__main__":
+    from motor_scraping import URL_EXPLORAR_ESPANA, url_pagina
+
+    comparar_perfiles(sys.argv[1:] or [url_pagina(URL_EXPLORAR_ESPANA, n) for n in (1, 2, 3)])
@@ -0,0 +1,167 @@
+# Pool de navegadores reutilizables para el scraping
+"""
+N navegadores headless que se reparten una cola de páginas.
+
+- Cada hilo del pool tiene su navegador. Se crea con la primera página que le
+  toca y se reutiliza para las siguientes, también entre llamadas a
+  ``procesar``, hasta ``cerrar()``.
+- La cortesía con el sitio no depende del número de navegadores:
+  ``LimitadorPorHost`` da turnos separados ``1 / peticiones_por_segundo`` por
+  host, compartidos por todos los hilos.
+- Recuperación de caídas: si una página falla y el navegador ya no responde
+  (Chrome cerrado, sesión perdida...), se cierra y ese hilo crea otro. La
+  página vuelve a la cola hasta ``max_reintentos`` veces, así que no se pierde
+  ninguna por una caída del navegador.
+"""
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class LimitadorPeticiones:
+    """Reparte turnos separados 1/por_segundo entre todos los hilos"""
+
+    def __init__(self, por_segundo):
+        self.intervalo = 1.0 / por_segundo if por_segundo else 0.0
+        self._siguiente = 0.0
+        self._lock = threading.Lock()
+
+    def reservar(self):
+        """Reserva el siguiente turno. Devuelve los segundos que faltan para él"""
+        with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._siguiente)
+            self._siguiente = turno + self.intervalo
+        return turno - ahora
+
+    def esperar(self):
+        espera = self.reservar()
+        if espera > 0:
+            time.sleep(espera)
+
+
+class LimitadorPorHost:
+    """Un LimitadorPeticiones por host: el ritmo de un sitio no frena a los demás"""
+
+    def __init__(self, por_segundo):
+        self.por_segundo = por_segundo
+        self._limitadores = {}
+        self._lock = threading.Lock()
+
+    def _limitador(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            limitador = self._limitadores.get(host)
+            if limitador is None:
+                limitador = self._limitadores[host] = LimitadorPeticiones(self.por_segundo)
+        return limitador
+
+    def reservar(self, url):
+        """Segundos hasta el turno reservado para url (para esperar con asyncio.sleep)"""
+        return self._limitador(url).reservar()
+
+    def esperar(self, url):
+        self._limitador(url).esperar()
+
+
+class PoolNavegadores:
+    """Hilos con un navegador cada uno, alimentados por una cola de tareas"""
+
+    def __init__(self, crear_driver, tamaño=3, max_reintentos=2):
+        self.crear_driver = crear_driver
+        self.tamaño = max(1, int(tamaño))
+        self.max_reintentos = max_reintentos
+        self._drivers = [None] * self.tamaño
+        self._lock = threading.Lock()
+        self.creados = 0
+        self.reciclados = 0
+        self.reintentos = 0
+
+    def _driver(self, hueco):
+        if self._drivers[hueco] is None:
+            self._drivers[hueco] = self.crear_driver()
+            with self._lock:
+                self.creados += 1
+        return self._drivers[hueco]
+
+    @staticmethod
+    def vivo(driver):
+        """El navegador sigue respondiendo a comandos"""
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _reciclar(self, hueco):
+        driver, self._drivers[hueco] = self._drivers[hueco], None
+        if driver is None:
+            return
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self.reciclados += 1
+        print(f"♻️ Navegador {hueco + 1} no responde: se cierra y se abre otro")
+
+    def procesar(self, tareas, funcion):
+        """Ejecuta funcion(driver, tarea) para cada tarea con los navegadores del pool.
+
+        Devuelve (resultados, fallidas): [(tarea, resultado)] en orden de
+        finalización y [(tarea, excepción)] de las que agotaron los reintentos.
+        """
+        cola = queue.Queue()
+        for tarea in tareas:
+            cola.put((tarea, 0))
+        resultados, fallidas = [], []
+
+        def trabajar(hueco):
+            while True:
+                elemento = cola.get()
+                if elemento is None:
+                    cola.task_done()
+                    return
+                tarea, intentos = elemento
+                try:
+                    resultado = funcion(self._driver(hueco), tarea)
+                    with self._lock:
+                        resultados.append((tarea, resultado))
+                except Exception as e:
+                    driver = self._drivers[hueco]
+                    if driver is not None and not self.vivo(driver):
+                        self._reciclar(hueco)
+                    if intentos < self.max_reintentos:
+                        # Se vuelve a encolar antes de task_done: join() no termina sin ella
+                        cola.put((tarea, intentos + 1))
+                        with self._lock:
+                            self.reintentos += 1
+                    else:
+                        print(f"❌ Tarea descartada tras {intentos + 1} intentos: {e}")
+                        with self._lock:
+                            fallidas.append((tarea, e))
+                finally:
+                    cola.task_done()
+
+        hilos = [threading.Thread(target=trabajar, args=(hueco,), name=f'navegador-{hueco + 1}', daemon=True)
+                 for hueco in range(min(self.tamaño, max(1, len(tareas))))]
+        for hilo in hilos:
+            hilo.start()
+        cola.join()
+        for _ in hilos:
+            cola.put(None)
+        for hilo in hilos:
+            hilo.join()
+        return resultados, fallidas
+
+    def cerrar(self):
+        """Cierra todos los navegadores. Devuelve cuántos había abiertos"""
+        drivers = [d for d in self._drivers if d is not None]
+        self._drivers = [None] * self.tamaño
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        return len(drivers)
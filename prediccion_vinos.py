@@ -0,0 +1,162 @@
+# Predicción de calidad por lotes
+"""
+Versión vectorizada de ``predecir_calidad_vino_completo`` para N vinos.
+
+La matriz de 15 características se construye con operaciones de NumPy y
+pandas, las variables categóricas se codifican con las tablas precalculadas
+del registro de modelos (``ArtefactosModelo.codigos``) y se hace una única
+llamada a ``scaler.transform`` y otra a ``predict_proba`` para todo el lote.
+"""
+import numpy as np
+import pandas as pd
+
+from registro_modelos import get_model
+
+# Valores por defecto de predecir_calidad_vino_completo
+BODEGA_DEFECTO = "Desconocida"
+REGION_DEFECTO = "España"
+NUM_REVIEWS_DEFECTO = 500
+
+# Código usado cuando la categoría no existe en el encoder (o no hay encoder)
+CODIGO_DEFECTO = {
+    'region_especifica': 0,
+    'rango_precio': 1,
+    'rango_rating': 1,
+    'epoca': 2,
+    'bodega_simplificada': 0,
+}
+
+
+def _columna(df, nombres, defecto):
+    for nombre in nombres:
+        if nombre in df.columns:
+            return df[nombre]
+    return pd.Series(defecto, index=df.index)
+
+
+def _codificar(artefactos, columna, valores):
+    """Codifica una columna categórica con una búsqueda en dict por valor"""
+    codigos = artefactos.codigos.get(columna)
+    defecto = CODIGO_DEFECTO[columna]
+    if not codigos:
+        return np.full(len(valores), defecto, dtype=np.float64)
+    return valores.map(codigos).fillna(defecto).to_numpy(dtype=np.float64)
+
+
+def construir_caracteristicas(df, artefactos):
+    """DataFrame con las características del modelo completo para cada fila de df.
+
+    Acepta ``precio`` o ``precio_eur``; ``bodega``, ``region`` y ``num_reviews``
+    son opcionales y toman los mismos valores por defecto que la predicción
+    individual.
+    """
+    precio = pd.to_numeric(_columna(df, ['precio_eur', 'precio'], np.nan), errors='coerce').to_numpy(dtype=np.float64)
+    rating = pd.to_numeric(_columna(df, ['rating'], np.nan), errors='coerce').to_numpy(dtype=np.float64)
+    año = pd.to_numeric(_columna(df, ['año'], np.nan), errors='coerce').to_numpy(dtype=np.float64)
+    num_reviews = pd.to_numeric(_columna(df, ['num_reviews'], NUM_REVIEWS_DEFECTO), errors='coerce')
+    num_reviews = num_reviews.fillna(NUM_REVIEWS_DEFECTO).to_numpy(dtype=np.float64)
+    region = _columna(df, ['region'], REGION_DEFECTO).fillna(REGION_DEFECTO).astype(str)
+    bodega = _columna(df, ['bodega'], BODEGA_DEFECTO).fillna(BODEGA_DEFECTO).astype(str)
+
+    antiguedad = 2025 - año
+    caracteristicas = {
+        'precio_eur': precio,
+        'log_precio': np.log1p(precio),
+        'rating': rating,
+        'rating_normalizado': (rating - 3.0) / (5.0 - 3.0),
+        'año': año,
+        'antiguedad': antiguedad,
+        'num_reviews': num_reviews,
+        'log_reviews': np.log1p(num_reviews),
+        'precio_rating_ratio': precio / rating,
+        'precio_por_año': precio / (antiguedad + 1),
+    }
+
+    # Mismos cortes que la predicción individual
+    region_especifica = region.where(region != "España", "Otras Regiones")
+    rango_precio = np.select(
+        [precio <= 15, precio <= 25, precio <= 40, precio <= 60],
+        ['Económico', 'Medio', 'Premium', 'Lujo'], default='Ultra-Premium')
+    rango_rating = np.select(
+        [rating < 4.0, rating < 4.2, rating < 4.4],
+        ['Bueno', 'Muy Bueno', 'Excelente'], default='Excepcional')
+    epoca = np.select(
+        [año <= 2000, año <= 2010, año <= 2015, año <= 2020],
+        ['Clásicos', 'Millennium', 'Década 2010', 'Modernos'], default='Recientes')
+    bodega_simplificada = bodega.str.split().str[:2].str.join(' ')
+
+    categoricas = {
+        'region_especifica': region_especifica,
+        'rango_precio': pd.Series(rango_precio, index=df.index),
+        'rango_rating': pd.Series(rango_rating, index=df.index),
+        'epoca': pd.Series(epoca, index=df.index),
+        'bodega_simplificada': bodega_simplificada,
+    }
+    for columna, valores in categoricas.items():
+        caracteristicas[f'{columna}_encoded'] = _codificar(artefactos, columna, valores)
+
+    return pd.DataFrame(caracteristicas, index=df.index)
+
+
+def _predecir(modelo, X_scaled, decodificar):
+    """Una sola llamada a predict_proba; la clase es la de mayor probabilidad"""
+    if hasattr(modelo, 'predict_proba'):
+        probabilidades = modelo.predict_proba(X_scaled)
+        codigos = modelo.classes_[probabilidades.argmax(axis=1)]
+        confianza = probabilidades.max(axis=1) * 100
+    else:
+        codigos = modelo.predict(X_scaled)
+        confianza = None
+    return decodificar(codigos), confianza
+
+
+def predecir_calidad_lote(df, artefactos=None):
+    """Predice la categoría de calidad de todos los vinos de df a la vez.
+
+    Devuelve un DataFrame con las columnas ``prediccion`` y ``confianza``
+    alineado con el índice de entrada.
+    """
+    if artefactos is None:
+        artefactos = get_model('completo')
+    if df.empty:
+        return pd.DataFrame({'prediccion': pd.Series(dtype=object), 'confianza': pd.Series(dtype=np.float64)})
+
+    if artefactos.label_encoders and artefactos.caracteristicas:
+        X = construir_caracteristicas(df, artefactos)[artefactos.caracteristicas].to_numpy(dtype=np.float64)
+        X_scaled = artefactos.scaler.transform(X)
+
+        if 'objetivo' in artefactos.label_encoders:
+            decodificar = artefactos.label_encoders['objetivo'].inverse_transform
+        else:
+            clases = np.array(list(artefactos.model_info.get('clases_calidad', ['Bueno', 'Muy Bueno', 'Excelente'])), dtype=object)
+            decodificar = lambda codigos: np.where(codigos < len(clases), clases[np.minimum(codigos, len(clases) - 1)], 'Muy Bueno')
+        prediccion, confianza = _predecir(artefactos.modelo, X_scaled, decodificar)
+        if confianza is None:
+            confianza = np.full(len(df), 85.0)
+    else:
+        prediccion, confianza = _predecir_lote_simple(df, artefactos)
+
+    return pd.DataFrame({'prediccion': prediccion, 'confianza': confianza}, index=df.index)
+
+
+def _predecir_lote_simple(df, artefactos):
+    """Equivalente vectorizado de predecir_calidad_vino_simple (modelo de 10 columnas)"""
+    n = len(df)
+    precio = pd.to_numeric(_columna(df, ['precio_eur', 'precio'], np.nan), errors='coerce').to_numpy(dtype=np.float64)
+    rating = pd.to_numeric(_columna(df, ['rating'], np.nan), errors='coerce').to_numpy(dtype=np.float64)
+    año = pd.to_numeric(_columna(df, ['año'], np.nan), errors='coerce').to_numpy(dtype=np.float64)
+
+    # posicion=1, num_reviews=500 y códigos categóricos fijos, como en la versión individual
+    constantes = np.tile([1, 500, 0, 0, 1, 2, 1], (n, 1))
+    X = np.column_stack([precio, rating, año, constantes]).astype(np.float64)
+    X_scaled = artefactos.scaler.transform(X)
+
+    if artefactos.label_encoder:
+        decodificar = artefactos.label_encoder.inverse_transform
+    else:
+        clases = np.array(['Bueno', 'Muy Bueno', 'Excelente'], dtype=object)
+        decodificar = lambda codigos: np.where(codigos < len(clases), clases[np.minimum(codigos, len(clases) - 1)], 'Muy Bueno')
+    prediccion, confianza = _predecir(artefactos.modelo, X_scaled, decodificar)
+    if confianza is None:
+        confianza = np.full(n, 75.0)
+    return prediccion, confianza
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# Predicciones de calidad precalculadas para todo el catálogo
+"""
+Etapa offline que puntúa todos los vinos del dataset con el modelo actual y
+guarda la clase predicha y la confianza en un artefacto versionado junto al
+CSV, en ``datos_scraping/``:
+
+    predicciones_<modelo>_v<version>__<nombre del csv>.csv
+
+Si ``datos_scraping/`` no admite escritura (contenedor sin permisos), el
+artefacto va al directorio de caché de la app (``Config.CACHE_DIR``); y si
+tampoco se puede guardar, las predicciones se usan igualmente desde memoria.
+
+La ruta de recomendación lee estas columnas en lugar de llamar a
+``predict_proba`` en cada petición. Cuando el registro publica una nueva
+versión del modelo (recarga en caliente), el artefacto se regenera en segundo
+plano y se sustituye de forma atómica. Como el registro, se conservan los
+artefactos de las ``MODEL_VERSIONS_RETENIDAS`` versiones más recientes y los
+anteriores se borran.
+
+Uso como paso de build:
+    python predicciones_precalculadas.py
+"""
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config_sommelier import Config
+from registro_modelos import get_model, registro
+
+# Características del modelo 'vivino' (las mismas que usa /sommelier)
+CARACTERISTICAS_VIVINO = ['precio_eur', 'rating', 'num_reviews']
+
+
+class PrediccionesCatalogo:
+    """Predicción y confianza por vino, alineadas con las filas del dataset"""
+
+    def __init__(self, modelo, version, prediccion, confianza):
+        self.modelo = modelo
+        self.version = version
+        self.prediccion = np.asarray(prediccion, dtype=object)
+        self.confianza = np.asarray(confianza, dtype=np.float64)
+        self.confianza.setflags(write=False)
+        self.df = None  # dataset al que corresponden las filas
+
+    def __len__(self):
+        return len(self.prediccion)
+
+    def resumen(self, posiciones):
+        """Clase mayoritaria entre los vinos indicados y su confianza media"""
+        if len(posiciones) == 0:
+            return None
+        clases = pd.Series(self.prediccion[posiciones])
+        validas = clases.notna().to_numpy()
+        if not validas.any():
+            return None
+        conteo = clases[validas].value_counts()
+        clase = conteo.index[0]
+        confianza = float(np.mean(self.confianza[posiciones][clases.to_numpy() == clase]))
+        return clase, confianza
+
+
+def ruta_predicciones(ruta_csv, modelo, version, directorio=None):
+    ruta_csv = Path(ruta_csv)
+    return Path(directorio or ruta_csv.parent) / f"predicciones_{modelo}_v{version}__{ruta_csv.name}"
+
+
+def directorios_candidatos(ruta_csv):
+    # Junto al CSV y, si ahí no se puede escribir, en la caché privada de la app
+    return [Path(ruta_csv).parent, Path(Config.CACHE_DIR)]
+
+
+def guardar_predicciones(ruta_csv, salida, modelo, version):
+    """Escribe el artefacto en el primer directorio que lo admita. Devuelve la ruta o None"""
+    ultimo_error = None
+    for directorio in directorios_candidatos(ruta_csv):
+        destino = ruta_predicciones(ruta_csv, modelo, version, directorio)
+        # Escritura atómica: otros workers pueden estar leyendo el mismo artefacto
+        temporal = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+        try:
+            os.makedirs(directorio, mode=0o700, exist_ok=True)
+            salida.to_csv(temporal, index=False, encoding='utf-8')
+            os.replace(temporal, destino)
+            limpiar_antiguas(ruta_csv, modelo, destino)
+            return destino
+        except OSError as e:
+            ultimo_error = e
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+    print(f"⚠️ No se pudieron guardar las predicciones precalculadas ({ultimo_error}); se usan desde memoria")
+    return None
+
+
+def limpiar_antiguas(ruta_csv, modelo, vigente):
+    """Borra los artefactos del modelo para este CSV salvo los ``MODEL_VERSIONS_RETENIDAS`` más recientes"""
+    vigente = Path(vigente)
+    antiguas = []
+    for ruta in vigente.parent.glob(f"predicciones_{modelo}_v*__{Path(ruta_csv).name}"):
+        try:
+            if ruta != vigente:
+                antiguas.append((ruta.stat().st_mtime_ns, ruta))
+        except OSError:
+            pass  # otro worker la acaba de borrar
+    antiguas.sort(reverse=True)
+    # Las de versiones que el registro aún conserva pueden seguir en uso por otros workers
+    for _, antigua in antiguas[Config.MODEL_VERSIONS_RETENIDAS - 1:]:
+        try:
+            os.remove(antigua)
+        except OSError:
+            pass
+
+
+def calcular_predicciones(df, artefactos):
+    """Puntúa todo el dataset con una única llamada a predict_proba"""
+    if artefactos.nombre == 'completo':
+        from prediccion_vinos import predecir_calidad_lote
+        resultado = predecir_calidad_lote(df, artefactos)
+        return resultado['prediccion'].to_numpy(dtype=object), resultado['confianza'].to_numpy(dtype=np.float64)
+
+    prediccion = np.full(len(df), None, dtype=object)
+    confianza = np.full(len(df), np.nan)
+    X = df[CARACTERISTICAS_VIVINO].apply(pd.to_numeric, errors='coerce')
+    completas = X.notna().all(axis=1).to_numpy()
+    if completas.any():
+        X_scaled = artefactos.scaler.transform(X.to_numpy(dtype=np.float64)[completas])
+        probabilidades = artefactos.modelo.predict_proba(X_scaled)
+        codigos = artefactos.modelo.classes_[probabilidades.argmax(axis=1)]
+        prediccion[completas] = artefactos.label_encoder.inverse_transform(codigos)
+        confianza[completas] = probabilidades.max(axis=1) * 100
+    return prediccion, confianza
+
+
+def generar_predicciones(ruta_csv, df, artefactos):
+    """Calcula y guarda el artefacto de predicciones para la versión del modelo"""
+    prediccion, confianza = calcular_predicciones(df, artefactos)
+    salida = pd.DataFrame({
+        'url': df['url'].to_numpy() if 'url' in df.columns else np.arange(len(df)),
+        'prediccion_calidad': prediccion,
+        'confianza_calidad': confianza,
+    })
+    destino = guardar_predicciones(ruta_csv, salida, artefactos.nombre, artefactos.version)
+    if destino is not None:
+        print(f"💾 Predicciones precalculadas guardadas: {destino} ({len(salida)} vinos)")
+    return PrediccionesCatalogo(artefactos.nombre, artefactos.version, prediccion, confianza)
+
+
+def cargar_predicciones(ruta_csv, df, artefactos):
+    """Lee el artefacto de la versión actual si existe y corresponde al dataset"""
+    for directorio in directorios_candidatos(ruta_csv):
+        origen = ruta_predicciones(ruta_csv, artefactos.nombre, artefactos.version, directorio)
+        if origen.exists():
+            predicciones = _leer_predicciones(origen, df, artefactos)
+            if predicciones is not None:
+                return predicciones
+    return None
+
+
+def _leer_predicciones(origen, df, artefactos):
+    guardadas = pd.read_csv(origen)
+    if len(guardadas) != len(df):
+        return None
+    if 'url' in df.columns and not (guardadas['url'].astype(str).to_numpy() == df['url'].astype(str).to_numpy()).all():
+        return None
+    prediccion = guardadas['prediccion_calidad'].astype(object).where(guardadas['prediccion_calidad'].notna(), None)
+    return PrediccionesCatalogo(artefactos.nombre, artefactos.version,
+                                prediccion.to_numpy(), guardadas['confianza_calidad'].to_numpy())
+
+
+def cargar_o_generar(ruta_csv, df, artefactos):
+    predicciones = cargar_predicciones(ruta_csv, df, artefactos)
+    if predicciones is None:
+        predicciones = generar_predicciones(ruta_csv, df, artefactos)
+    return predicciones
+
+
+class GestorPredicciones:
+    """Mantiene las predicciones activas y las regenera al cambiar la versión del modelo"""
+
+    def __init__(self, nombre_modelo):
+        self.nombre_modelo = nombre_modelo
+        self.actuales = None
+        self._ruta_csv = None
+        self._df = None
+        self._lock = threading.Lock()
+        self._suscrito = False
+
+    def iniciar(self, ruta_csv, df, en_segundo_plano=False):
+        self._ruta_csv, self._df = ruta_csv, df
+        if not self._suscrito:
+            registro.al_recargar(self._al_recargar)
+            self._suscrito = True
+        if en_segundo_plano:
+            threading.Thread(target=self.actualizar, name='predicciones-catalogo', daemon=True).start()
+        else:
+            self.actualizar()
+
+    def actualizar(self, artefactos=None):
+        ruta_csv, df = self._ruta_csv, self._df
+        if ruta_csv is None or df is None or df.empty:
+            return None
+        try:
+            if artefactos is None:
+                artefactos = get_model(self.nombre_modelo)
+            with self._lock:
+                if self.vigentes(artefactos, df) is not None:
+                    return self.actuales
+                predicciones = cargar_o_generar(ruta_csv, df, artefactos)
+                predicciones.df = df
+                self.actuales = predicciones
+            print(f"🔮 Predicciones precalculadas activas: modelo '{predicciones.modelo}' v{predicciones.version}")
+            return predicciones
+        except Exception as e:
+            print(f"⚠️ No se pudieron preparar las predicciones precalculadas: {e}")
+            return None
+
+    def vigentes(self, artefactos, df=None):
+        """Predicciones solo si corresponden a la versión del modelo y al dataset indicados"""
+        predicciones = self.actuales
+        if predicciones is None or predicciones.version != artefactos.version:
+            return None
+        if df is not None and predicciones.df is not df:
+            return None
+        return predicciones
+
+    def _al_recargar(self, nombre, artefactos):
+        if nombre == self.nombre_modelo:
+            threading.Thread(target=self.actualizar, args=(artefactos,),
+                             name='predicciones-catalogo', daemon=True).start()
+
+
+if __name__ == "__main__":
+    from dataset_vinos import cargar_dataset
+
+    if not Config.LATEST_CSV:
+        print("❌ No se encontró archivo de datos")
+        raise SystemExit(1)
+    df = cargar_dataset(Config.LATEST_CSV)
+    for nombre in registro.nombres():
+        try:
+            artefactos = get_model(nombre)
+        except Exception as e:
+            print(f"⚠️ Modelo '{nombre}' no disponible: {e}")
+            continue
+        generar_predicciones(Config.LATEST_CSV, df, artefactos)
@@ -0,0 +1,186 @@
+# Motor de ranking vectorizado de recomendaciones
+"""
+Puntuación de vinos con los pesos de ``Config.FEATURE_WEIGHTS``.
+
+Las características normalizadas a [0, 1] se precalculan una vez para todo el
+catálogo en una matriz ``(vinos x características)``. Puntuar los candidatos
+de una búsqueda es un único producto matriz-vector contra el vector de pesos
+(ajustable por gusto). Los ``k`` mejores se eligen con ``np.argpartition``,
+que es lineal, y solo esos ``k`` se ordenan.
+
+Características (1 = mejor):
+
+- ``rating``: rating escalado entre el mínimo y el máximo del catálogo.
+- ``num_reviews``: log(1 + reviews) escalado (confianza del rating).
+- ``posicion``: posición en los resultados de Vivino (``posicion_global`` o
+  ``posicion``), invertida: el primero puntúa 1.
+- ``precio``: más barato puntúa más (log del precio, invertido).
+- ``popularidad``: tramos de ``categorizar_popularidad`` (Nicho ... Muy Popular).
+- ``valor``: rating por euro (rating / log(1 + precio)) escalado.
+
+Los valores que faltan puntúan 0 en su característica.
+
+Diversidad (MMR): ``MatrizRanking.diversos`` reordena los N mejores candidatos
+con *maximal marginal relevance*. En cada paso elige el candidato que maximiza
+``λ·relevancia − (1 − λ)·similitud máxima con los ya elegidos``. La
+similitud es la suma ponderada de coincidencias de bodega, región y tramo de
+precio, con códigos enteros precalculados por vino. Cada paso actualiza la
+similitud máxima con una comparación vectorizada, de modo que el coste es
+O(N·k). El resultado es determinista, así que se puede cachear.
+"""
+import numpy as np
+import pandas as pd
+
+from deduplicacion_vinos import primeros_unicos
+
+CARACTERISTICAS_RANKING = ['rating', 'num_reviews', 'posicion', 'precio', 'popularidad', 'valor']
+
+# Mismos umbrales que categorizar_popularidad: Muy Popular, Popular, Conocido, Nicho
+UMBRALES_POPULARIDAD = [(1000, 1.0), (500, 0.75), (200, 0.5)]
+POPULARIDAD_NICHO = 0.25
+
+# Grupos que cuentan como "parecidos" para la diversidad, en el orden de MatrizRanking.grupos
+GRUPOS_DIVERSIDAD = ['bodega', 'region', 'precio']
+# Mismos límites que categorizar_precio: Económico, Accesible, Medio, Premium, Lujo
+LIMITES_TRAMOS_PRECIO = [10, 20, 35, 60]
+
+
+def _escalar(valores):
+    """Escala a [0, 1] entre el mínimo y el máximo; NaN -> 0"""
+    valores = np.asarray(valores, dtype=np.float64)
+    validos = ~np.isnan(valores)
+    resultado = np.zeros(len(valores))
+    if validos.any():
+        minimo, maximo = valores[validos].min(), valores[validos].max()
+        if maximo > minimo:
+            resultado[validos] = (valores[validos] - minimo) / (maximo - minimo)
+        else:
+            resultado[validos] = 1.0
+    return resultado
+
+
+def _numerica(df, columnas):
+    for columna in columnas:
+        if columna in df.columns:
+            return pd.to_numeric(df[columna], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.full(len(df), np.nan)
+
+
+def calcular_caracteristicas(df):
+    """Matriz (len(df) x len(CARACTERISTICAS_RANKING)) con valores en [0, 1]"""
+    rating = _numerica(df, ['rating'])
+    reviews = _numerica(df, ['num_reviews'])
+    posicion = _numerica(df, ['posicion_global', 'posicion'])
+    precio = _numerica(df, ['precio_eur'])
+    precio = np.where(precio > 0, precio, np.nan)
+
+    popularidad = np.select([reviews >= umbral for umbral, _ in UMBRALES_POPULARIDAD],
+                            [puntos for _, puntos in UMBRALES_POPULARIDAD], POPULARIDAD_NICHO)
+    popularidad[np.isnan(reviews)] = 0.0
+
+    columnas = {
+        'rating': _escalar(rating),
+        'num_reviews': _escalar(np.log1p(reviews)),
+        'posicion': _escalar(-posicion),
+        'precio': 1.0 - _escalar(np.log1p(precio)),
+        'popularidad': popularidad,
+        'valor': _escalar(rating / np.log1p(precio)),
+    }
+    columnas['precio'][np.isnan(precio)] = 0.0
+    return np.column_stack([columnas[c] for c in CARACTERISTICAS_RANKING]).reshape(len(df), len(CARACTERISTICAS_RANKING))
+
+
+def calcular_grupos(df):
+    """Matriz int32 (len(df) x len(GRUPOS_DIVERSIDAD)) con el código de cada grupo; -1 si falta"""
+    columnas = []
+    for columna in ['bodega', 'region']:
+        if columna in df.columns:
+            codigos, _ = pd.factorize(df[columna].astype(object))
+        else:
+            codigos = np.full(len(df), -1)
+        columnas.append(codigos)
+    precio = _numerica(df, ['precio_eur'])
+    tramos = np.searchsorted(LIMITES_TRAMOS_PRECIO, precio, side='left')
+    columnas.append(np.where(np.isnan(precio), -1, tramos))
+    return np.column_stack(columnas).astype(np.int32).reshape(len(df), len(GRUPOS_DIVERSIDAD))
+
+
+def vector_pesos(pesos_base, ajustes=None):
+    """Vector de pesos en el orden de CARACTERISTICAS_RANKING, con los ajustes de un gusto"""
+    pesos = dict(pesos_base)
+    pesos.update(ajustes or {})
+    vector = np.array([float(pesos.get(c, 0.0)) for c in CARACTERISTICAS_RANKING])
+    total = vector.sum()
+    return vector / total if total > 0 else vector
+
+
+class MatrizRanking:
+    """Características normalizadas del catálogo, de solo lectura"""
+
+    def __init__(self, df):
+        self.matriz = np.ascontiguousarray(calcular_caracteristicas(df))
+        self.matriz.setflags(write=False)
+        self.grupos = np.ascontiguousarray(calcular_grupos(df))
+        self.grupos.setflags(write=False)
+
+    def __len__(self):
+        return len(self.matriz)
+
+    def puntuar(self, posiciones, pesos):
+        return self.matriz[posiciones] @ pesos
+
+    def top_k(self, posiciones, pesos, k, claves=None):
+        """Las k posiciones con mayor puntuación, de mayor a menor.
+
+        Con ``claves`` (hash por vino) se descartan los repetidos: se parte de
+        un margen de 4k candidatos y se amplía solo si no bastan.
+        """
+        posiciones = np.asarray(posiciones)
+        if len(posiciones) == 0 or k <= 0:
+            return posiciones[:0]
+        puntuaciones = self.puntuar(posiciones, pesos)
+        if claves is None:
+            return _mejores(posiciones, puntuaciones, k)
+        margen = min(len(posiciones), 4 * k)
+        while True:
+            unicas = primeros_unicos(_mejores(posiciones, puntuaciones, margen), claves, k)
+            if len(unicas) == k or margen == len(posiciones):
+                return unicas
+            margen = min(len(posiciones), margen * 4)
+
+    def diversos(self, posiciones, pesos, k, pesos_similitud, lambda_mmr=0.7, candidatos=60, claves=None):
+        """k posiciones elegidas por MMR entre los ``candidatos`` mejores, en orden de elección.
+
+        ``pesos_similitud`` va en el orden de GRUPOS_DIVERSIDAD. La relevancia se
+        reescala a [0, 1] dentro de los candidatos para que ``lambda_mmr`` no
+        dependa de lo juntas que estén las puntuaciones.
+        """
+        candidatas = self.top_k(posiciones, pesos, max(candidatos, k), claves=claves)
+        if len(candidatas) <= 1 or k <= 0:
+            return candidatas[:max(k, 0)]
+        relevancia = _escalar(self.puntuar(candidatas, pesos))
+        grupos = self.grupos[candidatas]
+        pesos_similitud = np.asarray(pesos_similitud, dtype=np.float64)
+        similitud_maxima = np.zeros(len(candidatas))
+        disponibles = np.ones(len(candidatas), dtype=bool)
+        elegidas = []
+        for _ in range(min(k, len(candidatas))):
+            mmr = lambda_mmr * relevancia - (1.0 - lambda_mmr) * similitud_maxima
+            mmr[~disponibles] = -np.inf
+            # En empate gana el primero, que es el de mayor puntuación
+            elegida = int(np.argmax(mmr))
+            elegidas.append(elegida)
+            disponibles[elegida] = False
+            coincide = (grupos == grupos[elegida]) & (grupos[elegida] >= 0)
+            similitud_maxima = np.maximum(similitud_maxima, coincide @ pesos_similitud)
+        return candidatas[elegidas]
+
+
+def _mejores(posiciones, puntuaciones, k):
+    """argpartition (lineal) para elegir los k mejores y orden solo de esos k"""
+    if len(posiciones) > k:
+        elegidos = np.argpartition(-puntuaciones, k - 1)[:k]
+    else:
+        elegidos = np.arange(len(posiciones))
+    orden = np.lexsort((posiciones[elegidos], -puntuaciones[elegidos]))
+    return posiciones[elegidos[orden]]
@@ -0,0 +1,280 @@
+# Registro de modelos del Sommelier Inteligente
+"""
+Registro de modelos compartido por todo el proceso.
+
+Cada artefacto (modelo, ``le_target``, scaler, ``model_info.pkl``) se carga
+una única vez por worker de gunicorn y se reutiliza en todas las peticiones.
+Las rutas y ``Config.cargar_modelo()`` acceden a los modelos mediante
+``get_model(nombre, version)``.
+
+Un hilo vigilante comprueba la fecha de modificación de los archivos y, cuando
+un reentrenamiento los sustituye, carga y valida la nueva versión en segundo
+plano antes de publicarla. Las peticiones en curso conservan la referencia a
+los artefactos que obtuvieron al empezar, así que terminan con la versión
+anterior.
+"""
+import os
+import pickle
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from vigilancia import VigilanteCambios, firma_archivos
+
+
+class ArtefactosModelo:
+    """Componentes de un modelo cargado. No se modifican una vez publicados."""
+
+    def __init__(self, nombre, version, modelo, scaler, label_encoder=None,
+                 model_info=None, rutas=None):
+        self.nombre = nombre
+        self.version = version
+        self.modelo = modelo
+        self.scaler = scaler
+        self.label_encoder = label_encoder
+        self.model_info = model_info
+        self.rutas = rutas or []
+        self.cargado_en = datetime.now()
+
+        info = model_info or {}
+        self.label_encoders = info.get('label_encoders', {})
+        self.caracteristicas = info.get('caracteristicas', [])
+        # Tablas clase -> código precalculadas para codificar lotes con búsquedas en dict
+        self.codigos = {
+            columna: {clase: codigo for codigo, clase in enumerate(encoder.classes_)}
+            for columna, encoder in self.label_encoders.items()
+            if hasattr(encoder, 'classes_')
+        }
+
+    def __repr__(self):
+        return f'<ArtefactosModelo {self.nombre} v{self.version}>'
+
+
+def _version_por_mtime(rutas):
+    """Versión derivada de la fecha de modificación más reciente de los archivos"""
+    mtime = max(os.path.getmtime(ruta) for ruta in rutas)
+    return datetime.fromtimestamp(mtime).strftime('%Y%m%d_%H%M%S')
+
+
+def _desempaquetar_modelo(objeto):
+    """Los modelos de 'modelos generados' se guardan como {'model': clf, 'le_target': le}"""
+    if isinstance(objeto, dict) and 'model' in objeto:
+        return objeto['model'], objeto.get('le_target')
+    return objeto, None
+
+
+def _cargar_completo(config):
+    """Modelo completo de 15 características (static/ o raíz del proyecto)"""
+    import joblib
+
+    modelo, le_target = _desempaquetar_modelo(joblib.load(config.MODEL_FILE))
+    scaler = joblib.load(config.SCALER_FILE)
+    rutas = [config.MODEL_FILE, config.SCALER_FILE]
+
+    model_info = None
+    if config.MODEL_INFO_FILE and config.MODEL_INFO_FILE.exists():
+        try:
+            model_info = joblib.load(config.MODEL_INFO_FILE)
+            rutas.append(config.MODEL_INFO_FILE)
+        except Exception:
+            model_info = None
+
+    # Encoder independiente (compatibilidad con modelos antiguos)
+    encoder = le_target
+    if encoder is None and config.ENCODER_FILE.exists():
+        try:
+            with open(config.ENCODER_FILE, 'rb') as f:
+                encoder = pickle.load(f)
+        except Exception:
+            encoder = None
+
+    version = (model_info or {}).get('timestamp') or _version_por_mtime(rutas)
+    return ArtefactosModelo('completo', str(version), modelo, scaler, encoder, model_info, rutas)
+
+
+def _cargar_vivino(config):
+    """Modelo de 3 características (precio, rating, num_reviews) usado por /sommelier"""
+    import joblib
+
+    modelo, le_target = _desempaquetar_modelo(joblib.load(config.VIVINO_MODEL_FILE))
+    scaler = joblib.load(config.VIVINO_SCALER_FILE)
+    rutas = [config.VIVINO_MODEL_FILE, config.VIVINO_SCALER_FILE]
+    return ArtefactosModelo('vivino', _version_por_mtime(rutas), modelo, scaler, le_target, None, rutas)
+
+
+CARGADORES = {
+    'completo': _cargar_completo,
+    'vivino': _cargar_vivino,
+}
+
+# Archivos vigilados por cada modelo para detectar reentrenamientos
+ARCHIVOS_VIGILADOS = {
+    'completo': lambda config: [config.MODEL_FILE, config.SCALER_FILE, config.MODEL_INFO_FILE, config.ENCODER_FILE],
+    'vivino': lambda config: [config.VIVINO_MODEL_FILE, config.VIVINO_SCALER_FILE],
+}
+
+
+def validar_artefactos(artefactos):
+    """Comprueba que modelo y scaler son coherentes antes de publicarlos"""
+    if not hasattr(artefactos.modelo, 'predict'):
+        raise ValueError("El modelo no implementa predict()")
+    if not hasattr(artefactos.scaler, 'transform'):
+        raise ValueError("El scaler no implementa transform()")
+
+    n_features = getattr(artefactos.scaler, 'n_features_in_', None)
+    if n_features is None:
+        n_features = getattr(artefactos.modelo, 'n_features_in_', None)
+    if n_features is None:
+        return
+    if artefactos.caracteristicas and len(artefactos.caracteristicas) != n_features:
+        raise ValueError(
+            f"model_info declara {len(artefactos.caracteristicas)} características "
+            f"pero el scaler espera {n_features}"
+        )
+
+    # Predicción de humo con un vector neutro
+    X = artefactos.scaler.transform(np.zeros((1, n_features)))
+    prediccion = artefactos.modelo.predict(X)
+    if artefactos.label_encoder is not None and hasattr(artefactos.label_encoder, 'inverse_transform'):
+        artefactos.label_encoder.inverse_transform(prediccion)
+
+
+class RegistroModelos:
+    """Carga perezosa y compartida de modelos, protegida por un lock por nombre"""
+
+    def __init__(self, config=None, cargadores=None, archivos=None):
+        self._config = config
+        self._cargadores = dict(cargadores or CARGADORES)
+        self._archivos = dict(archivos or ARCHIVOS_VIGILADOS)
+        self._versiones = {}   # nombre -> {version: ArtefactosModelo}
+        self._activos = {}     # nombre -> ArtefactosModelo
+        self._firmas = {}      # nombre -> firma de archivos de la versión activa
+        self._locks = {}
+        self._lock_global = threading.Lock()
+        self._callbacks = []
+        self._vigilante = None
+
+    @property
+    def config(self):
+        if self._config is None:
+            from config_sommelier import Config
+            self._config = Config
+        return self._config
+
+    def nombres(self):
+        return list(self._cargadores)
+
+    def _lock(self, nombre):
+        with self._lock_global:
+            return self._locks.setdefault(nombre, threading.Lock())
+
+    def get_model(self, nombre, version=None):
+        """Devuelve los artefactos del modelo, cargándolos solo la primera vez"""
+        if nombre not in self._cargadores:
+            raise KeyError(f"Modelo desconocido: {nombre}")
+
+        artefactos = self._activos.get(nombre)
+        if artefactos is None:
+            with self._lock(nombre):
+                artefactos = self._activos.get(nombre)
+                if artefactos is None:
+                    firma = self.firma(nombre)
+                    artefactos = self._cargadores[nombre](self.config)
+                    self._publicar(artefactos, firma)
+                    print(f"✅ Modelo '{nombre}' v{artefactos.version} cargado en el registro (pid {os.getpid()})")
+
+        if version is None or version == artefactos.version:
+            return artefactos
+        try:
+            return self._versiones[nombre][version]
+        except KeyError:
+            raise KeyError(f"Versión no disponible para '{nombre}': {version}") from None
+
+    def _publicar(self, artefactos, firma=None):
+        """Sustituye la versión activa con una única asignación de referencia"""
+        versiones = self._versiones.setdefault(artefactos.nombre, {})
+        versiones[artefactos.version] = artefactos
+        retenidas = getattr(self.config, 'MODEL_VERSIONS_RETENIDAS', 3)
+        while len(versiones) > retenidas:
+            versiones.pop(next(iter(versiones)))
+        self._firmas[artefactos.nombre] = firma
+        self._activos[artefactos.nombre] = artefactos
+
+    def firma(self, nombre):
+        """Tupla (ruta, mtime, tamaño) de los archivos del modelo; cambia al reentrenar"""
+        return firma_archivos(self._archivos.get(nombre, lambda config: [])(self.config))
+
+    def recargar(self, nombre):
+        """Carga y valida una nueva versión; si todo va bien la publica de forma atómica"""
+        with self._lock(nombre):
+            firma = self.firma(nombre)
+            nuevos = self._cargadores[nombre](self.config)
+            validar_artefactos(nuevos)
+            anteriores = self._activos.get(nombre)
+            if anteriores is not None and anteriores.version == nuevos.version:
+                # Mismo contenido declarado: se publica igualmente, pero con versión distinguible
+                nuevos.version = f"{nuevos.version}+{_version_por_mtime(nuevos.rutas)}"
+            self._publicar(nuevos, firma)
+        print(f"🔄 Modelo '{nombre}' recargado: v{anteriores.version if anteriores else '-'} → v{nuevos.version} (pid {os.getpid()})")
+        for callback in list(self._callbacks):
+            try:
+                callback(nombre, nuevos)
+            except Exception as e:
+                print(f"⚠️ Error en callback de recarga de '{nombre}': {e}")
+        return nuevos
+
+    def al_recargar(self, callback):
+        """Registra callback(nombre, artefactos) que se ejecuta tras cada recarga"""
+        self._callbacks.append(callback)
+        return callback
+
+    def modelos_modificados(self):
+        """{nombre: firma} de los modelos cargados cuyos archivos han cambiado en disco"""
+        modificados = {}
+        for nombre in list(self._activos):
+            firma = self.firma(nombre)
+            if firma != self._firmas.get(nombre):
+                modificados[nombre] = firma
+        return modificados
+
+    def iniciar_vigilancia(self, intervalo=None):
+        """Arranca (una vez por proceso) el hilo que recarga modelos reentrenados"""
+        if intervalo is None:
+            intervalo = getattr(self.config, 'MODEL_RELOAD_INTERVAL', 30)
+        with self._lock_global:
+            if self._vigilante is not None and self._vigilante.activo_en_este_proceso():
+                return self._vigilante
+            self._vigilante = VigilanteCambios('vigilante-modelos', self.modelos_modificados,
+                                               self.recargar, intervalo)
+            self._vigilante.start()
+        return self._vigilante
+
+    def detener_vigilancia(self):
+        if self._vigilante is not None:
+            self._vigilante.detener()
+            self._vigilante = None
+
+    def versiones(self, nombre):
+        return list(self._versiones.get(nombre, {}))
+
+    def limpiar(self):
+        """Olvida todos los modelos cargados (útil en pruebas)"""
+        with self._lock_global:
+            self._versiones.clear()
+            self._activos.clear()
+            self._firmas.clear()
+
+
+# Registro único por proceso (cada worker de gunicorn tiene el suyo)
+registro = RegistroModelos()
+
+
+def get_model(nombre, version=None):
+    """Acceso al registro del proceso: get_model('vivino') o get_model('completo')"""
+    return registro.get_model(nombre, version)
+
+
+def iniciar_vigilancia(intervalo=None):
+    """Activa la recarga en caliente de modelos en el proceso actual"""
+    return registro.iniciar_vigilancia(intervalo)
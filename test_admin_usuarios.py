@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Script para probar la paginación por keyset y la búsqueda del panel de administración
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+from flask import Flask
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import models
+from admin import admin_bp, get_user_counts, get_users_page
+from config_sommelier import TestingConfig
+from hash_contrasenas import ServicioSaturado
+from models import User, bcrypt, db
+
+
+def crear_app(num_usuarios=23):
+    """App mínima con SQLite temporal y usuarios con created_at repetidos"""
+    app = Flask(__name__)
+    app.config.from_object(TestingConfig)
+    ruta = os.path.join(tempfile.mkdtemp(), 'usuarios.sqlite3')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{ruta}'
+    db.init_app(app)
+    bcrypt.init_app(app)
+    app.register_blueprint(admin_bp)
+    base = datetime(2025, 1, 1)
+    with app.app_context():
+        db.create_all()
+        for i in range(num_usuarios):
+            prefijo = 'ana' if i % 3 == 0 else 'luis'
+            usuario = User(f'{prefijo}{i:02d}@ejemplo.com', 'secreta123', f'Usuario{i}', 'Prueba', date(1990, 1, 1))
+            usuario.created_at = base + timedelta(minutes=i // 4)  # grupos de 4 con la misma fecha
+            usuario.is_active = i % 5 != 0
+            db.session.add(usuario)
+        db.session.commit()
+    return app
+
+
+def test_paginacion_keyset():
+    print("🧪 PROBANDO PAGINACIÓN POR KEYSET")
+    app = crear_app()
+    with app.app_context():
+        esperado = [(u.created_at, u.id) for u in User.query.all()]
+        esperado.sort(reverse=True)
+        vistos, cursor, paginas = [], None, 0
+        while True:
+            usuarios, cursor = get_users_page(cursor, por_pagina=5)
+            assert len(usuarios) <= 5
+            vistos.extend((u.created_at, u.id) for u in usuarios)
+            paginas += 1
+            if cursor is None:
+                break
+        assert vistos == esperado and paginas == 5  # sin repetidos ni saltos aunque se repita created_at
+
+        # Búsqueda por prefijo de email (sin distinguir mayúsculas)
+        anas, cursor = get_users_page(prefijo_email='ANA', por_pagina=100)
+        assert cursor is None and len(anas) == 8 and all(u.email.startswith('ana') for u in anas)
+        # Los comodines de LIKE se escapan
+        assert get_users_page(prefijo_email='%')[0] == [] and get_users_page(prefijo_email='a_a')[0] == []
+        # Un cursor inválido vuelve a la primera página
+        assert get_users_page('no-es-un-cursor', por_pagina=3)[0][0].id == esperado[0][1]
+    print(f"✅ {len(vistos)} usuarios en {paginas} páginas de 5")
+
+
+def test_conteos_y_panel():
+    print("🧪 PROBANDO CONTEOS Y PANEL")
+    app = crear_app()
+    with app.app_context():
+        conteos = get_user_counts('ana')
+    assert conteos == {'total': 23, 'activos': 18, 'verificados': 0, 'newsletter': 0, 'coincidencias': 8}
+
+    cliente = app.test_client()
+    with cliente.session_transaction() as sesion:
+        sesion['admin_logged_in'] = True
+    html = cliente.get('/admin?por_pagina=10&email=luis').get_data(as_text=True)
+    assert html.count('@ejemplo.com</td>') == 10 and 'Siguiente' in html and '15 usuarios coinciden' in html
+    assert 'Primera página' not in html
+    # Un cursor que no se puede decodificar lleva a la primera página sin el cursor
+    respuesta = cliente.get('/admin?por_pagina=10&email=luis&despues=no-es-un-cursor')
+    assert respuesta.status_code == 302 and 'despues' not in respuesta.headers['Location']
+    assert 'email=luis' in respuesta.headers['Location'] and 'por_pagina=10' in respuesta.headers['Location']
+    print(f"✅ {conteos}")
+
+
+def test_alta_y_edicion_con_bcrypt_saturado():
+    print("🧪 PROBANDO ALTA Y EDICIÓN DE USUARIOS CON BCRYPT SATURADO")
+    app = crear_app(num_usuarios=3)
+    cliente = app.test_client()
+    with cliente.session_transaction() as sesion:
+        sesion['admin_logged_in'] = True
+    with app.app_context():
+        usuario = User.query.order_by(User.id).first()
+        user_id, email = usuario.id, usuario.email
+
+    def saturado(*args):
+        raise ServicioSaturado('Demasiadas operaciones de contraseña en curso')
+
+    ejecutar = models.ejecutor_hash.ejecutar
+    models.ejecutor_hash.ejecutar = saturado
+    try:
+        alta = cliente.post('/admin/add', data={'username': 'Nuevo', 'email': 'nuevo@ejemplo.com',
+                                                 'password': 'secreta123'})
+        edicion = cliente.post(f'/admin/edit/{user_id}', data={'username': 'Otro', 'email': 'otro@ejemplo.com',
+                                                               'password': 'nueva123'})
+    finally:
+        models.ejecutor_hash.ejecutar = ejecutar
+    # Sin 500 y sin cambios a medias: ni usuario nuevo ni email cambiado
+    assert alta.status_code == edicion.status_code == 302
+    with app.app_context():
+        assert User.query.count() == 3 and db.session.get(User, user_id).email == email
+    html = cliente.get('/admin').get_data(as_text=True)
+    assert 'Inténtalo de nuevo en unos segundos' in html
+    print("✅ Operación rechazada con aviso y sesión deshecha")
+
+
+if __name__ == "__main__":
+    test_paginacion_keyset()
+    test_conteos_y_panel()
+    test_alta_y_edicion_con_bcrypt_saturado()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Script para probar el almacén columnar mapeado en memoria
+"""
+
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from almacen_columnar import abrir_columnar, almacen_vigente, asegurar_columnar
+from dataset_vinos import cargar_dataset, leer_y_preparar_csv
+
+CSV_ORIGEN = Path(__file__).parent / 'datos_scraping' / 'dataset_vinos_combinado_ultra_limpio_20250717_122604.csv'
+
+
+def copiar_csv():
+    ruta = Path(tempfile.mkdtemp()) / CSV_ORIGEN.name
+    shutil.copy(CSV_ORIGEN, ruta)
+    return ruta
+
+
+def test_vista_igual_que_csv():
+    print("🧪 PROBANDO VISTA COLUMNAR")
+    if not CSV_ORIGEN.exists():
+        print("❌ No hay datos de vinos")
+        return
+    ruta = copiar_csv()
+    esperado = leer_y_preparar_csv(ruta)
+    vista = cargar_dataset(ruta)
+    pd.testing.assert_frame_equal(vista, esperado)
+
+    # Las columnas numéricas son vistas de los archivos mapeados, no copias
+    precios = vista['precio_eur'].to_numpy()
+    base = precios
+    while base is not None and not isinstance(base, (np.memmap, mmap.mmap)):
+        base = base.base
+    assert base is not None, "precio_eur no está respaldado por el archivo mapeado"
+    assert not precios.flags.writeable
+
+    # Legible por el usuario de la app aunque lo exporte root en el build
+    almacen = almacen_vigente(ruta)
+    assert os.stat(almacen).st_mode & 0o777 == 0o755
+    assert all(os.stat(archivo).st_mode & 0o777 == 0o644 for archivo in almacen.iterdir())
+    print(f"✅ {len(vista)} vinos idénticos al CSV, precio_eur mapeado en memoria")
+
+
+def test_csv_modificado_genera_almacen_nuevo():
+    print("🧪 PROBANDO INVALIDACIÓN POR CAMBIO DEL CSV")
+    if not CSV_ORIGEN.exists():
+        print("❌ No hay datos de vinos")
+        return
+    ruta = copiar_csv()
+    anterior = asegurar_columnar(ruta, leer_y_preparar_csv)
+    vista_anterior = abrir_columnar(anterior)
+
+    pd.read_csv(ruta).head(10).to_csv(ruta, index=False)
+    assert almacen_vigente(ruta) is None
+    nuevo = asegurar_columnar(ruta, leer_y_preparar_csv)
+    assert nuevo != anterior and not anterior.exists()
+    assert len(abrir_columnar(nuevo)) == 10
+    # Un worker que aún tenga mapeado el almacén anterior sigue leyéndolo
+    assert len(vista_anterior) > 10 and float(vista_anterior['precio_eur'].sum()) > 0
+    print(f"✅ {anterior.name} → {nuevo.name}")
+
+
+def test_formato_anterior_no_se_reutiliza():
+    print("🧪 PROBANDO ALMACÉN DE UN FORMATO ANTERIOR")
+    if not CSV_ORIGEN.exists():
+        print("❌ No hay datos de vinos")
+        return
+    import almacen_columnar
+    ruta = copiar_csv()
+    version = almacen_columnar.VERSION_FORMATO
+    try:
+        almacen_columnar.VERSION_FORMATO = version - 1
+        anterior = asegurar_columnar(ruta, leer_y_preparar_csv)
+    finally:
+        almacen_columnar.VERSION_FORMATO = version
+    # Mismo CSV, formato nuevo: directorio distinto que sí se puede abrir
+    nuevo = asegurar_columnar(ruta, leer_y_preparar_csv)
+    assert nuevo != anterior and not anterior.exists()
+    assert len(abrir_columnar(nuevo)) == len(leer_y_preparar_csv(ruta))
+    print(f"✅ {anterior.name} → {nuevo.name}")
+
+
+def test_almacen_ajeno_no_se_abre():
+    print("🧪 PROBANDO ALMACÉN DE OTRO USUARIO")
+    if not CSV_ORIGEN.exists() or not hasattr(os, 'geteuid') or os.geteuid() != 0:
+        print("⚠️ Hace falta root para simular un almacén de otro usuario")
+        return
+    import almacen_columnar
+    ruta = copiar_csv()
+    plantado = asegurar_columnar(ruta, leer_y_preparar_csv)
+    for camino in [plantado, *plantado.iterdir()]:
+        os.chown(camino, 12345, 12345)
+    assert almacen_vigente(ruta) is None
+
+    # Se exporta uno nuevo en la caché privada de la app, nunca en el temporal
+    cache = Path(tempfile.mkdtemp()) / 'cache'
+    original = almacen_columnar.Config.CACHE_DIR
+    almacen_columnar.Config.CACHE_DIR = cache
+    try:
+        assert Path(tempfile.gettempdir()) not in almacen_columnar.directorios_candidatos(ruta)
+        nuevo = asegurar_columnar(ruta, leer_y_preparar_csv)
+        assert nuevo.parent == cache and os.stat(cache).st_mode & 0o777 == 0o700
+        assert almacen_vigente(ruta) == nuevo
+        # Escribible por otros: tampoco se abre
+        os.chmod(nuevo, 0o777)
+        assert almacen_vigente(ruta) is None
+    finally:
+        almacen_columnar.Config.CACHE_DIR = original
+    print(f"✅ Almacén ajeno ignorado; exportado en {cache}")
+
+
+if __name__ == "__main__":
+    test_vista_igual_que_csv()
+    test_csv_modificado_genera_almacen_nuevo()
+    test_formato_anterior_no_se_reutiliza()
+    test_almacen_ajeno_no_se_abre()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Script para probar el autocompletado de bodegas, regiones y variedades
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from autocompletado_vinos import IndiceAutocompletado
+
+
+def crear_dataset():
+    return pd.DataFrame({
+        'nombre_limpio': ['Pazo Señoráns Albariño', 'Pazo Señoráns Albariño', 'Pazo Baión Albariño',
+                          'Viña Ardanza Reserva', 'Protos Verdejo Rueda'],
+        'bodega': ['Pazo de Señoráns', 'Pazo de Señoráns', 'Pazo Baión', 'La Rioja Alta', None],
+        'region': ['Rías Baixas', 'Rías Baixas', 'Rías Baixas', 'Rioja', 'Rueda'],
+        'num_reviews': [900.0, 900.0, 300.0, 2000.0, None],
+        'clave_vino': np.array([1, 1, 2, 3, 4], dtype=np.int64),
+    })
+
+
+def textos(sugerencias):
+    return [s['texto'] for s in sugerencias]
+
+
+def test_sugerencias():
+    print("🧪 PROBANDO SUGERENCIAS")
+    indice = IndiceAutocompletado(crear_dataset())
+    # Más populares primero; la copia de la clave 1 no suma dos veces
+    assert indice.sugerir('pazo') == [
+        {'texto': 'Pazo de Señoráns', 'tipo': 'bodega', 'popularidad': 900},
+        {'texto': 'Pazo Baión', 'tipo': 'bodega', 'popularidad': 300},
+    ]
+    # Sin tildes, mayúsculas ni desde el principio del texto
+    assert textos(indice.sugerir('SENOR')) == ['Pazo de Señoráns']
+    assert textos(indice.sugerir('ri')) == ['La Rioja Alta', 'Rioja', 'Rías Baixas']
+    assert indice.sugerir('albar') == [{'texto': 'Albariño', 'tipo': 'variedad', 'popularidad': 1200}]
+    assert textos(indice.sugerir('r', k=2)) == ['La Rioja Alta', 'Rioja']
+    assert indice.sugerir('') == [] and indice.sugerir('xyz') == []
+    print(f"✅ 'pazo' -> {textos(indice.sugerir('pazo'))}")
+
+
+def test_endpoint_autocompletar():
+    print("🧪 PROBANDO /api/autocompletar")
+    import app_sommelier
+    cliente = app_sommelier.app.test_client()
+    assert cliente.get('/api/autocompletar').get_json()['sugerencias'] == []
+    catalogo = app_sommelier.gestor_catalogo.actual
+    if catalogo.df.empty:
+        print("❌ No hay datos de vinos")
+        return
+    region = catalogo.df['region'].dropna().iloc[0]
+    datos = cliente.get('/api/autocompletar', query_string={'prefijo': region[:3]}).get_json()
+    assert region in textos(datos['sugerencias'])
+    popularidades = [s['popularidad'] for s in datos['sugerencias']]
+    assert popularidades == sorted(popularidades, reverse=True)
+
+    # Presupuesto por pulsación: < 2 ms en el servidor
+    prefijos = [texto[:n] for texto in catalogo.autocompletado.textos[:50] for n in (1, 2, 4)]
+    inicio = time.perf_counter()
+    for prefijo in prefijos:
+        catalogo.autocompletado.sugerir(prefijo)
+    media = (time.perf_counter() - inicio) * 1000 / len(prefijos)
+    assert media < 2, media
+    print(f"✅ '{region[:3]}' -> {textos(datos['sugerencias'])} ({media:.3f} ms por prefijo)")
+
+
+if __name__ == "__main__":
+    test_sugerencias()
+    test_endpoint_autocompletar()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Script para probar la búsqueda por texto y /api/buscar
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from busqueda_vinos import IndiceBusqueda, trigramas
+
+
+def crear_dataset():
+    return pd.DataFrame({
+        'nombre_limpio': ['Pazo Señoráns Albariño', 'Pazo Señoráns Albariño', 'Pazo Baión Albariño',
+                          'Viña Ardanza Reserva', 'Protos Verdejo'],
+        'bodega': ['Pazo de Señoráns', 'Pazo de Señoráns', 'Pazo Baión', 'La Rioja Alta', 'Protos'],
+        'region': ['Rías Baixas', 'Rías Baixas', 'Rías Baixas', 'Rioja', 'Rueda'],
+        'num_reviews': [900.0, 900.0, 300.0, 2000.0, None],
+        'clave_vino': np.array([1, 1, 2, 3, 4], dtype=np.int64),
+    })
+
+
+def test_trigramas():
+    print("🧪 PROBANDO TRIGRAMAS")
+    assert trigramas('pazo') == {' pa', 'paz', 'azo', 'zo '}
+    assert trigramas('de') == {' de', 'de '}
+    print("✅ Trigramas con relleno")
+
+
+def test_busqueda():
+    print("🧪 PROBANDO BÚSQUEDA")
+    indice = IndiceBusqueda(crear_dataset())
+    assert len(indice) == 4  # la copia de la clave 1 no entra
+
+    posiciones, puntuaciones = indice.buscar('Pazo Señorans')
+    assert posiciones.tolist() == [0, 2], posiciones  # sin tilde; el que coincide en todo va primero
+    assert puntuaciones[0] > puntuaciones[1]
+    # Erratas y palabras a medio escribir
+    assert indice.buscar('pazo senorns')[0][0] == 0
+    assert indice.buscar('ardanz')[0].tolist() == [3]
+    assert indice.buscar('RIOJA')[0].tolist() == [3]
+    # A igual puntuación, más reviews primero
+    assert indice.buscar('rias baixas')[0].tolist() == [0, 2]
+    assert indice.buscar('xyzzy')[0].size == 0 and indice.buscar('  ')[0].size == 0
+    assert len(indice.buscar('albarino', k=1)[0]) == 1
+    print(f"✅ 'Pazo Señorans' -> {posiciones.tolist()} (puntuaciones {np.round(puntuaciones, 2).tolist()})")
+
+
+def test_endpoint_buscar():
+    print("🧪 PROBANDO /api/buscar")
+    import app_sommelier
+    cliente = app_sommelier.app.test_client()
+    assert cliente.get('/api/buscar').status_code == 400
+    catalogo = app_sommelier.gestor_catalogo.actual
+    if catalogo.df.empty:
+        print("❌ No hay datos de vinos")
+        return
+    bodega = catalogo.df['bodega'].dropna().iloc[0]
+    inicio = time.perf_counter()
+    datos = cliente.get('/api/buscar', query_string={'q': bodega.lower(), 'k': 5}).get_json()
+    duracion = (time.perf_counter() - inicio) * 1000
+    assert 0 < datos['total'] <= 5
+    assert datos['resultados'][0]['bodega'] == bodega
+    claves = [vino['clave_vino'] for vino in datos['resultados']]
+    assert len(claves) == len(set(claves))
+    print(f"✅ '{bodega}': {datos['total']} resultados en {duracion:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_trigramas()
+    test_busqueda()
+    test_endpoint_buscar()
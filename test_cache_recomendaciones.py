@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Script para probar la caché de recomendaciones y su invalidación
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cache_recomendaciones import normalizar_consulta
+from cache_resultados import CacheLRU
+from dataset_vinos import GestorCatalogo
+
+
+def test_normalizar_consulta():
+    print("🧪 PROBANDO NORMALIZACIÓN DE CONSULTAS")
+    gustos = {'equilibrado': 'Equilibrado', 'premium': 'Premium'}
+    a = normalizar_consulta('10.2', 30, '4.1', 'tinto', 'Premium', gustos=gustos)
+    b = normalizar_consulta(10.0, 29.9, 4.1, 'Tinto', 'premium', gustos=gustos)
+    assert a == b == (10.0, 30.0, 4.1, 'Tinto', 'premium')
+    assert normalizar_consulta(10, 30, 4.0, 'ambos', 'desconocido', gustos=gustos)[3:] == ('Todos', 'equilibrado')
+    # Texto o valores no finitos de la query string: ValueError (400), no un error del servidor
+    for invalido in ('abc', 'nan', 'inf', '-Infinity', '1e308'):
+        try:
+            normalizar_consulta(invalido, 30, 4.0)
+            assert False, invalido
+        except ValueError:
+            pass
+    print(f"✅ Consulta canónica: {a}")
+
+
+def test_lru_y_ttl():
+    print("🧪 PROBANDO EXPULSIÓN LRU Y CADUCIDAD")
+    cache = CacheLRU(max_entradas=2, ttl=60)
+    cache.guardar('a', 1)
+    cache.guardar('b', 2)
+    assert cache.obtener('a') == (True, 1)
+    cache.guardar('c', 3)  # 'b' es la menos usada
+    assert cache.obtener('b') == (False, None)
+    assert cache.obtener_o_calcular('c', lambda: 99) == 3
+
+    cache.ttl = 0.01
+    cache.guardar('d', 4)
+    time.sleep(0.02)
+    assert cache.obtener('d') == (False, None)
+
+    cache.limpiar('vivino', None)
+    estadisticas = cache.estadisticas()
+    assert estadisticas['entradas'] == 0 and estadisticas['invalidaciones'] == 1
+    assert estadisticas['expulsiones'] >= 1
+    print(f"✅ Estadísticas: {estadisticas}")
+
+
+def test_recarga_catalogo_invalida_cache():
+    print("🧪 PROBANDO INVALIDACIÓN AL RECARGAR EL CATÁLOGO")
+    origen = Path(__file__).parent / 'datos_scraping' / 'dataset_vinos_combinado_ultra_limpio_20250717_122604.csv'
+    if not origen.exists():
+        print("❌ No hay datos de vinos")
+        return
+    ruta = Path(tempfile.mkdtemp()) / origen.name
+    shutil.copy(origen, ruta)
+
+    gestor = GestorCatalogo(lambda: ruta)
+    cache = CacheLRU()
+    gestor.al_recargar(cache.limpiar)
+    anterior, _ = gestor.cargar(ruta)
+    cache.guardar(('recomendar', anterior.version), ['vino'])
+    assert gestor.modificado() == {}
+
+    # Nuevo CSV con la mitad de vinos
+    anterior.df.head(len(anterior.df) // 2).to_csv(ruta, index=False)
+    assert 'catalogo' in gestor.modificado()
+    nuevo = gestor.recargar()
+    assert gestor.actual is nuevo and len(nuevo) == len(anterior) // 2
+    assert len(anterior.indice) == len(anterior.df)  # las peticiones en curso no se ven afectadas
+    assert len(cache) == 0
+    print(f"✅ {anterior} → {nuevo}")
+
+
+if __name__ == "__main__":
+    test_normalizar_consulta()
+    test_lru_y_ttl()
+    test_recarga_catalogo_invalida_cache()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Script para probar la caché compartida entre procesos (SQLite en modo WAL)
+"""
+
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cache_resultados import CacheLRU, CacheSQLite, crear_cache
+
+
+def _worker_guarda(ruta, clave, valor):
+    CacheSQLite(ruta, 'recomendaciones').guardar(clave, valor)
+
+
+def test_compartida_entre_procesos():
+    print("🧪 PROBANDO CACHÉ COMPARTIDA ENTRE WORKERS")
+    ruta = Path(tempfile.mkdtemp()) / 'cache.sqlite3'
+    cache = CacheSQLite(ruta, 'recomendaciones')
+    clave = ('recomendar', 10.0, 30.0, 4.1, 'Tinto', 'premium', 'abc123')
+    vinos = [{'nombre_limpio': 'Viña Ejemplo', 'precio_eur': 12.5, 'año': 'N/A'}]
+
+    # Otro proceso calcula el resultado; este lo lee sin recalcular
+    proceso = multiprocessing.get_context('spawn').Process(target=_worker_guarda, args=(str(ruta), clave, vinos))
+    proceso.start()
+    proceso.join(30)
+    assert proceso.exitcode == 0
+    assert cache.obtener_o_calcular(clave, lambda: []) == vinos
+    assert cache.estadisticas()['aciertos'] == 1
+
+    # Los espacios no se mezclan
+    chatbot = CacheSQLite(ruta, 'chatbot')
+    assert chatbot.obtener(clave) == (False, None)
+    chatbot.guardar(clave, 'respuesta')
+    cache.limpiar()
+    assert chatbot.obtener(clave) == (True, 'respuesta')
+    assert len(cache) == 0
+    print(f"✅ Estadísticas: {cache.estadisticas()}")
+
+
+def test_lru_y_ttl_sqlite():
+    print("🧪 PROBANDO EXPULSIÓN LRU Y CADUCIDAD EN SQLITE")
+    cache = CacheSQLite(Path(tempfile.mkdtemp()) / 'cache.sqlite3', max_entradas=2, ttl=60)
+    cache.guardar('a', 1)
+    time.sleep(0.01)
+    cache.guardar('b', 2)
+    time.sleep(0.01)
+    assert cache.obtener('a') == (True, 1)
+    time.sleep(0.01)
+    cache.guardar('c', 3)  # 'b' es la menos usada
+    assert cache.obtener('b') == (False, None)
+    assert cache.estadisticas()['expulsiones'] == 1
+
+    cache.ttl = 0.01
+    cache.guardar('d', 4)
+    time.sleep(0.02)
+    assert cache.obtener('d') == (False, None)
+    print("✅ LRU y TTL respetados")
+
+
+def test_fallo_del_backend_no_rompe():
+    print("🧪 PROBANDO DEGRADACIÓN ANTE FALLOS")
+
+    # Un directorio en el que cualquiera puede escribir (como /tmp) no se usa nunca
+    compartido = Path(tempfile.mkdtemp())
+    os.chmod(compartido, 0o777)
+
+    class ConfigPrueba:
+        CACHE_BACKEND = 'sqlite'
+        CACHE_SQLITE_FILE = compartido / 'cache.sqlite3'
+        CACHE_MAX_ENTRADAS = 10
+        CACHE_TTL = 60
+
+    cache = crear_cache(ConfigPrueba, 'recomendaciones')
+    assert isinstance(cache, CacheLRU) and not os.path.exists(ConfigPrueba.CACHE_SQLITE_FILE)
+    assert cache.obtener_o_calcular('x', lambda: 42) == 42
+    print("✅ Sin caché compartida se usa la caché en memoria")
+
+
+def test_sqlite_privada_y_json():
+    print("🧪 PROBANDO PERMISOS Y FORMATO DE LA CACHÉ COMPARTIDA")
+    ruta = Path(tempfile.mkdtemp()) / 'cache' / 'cache.sqlite3'
+    cache = CacheSQLite(ruta, 'recomendaciones')
+    assert os.stat(ruta.parent).st_mode & 0o777 == 0o700
+    assert os.stat(ruta).st_mode & 0o777 == 0o600
+
+    # Los valores son JSON: tuplas como listas y escalares de numpy como números
+    cache.guardar('prediccion', ('Excelente', np.float64(0.87)))
+    assert cache.obtener('prediccion') == (True, ['Excelente', 0.87])
+    fila = sqlite3.connect(ruta).execute("SELECT valor FROM cache WHERE clave = ?", (repr('prediccion'),)).fetchone()
+    assert json.loads(fila[0]) == ['Excelente', 0.87]
+
+    # Lo que no es JSON no se guarda (ni rompe la petición)
+    cache.guardar('objeto', object())
+    assert cache.obtener('objeto') == (False, None) and cache.estadisticas()['errores'] == 1
+    print("✅ Directorio 0700, archivo 0600 y valores en JSON")
+
+
+def test_cache_chatbot_con_config_de_la_app():
+    print("🧪 PROBANDO QUE EL CHATBOT USA EL BACKEND DE LA CONFIGURACIÓN ACTIVA")
+    import chatbot
+    from config_sommelier import TestingConfig
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.config.from_object(TestingConfig)
+    anterior, chatbot.cache_respuestas = chatbot.cache_respuestas, None
+    try:
+        with app.app_context():
+            cache = chatbot.obtener_cache()
+            assert isinstance(cache, CacheLRU) and chatbot.obtener_cache() is cache
+            assert cache.max_entradas == TestingConfig.CHATBOT_CACHE_MAX_ENTRADAS
+    finally:
+        chatbot.cache_respuestas = anterior
+    print("✅ TestingConfig: caché del chatbot en memoria")
+
+
+if __name__ == "__main__":
+    test_compartida_entre_procesos()
+    test_lru_y_ttl_sqlite()
+    test_fallo_del_backend_no_rompe()
+    test_sqlite_privada_y_json()
+    test_cache_chatbot_con_config_de_la_app()
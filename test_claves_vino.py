@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Script para probar las claves canónicas de vino y la deduplicación por hash
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from deduplicacion_vinos import calcular_claves, clave_canonica, id_vivino
+from ranking_vinos import MatrizRanking
+
+URL = 'https://www.vivino.com/morca-garnacha/w/5248344?year=2019&price_id=29492416'
+
+
+def test_clave_canonica():
+    print("🧪 PROBANDO CLAVES CANÓNICAS")
+    assert id_vivino(URL) == '5248344'
+    assert id_vivino('https://www.vivino.com/explore?e=abc') is None
+    # Mismo id de Vivino y añada: mismo vino aunque el nombre extraído cambie
+    assert clave_canonica('Morca Garnacha', 'Morca', 2019, URL) == clave_canonica('MORCA garnacha...', None, 2019.0, URL)
+    assert clave_canonica('Morca Garnacha', 'Morca', 2019, URL) != clave_canonica('Morca Garnacha', 'Morca', 2020, URL)
+    # Sin id: nombre y bodega normalizados
+    assert clave_canonica('Viña Ardanza 2016', 'La Rioja Alta', 2016, None) == \
+        clave_canonica('vina  ardanza', 'LA RIOJA ALTA', 2016, 'https://www.vivino.com/explore')
+    print("✅ Claves estables ante cambios de formato del nombre")
+
+
+def test_recomendaciones_sin_repetidos():
+    print("🧪 PROBANDO DEDUPLICACIÓN POR HASH")
+    df = pd.DataFrame({
+        'nombre_limpio': ['Morca Garnacha', 'Morca Garnacha', 'Otro Vino', 'Tercero', 'Cuarto'],
+        'bodega': ['Morca', 'Morca', 'Bodega A', 'Bodega B', 'Bodega C'],
+        'año': [2019, 2019, 2020, 2018, 2021],
+        'url': [URL, URL.replace('price_id=29492416', 'price_id=1'), None, None, None],
+        'rating': [4.6, 4.6, 4.0, 4.1, 3.9],
+        'num_reviews': [900.0, 900.0, 50.0, 80.0, 20.0],
+        'precio_eur': [20.0, 20.0, 25.0, 22.0, 30.0],
+    })
+    claves = calcular_claves(df)
+    assert claves.dtype == np.int64 and claves[0] == claves[1] and len(set(claves)) == 4
+
+    pesos = np.ones(6) / 6
+    seleccion = MatrizRanking(df).top_k(np.arange(len(df)), pesos, 3, claves=claves)
+    assert len(seleccion) == 3 and len(set(claves[seleccion])) == 3
+    assert MatrizRanking(df).top_k(np.arange(len(df)), pesos, 10, claves=claves).size == 4
+    print(f"✅ Selección sin repetidos: {seleccion.tolist()}")
+
+
+def test_catalogo_sin_repetidos():
+    print("🧪 PROBANDO RECOMENDACIONES DEL CATÁLOGO")
+    import app_sommelier
+    catalogo = app_sommelier.gestor_catalogo.actual
+    if catalogo.df.empty:
+        print("❌ No hay datos de vinos")
+        return
+    for precio_min, precio_max, rating_min in [(10, 25, 4.0), (20, 35, 4.1), (8, 60, 3.8)]:
+        vinos = app_sommelier.buscar_vinos_similares(precio_min, precio_max, rating_min, catalogo=catalogo)
+        claves = [vino['clave_vino'] for vino in vinos]
+        assert len(claves) == len(set(claves)), (precio_min, precio_max, rating_min)
+    print("✅ Ninguna recomendación repite vino")
+
+
+if __name__ == "__main__":
+    test_clave_canonica()
+    test_recomendaciones_sin_repetidos()
+    test_catalogo_sin_repetidos()
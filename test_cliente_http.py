@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Script para probar el scraping por HTTP contra respuestas grabadas de Vivino
+servidas por un servidor local
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cliente_http import ClienteHttp
+from motor_scraping import (ConfiguracionScraping, FuentePaginacion, MotorScraping, tarjetas_api,
+                            url_api_explorar, url_pagina)
+from pool_navegadores import LimitadorPorHost
+from test_motor_scraping import DriverFalso, pagina_html, tarjeta
+
+# Respuestas grabadas (recortadas): búsqueda con los vinos en el HTML, la misma
+# búsqueda cuando Vivino solo manda el esqueleto de la app y la API de exploración
+BUSQUEDA_CON_VINOS = pagina_html(
+    tarjeta(101, 'Martín Códax Albariño 2022 Rías Baixas España 4,0 532 valoraciones 12,90 €'),
+    tarjeta(102, 'Pazo de Señoráns Albariño 2021 Rías Baixas España 4,2 1.210 valoraciones 19,50 €'),
+)
+BUSQUEDA_SOLO_JS = ('<html><head><script src="/packs/search.js"></script></head>'
+                    '<body><div id="search-page"></div></body></html>')
+API_EXPLORAR = {
+    'explore_vintage': {
+        'records_matched': 2,
+        'matches': [
+            {'vintage': {'year': 2022, 'statistics': {'ratings_average': 4.1, 'ratings_count': 2345},
+                         'wine': {'id': 1141133, 'name': 'Verdejo',
+                                  'winery': {'name': 'José Pariente'},
+                                  'region': {'name': 'Rueda', 'country': {'name': 'España'}}}},
+             'price': {'amount': 11.9, 'currency': {'code': 'EUR'}}},
+            {'vintage': {'year': 2021, 'statistics': {'ratings_average': 3.9, 'ratings_count': 410},
+                         'wine': {'id': 1275431, 'name': 'Godello',
+                                  'winery': {'name': 'Rafael Palacios'},
+                                  'region': {'name': 'Valdeorras', 'country': {'name': 'España'}}}},
+             'price': {'amount': 24.5, 'currency': {'code': 'EUR'}}},
+        ],
+    }
+}
+API_VACIA = {'explore_vintage': {'records_matched': 2, 'matches': []}}
+
+RESPUESTAS = {
+    '/search/wines?q=albarino&page=1': ('text/html; charset=utf-8', BUSQUEDA_CON_VINOS),
+    '/search/wines?q=albarino&page=2': ('text/html; charset=utf-8', BUSQUEDA_SOLO_JS),
+    '/api/explore/explore?wine_type_ids%5B%5D=2&page=1': ('application/json', json.dumps(API_EXPLORAR)),
+    '/api/explore/explore?wine_type_ids%5B%5D=2&page=2': ('application/json', json.dumps(API_VACIA)),
+    '/api/explore/explore?wine_type_ids%5B%5D=2&page=3': ('application/json', json.dumps(API_VACIA)),
+}
+
+
+class ServidorGrabado:
+    """Servidor HTTP/1.1 local con las respuestas grabadas; apunta rutas, conexiones y peticiones simultáneas"""
+
+    def __init__(self, retardo=0.0):
+        servidor = self
+        self.rutas = []
+        self.conexiones = set()
+        self.activas = self.max_activas = 0
+        lock = threading.Lock()
+
+        class Manejador(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+
+            def do_GET(self):
+                with lock:
+                    servidor.rutas.append(self.path)
+                    servidor.conexiones.add(self.client_address)
+                    servidor.activas += 1
+                    servidor.max_activas = max(servidor.max_activas, servidor.activas)
+                time.sleep(retardo)
+                with lock:
+                    servidor.activas -= 1
+                tipo, cuerpo = RESPUESTAS.get(self.path, ('text/html', '<html>No encontrado</html>'))
+                cuerpo = cuerpo.encode('utf-8')
+                self.send_response(200 if self.path in RESPUESTAS else 404)
+                self.send_header('Content-Type', tipo)
+                self.send_header('Content-Length', str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass
+
+        self.http = ThreadingHTTPServer(('127.0.0.1', 0), Manejador)
+        self.url = f'http://127.0.0.1:{self.http.server_address[1]}'
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+
+    def cerrar(self):
+        self.http.shutdown()
+        self.http.server_close()
+
+
+def test_cliente_concurrente_keep_alive():
+    print("🧪 PROBANDO DESCARGAS CONCURRENTES CON KEEP-ALIVE")
+    servidor = ServidorGrabado(retardo=0.05)
+    try:
+        urls = [f'{servidor.url}/search/wines?q=albarino&page=1&n={n}' for n in range(12)] + [servidor.url + '/nada']
+        with ClienteHttp(concurrencia=4) as cliente:
+            respuestas = cliente.descargar(urls[:6])
+            # Segunda tanda con las mismas conexiones; las repetidas se piden una vez
+            respuestas.update(cliente.descargar(urls[6:] + urls[6:9]))
+    finally:
+        servidor.cerrar()
+    assert len(respuestas) == 13 and len(servidor.rutas) == 13
+    assert respuestas[urls[-1]].estado == 404 and respuestas[urls[0]].tipo == 'text/html'
+    # Varias a la vez, y las conexiones se reutilizan: nunca más que el tamaño del pool
+    assert 1 < servidor.max_activas <= 4
+    assert len(servidor.conexiones) <= 4
+    print(f"✅ 13 páginas, hasta {servidor.max_activas} a la vez por {len(servidor.conexiones)} conexiones")
+
+
+def test_cliente_limitador_y_errores():
+    print("🧪 PROBANDO LIMITADOR Y ERRORES DE CONEXIÓN")
+    servidor = ServidorGrabado()
+    try:
+        with ClienteHttp(concurrencia=4, limitador=LimitadorPorHost(20)) as cliente:
+            inicio = time.perf_counter()
+            cliente.descargar([f'{servidor.url}/search/wines?q=albarino&page=1&n={n}' for n in range(5)])
+            duracion = time.perf_counter() - inicio
+    finally:
+        servidor.cerrar()
+    # Turnos separados 50 ms aunque haya 4 conexiones libres
+    assert duracion >= 0.19
+
+    # Nadie escuchando: la respuesta lleva el error en lugar de romper la tanda
+    with ClienteHttp(timeout=1) as cliente:
+        respuesta = cliente.descargar([servidor.url + '/cerrado'])[servidor.url + '/cerrado']
+    assert respuesta.estado is None and respuesta.error is not None
+    print(f"✅ 5 peticiones a 20/s en {duracion * 1000:.0f} ms; conexión rechazada sin excepción")
+
+
+def test_api_explorar():
+    print("🧪 PROBANDO LA API JSON DE EXPLORACIÓN")
+    assert url_api_explorar('https://www.vivino.com/explore?wine_type_ids%5B%5D=2&page=3') == \
+        'https://www.vivino.com/api/explore/explore?wine_type_ids%5B%5D=2&page=3'
+    # Filtros codificados en e= o páginas que no son de exploración: sin API
+    assert url_api_explorar('https://www.vivino.com/explore?e=eJzLLbI1&page=1') is None
+    assert url_api_explorar('https://www.vivino.com/search/wines?q=rueda') is None
+
+    tarjetas = tarjetas_api(API_EXPLORAR)
+    assert [url for _, url in tarjetas] == ['https://www.vivino.com/w/1141133?year=2022',
+                                            'https://www.vivino.com/w/1275431?year=2021']
+    assert tarjetas[0][0] == 'José Pariente Verdejo 2022 Rueda España 4.1 2345 valoraciones 11.90 €'
+    assert tarjetas_api(API_VACIA) == [] and tarjetas_api(None) == []
+    print("✅ URLs de la API y tarjetas con el texto que entiende extraer_vino")
+
+
+def test_motor_http_con_navegador_de_respaldo():
+    print("🧪 PROBANDO MOTOR POR HTTP CON NAVEGADOR SOLO PARA LAS PÁGINAS CON JS")
+    servidor = ServidorGrabado()
+    busqueda = f'{servidor.url}/search/wines?q=albarino'
+    explorar = f'{servidor.url}/explore?wine_type_ids%5B%5D=2'
+    # Lo que ve el navegador tras ejecutar el JS de la página 2 de la búsqueda
+    renderizadas = {url_pagina(busqueda, 2): pagina_html(
+        tarjeta(103, 'Terras Gauda O Rosal 2022 Rías Baixas España 4,1 800 valoraciones 16,00 €'))}
+    cargas = []
+    config = ConfiguracionScraping(carpeta=tempfile.mkdtemp(), prefijo='prueba', http=True, concurrencia=1,
+                                   timeout_carga=0.05, estable=0, peticiones_por_segundo=None)
+    motor = MotorScraping(config, session_id='http', crear_driver=lambda: DriverFalso(renderizadas, cargas))
+    try:
+        datos = motor.ejecutar([FuentePaginacion(busqueda, 2, 'Albariño', 'Blanco'),
+                                FuentePaginacion(explorar, 3, 'Blancos', 'Blanco')])
+    finally:
+        servidor.cerrar()
+
+    # Solo la página que necesita JS pasa por el navegador
+    assert cargas == [url_pagina(busqueda, 2)]
+    assert motor.paginas_http == 3 and motor.pool.creados == 1
+    assert sorted(v['url'].split('/w/')[1] for v in datos) == ['101', '102', '103', '1141133?year=2022',
+                                                                '1275431?year=2021']
+    verdejo = next(v for v in datos if 'Verdejo' in v['nombre_completo'])
+    assert verdejo['precio_eur'] == 11.9 and verdejo['rating'] == 4.1 and verdejo['num_reviews'] == 2345
+    assert verdejo['region'] == 'Rueda' and verdejo['año'] == 2022 and verdejo['tipo_vino'] == 'Blanco'
+    # La API vacía en la página 2 agota el listado: la 3 no se registra
+    assert url_pagina(explorar, 3) not in motor.paginas_completadas
+    assert motor.listados_agotados[explorar] == 2
+    print(f"✅ {len(datos)} vinos: {motor.paginas_http} páginas por HTTP y 1 con navegador")
+
+
+def test_motor_http_para_al_completar():
+    print("🧪 PROBANDO QUE EL MOTOR HTTP NO PIDE PÁGINAS QUE YA NO HACEN FALTA")
+    servidor = ServidorGrabado()
+    busqueda = f'{servidor.url}/search/wines?q=albarino'
+    explorar = f'{servidor.url}/explore?wine_type_ids%5B%5D=2'
+
+    def motor(**opciones):
+        config = ConfiguracionScraping(carpeta=tempfile.mkdtemp(), prefijo='prueba', http=True, concurrencia_http=2,
+                                       timeout_carga=0.05, estable=0, peticiones_por_segundo=None, **opciones)
+        return MotorScraping(config, session_id='tandas', crear_driver=lambda: DriverFalso({}, []))
+
+    try:
+        # La API vacía en la página 2 agota el listado: de 6 páginas solo se piden la primera tanda
+        motor().ejecutar([FuentePaginacion(explorar, 6, 'Blancos', 'Blanco')])
+        assert len(servidor.rutas) == 2
+        # Con max_vinos alcanzado en la primera tanda, el resto de fuentes no se pide
+        del servidor.rutas[:]
+        datos = motor(max_vinos=2).ejecutar([FuentePaginacion(explorar, 6, 'Blancos', 'Blanco'),
+                                             FuentePaginacion(busqueda, 4, 'Albariño', 'Blanco')])
+    finally:
+        servidor.cerrar()
+    assert len(datos) == 2 and len(servidor.rutas) == 2
+    assert not any('/search/' in ruta for ruta in servidor.rutas)
+    print("✅ Tandas cortadas por listado agotado y por max_vinos")
+
+
+if __name__ == "__main__":
+    test_cliente_concurrente_keep_alive()
+    test_cliente_limitador_y_errores()
+    test_api_explorar()
+    test_motor_http_con_navegador_de_respaldo()
+    test_motor_http_para_al_completar()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Script para probar la limpieza de nombres y años y la preparación del dataset
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dataset_vinos import calcular_nombres_limpios, limpiar_año, limpiar_nombre_vino, preparar_dataset
+
+# Resultados de la versión original (un re.sub por expresión y por región)
+NOMBRES = {
+    # Regiones: la más larga gana aunque contenga otra palabra del nombre
+    'Pesquera Crianza Ribera del Duero 2019': 'Pesquera Crianza',
+    'Matarromera Duero Reserva 2018': 'Matarromera Duero Reserva',
+    'Borsao Tres Picos 20% descuento Campo de Borja': 'Borsao Tres Picos',
+    'Martín Códax Albariño RÍAS BAIXAS $12.90': 'Martín Códax Albariño',
+    'El Pinto Toro Toro 2017': 'Pinto',
+    # Precios, puntuaciones, volúmenes y ofertas
+    'Marqués de Riscal Reserva Rioja 2018 €18,50': 'Marqués Riscal Reserva',
+    'Vega Sicilia Único 2011 97,5 puntos': 'Vega Sicilia Único',
+    'Viña Pomal Centenario 750 ml 2019': 'Viña Pomal Centenario',
+    'Juan Gil Monastrell 75 cl Jumilla': 'Juan Gil Monastrell',
+    'Ramón Bilbao Edición Limitada AHORRA15% 2020': 'Ramón Bilbao Edición Limitada',
+    # Bodega, comas y longitud
+    'Clos Mogador Bodega Priorat': 'Clos Mogador',
+    'Bodegas Muga Reserva': 'Bodegas Muga Reserva',
+    'Mas Doix Priorat, Costers': 'Mas Doix Costers',
+    'Un nombre de vino extraordinariamente largo que supera sin duda los cincuenta caracteres':
+        'nombre vino extraordinariamente largo que supera s...',
+    'Ab': 'Vino seleccionado',
+}
+
+
+def test_limpiar_nombre_y_año():
+    print("🧪 PROBANDO LIMPIEZA DE NOMBRES Y AÑOS")
+    for nombre, esperado in NOMBRES.items():
+        assert limpiar_nombre_vino(nombre) == esperado, (nombre, limpiar_nombre_vino(nombre))
+    assert limpiar_nombre_vino(np.nan) == limpiar_nombre_vino(None) == 'Vino sin nombre'
+
+    assert limpiar_año(2019.0) == limpiar_año('2019') == limpiar_año(2019.7) == 2019
+    assert limpiar_año(np.nan) == limpiar_año(None) == limpiar_año('N/A') == 'N/A'
+
+    # Una llamada por nombre distinto; los nulos quedan como 'Vino seleccionado'
+    nombres = pd.Series(list(NOMBRES) * 2 + [np.nan])
+    limpios = calcular_nombres_limpios(nombres)
+    assert list(limpios[:len(NOMBRES)]) == list(NOMBRES.values()) and limpios.iloc[-1] == 'Vino seleccionado'
+    print(f"✅ {len(NOMBRES)} nombres limpios como en la versión original")
+
+
+def test_preparar_dataset():
+    print("🧪 PROBANDO PREPARACIÓN DEL DATASET")
+    df = pd.DataFrame({
+        'nombre_completo': ['Pesquera Crianza Ribera del Duero 2019', 'Bodegas Muga Reserva', np.nan],
+        'bodega': ['Pesquera', 'Muga', 'Anónima'],
+        'región': ['Ribera del Duero', 'Rioja', None],
+        'año': [2019.0, np.nan, '2020'],
+        'precio_eur': [25.0, 18.5, 9.9],
+    })
+    preparado = preparar_dataset(df)
+    assert list(preparado['nombre_limpio']) == ['Pesquera Crianza', 'Bodegas Muga Reserva', 'Vino seleccionado']
+    assert isinstance(preparado['año'].dtype, pd.Int64Dtype)
+    assert preparado['año'].iloc[0] == 2019 and pd.isna(preparado['año'].iloc[1]) and preparado['año'].iloc[2] == 2020
+    assert preparado['clave_vino'].notna().all()
+    print(f"✅ Columnas: {list(preparado.columns)}")
+
+
+if __name__ == "__main__":
+    test_limpiar_nombre_y_año()
+    test_preparar_dataset()
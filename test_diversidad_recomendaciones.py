@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Script para probar la diversificación MMR de la rejilla de recomendaciones
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ranking_vinos import MatrizRanking, calcular_grupos
+
+PESOS_SIMILITUD = [0.5, 0.3, 0.2]
+
+
+def crear_dataset():
+    # Los cuatro mejores son de la misma bodega, región y tramo de precio
+    return pd.DataFrame({
+        'bodega': ['Bodega A'] * 4 + ['Bodega B', 'Bodega C', None],
+        'region': ['Rioja'] * 4 + ['Priorat', 'Rioja', 'Rueda'],
+        'precio_eur': [15.0, 15.5, 16.0, 16.5, 40.0, 25.0, np.nan],
+        'rating': [4.6, 4.55, 4.5, 4.45, 4.2, 4.1, 4.0],
+        'num_reviews': [1000.0] * 7,
+    })
+
+
+def test_grupos():
+    print("🧪 PROBANDO GRUPOS PRECALCULADOS")
+    grupos = calcular_grupos(crear_dataset())
+    assert grupos.shape == (7, 3)
+    assert grupos[0, 0] == grupos[3, 0] != grupos[4, 0] and grupos[6, 0] == -1
+    assert grupos[:, 2].tolist() == [1, 1, 1, 1, 3, 2, -1]  # tramos de categorizar_precio
+    print("✅ Bodega, región y tramo de precio codificados")
+
+
+def test_mmr_diversifica():
+    print("🧪 PROBANDO MMR")
+    ranking = MatrizRanking(crear_dataset())
+    pesos = np.array([1.0, 0, 0, 0, 0, 0])
+    posiciones = np.arange(7)
+    assert ranking.top_k(posiciones, pesos, 3).tolist() == [0, 1, 2]
+
+    diversos = ranking.diversos(posiciones, pesos, 3, PESOS_SIMILITUD, lambda_mmr=0.5)
+    assert diversos[0] == 0  # el más relevante siempre entra primero
+    assert len(set(calcular_grupos(crear_dataset())[diversos, 0].tolist())) == 3, diversos
+    # λ = 1 es el ranking puro
+    assert ranking.diversos(posiciones, pesos, 3, PESOS_SIMILITUD, lambda_mmr=1.0).tolist() == [0, 1, 2]
+    # Determinista: la misma consulta devuelve siempre la misma selección
+    assert ranking.diversos(posiciones, pesos, 3, PESOS_SIMILITUD, lambda_mmr=0.5).tolist() == diversos.tolist()
+    assert len(ranking.diversos(posiciones, pesos, 10, PESOS_SIMILITUD)) == 7
+    print(f"✅ Selección diversa: {diversos.tolist()}")
+
+
+def test_sin_resultados_determinista():
+    print("🧪 PROBANDO VINOS VARIADOS SIN RESULTADOS")
+    import app_sommelier
+    catalogo = app_sommelier.gestor_catalogo.actual
+    if catalogo.df.empty:
+        print("❌ No hay datos de vinos")
+        return
+    primera = app_sommelier.buscar_vinos_similares(1, 2, 4.9, catalogo=catalogo)
+    segunda = app_sommelier.buscar_vinos_similares(1, 2, 4.9, catalogo=catalogo)
+    nombres = [vino['nombre_limpio'] for vino in primera]
+    assert len(primera) == 6 and nombres == [vino['nombre_limpio'] for vino in segunda]
+    print(f"✅ Siempre los mismos 6 vinos: {nombres}")
+
+
+if __name__ == "__main__":
+    test_grupos()
+    test_mmr_diversifica()
+    test_sin_resultados_determinista()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Script para probar la escritura diferida de recomendaciones (write-behind)
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from flask import Flask
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from escritura_diferida import EscrituraDiferida
+from models import WineRecommendation, db
+
+
+def crear_app():
+    """App mínima con SQLite temporal en lugar de la base de datos de Neon"""
+    app = Flask(__name__)
+    ruta = os.path.join(tempfile.mkdtemp(), 'recomendaciones.sqlite3')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{ruta}'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def fila(i):
+    return {'id': str(uuid.uuid4()), 'user_id': 'usuario-1', 'precio_min': 10.0, 'precio_max': 20.0 + i,
+            'rating_min': 4.0, 'gusto': 'equilibrado', 'prediccion': 'Muy Bueno', 'confianza': 80.0,
+            'vinos_recomendados': '[]', 'created_at': datetime.utcnow()}
+
+
+def contar(app):
+    with app.app_context():
+        return db.session.query(WineRecommendation).count()
+
+
+def test_lotes_y_vaciado_al_parar():
+    print("🧪 PROBANDO INSERCIÓN POR LOTES")
+    app = crear_app()
+    escritura = EscrituraDiferida(app, db, WineRecommendation, max_lote=4, intervalo=0.05)
+    for i in range(10):
+        assert escritura.encolar(fila(i))
+    for _ in range(100):
+        if escritura.escritas == 10:
+            break
+        time.sleep(0.01)
+    assert contar(app) == 10 and escritura.lotes < 10  # lotes, no una fila por INSERT
+
+    # Lo que queda en la cola al parar también se guarda
+    escritura.intervalo = 5.0
+    for i in range(3):
+        escritura.encolar(fila(i))
+    escritura.detener()
+    assert contar(app) == 13 and escritura.pendientes() == 0
+    print(f"✅ {escritura.escritas} filas en {escritura.lotes} lotes")
+
+
+def test_nunca_bloquea():
+    print("🧪 PROBANDO COLA LLENA Y ERRORES")
+    app = crear_app()
+    escritura = EscrituraDiferida(app, db, WineRecommendation, max_lote=2, intervalo=0.01, max_pendientes=3)
+    bloqueo = threading.Event()
+    insertar = escritura._insertar
+    escritura._insertar = lambda lote: (bloqueo.wait(), insertar(lote))
+
+    inicio = time.perf_counter()
+    aceptadas = sum(escritura.encolar(fila(i)) for i in range(20))
+    assert time.perf_counter() - inicio < 0.5
+    assert aceptadas < 20 and escritura.descartadas == 20 - aceptadas
+
+    bloqueo.set()
+    for _ in range(100):
+        if escritura.pendientes() == 0:
+            break
+        time.sleep(0.01)
+    # Un lote que falla (falta user_id) no detiene el hilo
+    assert escritura.encolar({'id': str(uuid.uuid4())})
+    time.sleep(0.05)
+    assert escritura.encolar(fila(99))
+    escritura.detener()
+    assert escritura.fallidas >= 1 and contar(app) == escritura.escritas >= 1
+    print(f"✅ {escritura.estadisticas()}")
+
+
+def test_sommelier_encola():
+    print("🧪 PROBANDO /sommelier CON USUARIO")
+    import app_sommelier
+    encoladas = []
+    original = app_sommelier.escritura_recomendaciones.encolar
+    app_sommelier.escritura_recomendaciones.encolar = encoladas.append
+    try:
+        cliente = app_sommelier.app.test_client()
+        formulario = {'precio_min': '10', 'precio_max': '25', 'rating_min': '4.0', 'gusto': 'premium'}
+        cliente.post('/sommelier', data=formulario)
+        assert encoladas == []  # sin sesión no se guarda nada
+        with cliente.session_transaction() as sesion:
+            sesion['user_id'] = 'usuario-1'
+        assert cliente.post('/sommelier', data=formulario).status_code == 200
+        if not encoladas:
+            print("❌ Modelo Sommelier no disponible: se prueba guardar_recomendacion directamente")
+            vinos = [{'clave_vino': 1, 'nombre_limpio': 'Vino', 'precio_eur': 12.5, 'rating': 4.2}]
+            app_sommelier.guardar_recomendacion('usuario-1', 10.0, 25.0, 4.0, 'general', 'premium',
+                                                'Muy Bueno', 81.5, vinos)
+    finally:
+        app_sommelier.escritura_recomendaciones.encolar = original
+    guardada = encoladas[0]
+    assert guardada['user_id'] == 'usuario-1' and guardada['gusto'] == 'premium'
+    assert set(guardada) <= set(WineRecommendation.__table__.columns.keys())
+    print(f"✅ Recomendación encolada: {guardada['prediccion']} ({guardada['confianza']:.1f}%)")
+
+
+if __name__ == "__main__":
+    test_lotes_y_vaciado_al_parar()
+    test_nunca_bloquea()
+    test_sommelier_encola()
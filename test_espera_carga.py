@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Script para probar la espera de carga sin pausas fijas
+"""
+
+import os
+import sys
+import time
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from espera_carga import JS_CONTAR_VINOS, JS_SCROLL_FINAL, EsperaCarga
+
+
+class ListadoSimulado:
+    """Listado con carga diferida: 24 vinos tras `retraso` s y 24 más por scroll, hasta `total`"""
+
+    def __init__(self, retraso=0.2, retraso_scroll=0.1, total=72):
+        self.retraso = retraso
+        self.retraso_scroll = retraso_scroll
+        self.total = total
+        self.cargado_en = None
+        self.scrolls = []
+
+    def get(self, url):
+        self.cargado_en = time.monotonic()
+        self.scrolls = []
+
+    def execute_script(self, script):
+        ahora = time.monotonic()
+        if script == JS_SCROLL_FINAL:
+            self.scrolls.append(ahora)
+            return None
+        assert script == JS_CONTAR_VINOS
+        if self.retraso is None or ahora - self.cargado_en < self.retraso:
+            return 0
+        extra = sum(24 for t in self.scrolls if ahora - t >= self.retraso_scroll)
+        return min(self.total, 24 + extra)
+
+
+def test_espera_sin_pausas_fijas():
+    print("🧪 PROBANDO ESPERA POR VINOS ESTABLES Y SCROLL")
+    driver = ListadoSimulado()
+    espera = EsperaCarga(timeout=5, estable=0.3, sondeo=0.02, max_scrolls=8,
+                         referencia_inicial=8.0, referencia_scroll=2.5)
+    inicio = time.monotonic()
+    vinos = espera.cargar(driver, 'https://www.vivino.com/explore')
+    duracion = time.monotonic() - inicio
+    assert vinos == 72
+    # Dos scrolls traen vinos nuevos y el tercero no: ahí se para
+    assert len(driver.scrolls) == 3
+    assert duracion < 2.0
+    resumen = espera.imprimir_resumen()
+    assert resumen['paginas'] == 1 and resumen['segundos_pausas_fijas'] == 8.0 + 3 * 2.5
+    assert resumen['segundos_ahorrados'] > 13
+    print(f"✅ {vinos} vinos en {duracion:.2f} s con {len(driver.scrolls)} scrolls")
+
+
+def test_pagina_sin_vinos():
+    print("🧪 PROBANDO PÁGINA QUE NUNCA CARGA VINOS")
+    driver = ListadoSimulado(retraso=None)
+    espera = EsperaCarga(timeout=0.2, estable=0.1, sondeo=0.02)
+    inicio = time.monotonic()
+    assert espera.cargar(driver, 'https://www.vivino.com/explore') == 0
+    assert time.monotonic() - inicio < 1.0 and not driver.scrolls
+    print("✅ Se rinde tras el timeout sin hacer scroll")
+
+
+if __name__ == "__main__":
+    test_espera_sin_pausas_fijas()
+    test_pagina_sin_vinos()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Script para probar el esquema tipado y el formato binario del pipeline
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from esquema_vinos import guardar_dataset, leer_dataset, pyarrow_disponible, ruta_binaria
+
+
+def crear_dataset():
+    return pd.DataFrame({
+        'nombre_vino': ['Viña Uno', None, 'Viña Tres'],
+        'año': [2019.0, None, 2021.0],
+        'pagina': [1.0, 2.0, None],
+        'num_reviews': ['120', '35', 'n/d'],
+        'precio_eur': ['12.5', 20, None],
+        'session_id': [20250716, '20250716_125646', None],
+    })
+
+
+def test_tipos_del_esquema():
+    print("🧪 PROBANDO ESQUEMA TIPADO")
+    ruta = Path(tempfile.mkdtemp()) / 'etapa.csv'
+    escritos = guardar_dataset(crear_dataset(), ruta)
+    assert ruta in escritos
+
+    df = leer_dataset(ruta)
+    assert str(df['año'].dtype) == 'Int64' and df['año'].tolist()[0] == 2019
+    assert str(df['pagina'].dtype) == 'Int64' and df['pagina'].isna().tolist() == [False, False, True]
+    assert df['num_reviews'].isna().tolist() == [False, False, True]
+    assert df['precio_eur'].dtype == 'float64'
+    assert df['session_id'].tolist()[:2] == ['20250716', '20250716_125646']
+    print(f"✅ Tipos: {df.dtypes.astype(str).to_dict()}")
+
+
+def test_copia_binaria():
+    print("🧪 PROBANDO COPIA BINARIA")
+    ruta = Path(tempfile.mkdtemp()) / 'etapa.csv'
+    # pyarrow está en requirements.txt: la copia binaria siempre se escribe
+    assert pyarrow_disponible(), "falta pyarrow (pip install -r requirements.txt)"
+    escritos = guardar_dataset(crear_dataset(), ruta)
+    binaria = ruta_binaria(ruta)
+    assert binaria in escritos
+    pd.testing.assert_frame_equal(leer_dataset(ruta), leer_dataset(binaria))
+    parquet = guardar_dataset(crear_dataset(), ruta, exportar_csv=False, formato='parquet')[0]
+    pd.testing.assert_frame_equal(leer_dataset(parquet), leer_dataset(binaria))
+
+    # Un CSV editado después de la copia binaria tiene prioridad
+    os.utime(binaria, (1, 1))
+    pd.DataFrame({'año': [1999]}).to_csv(ruta, index=False)
+    assert leer_dataset(ruta)['año'].tolist() == [1999]
+    print(f"✅ {binaria.name} leído en lugar del CSV")
+
+
+if __name__ == "__main__":
+    test_tipos_del_esquema()
+    test_copia_binaria()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Script para probar los histogramas acumulados de facetas y /api/facetas
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cache_recomendaciones import normalizar_consulta
+from facetas_vinos import FacetasVinos
+from indice_vinos import IndiceVinos
+
+
+def crear_dataset():
+    return pd.DataFrame({
+        'precio_eur': [10.0, 10.5, 12.25, 20.0, 150.0, np.nan, 15.0],
+        'rating': [4.1, 4.15, 4.0, 4.5, 4.8, 4.9, 3.2],
+        'tipo_vino': ['Tinto', 'Blanco', 'Tinto', None, 'Tinto', 'Tinto', 'Blanco'],
+        'region': ['Rioja', 'Rueda', 'Rioja', 'Priorat', None, 'Rioja', 'Rueda'],
+        'año': pd.array([2020, 2021, 2020, None, 2015, 2019, 2022], dtype='Int64'),
+    })
+
+
+def test_conteos_exactos():
+    print("🧪 PROBANDO CONTEOS EN LOS LÍMITES")
+    facetas = FacetasVinos(crear_dataset())
+    # Límites inclusivos justo sobre precios y ratings del dataset
+    conteos = facetas.conteos(10.0, 20.0, 4.1)
+    assert conteos['total'] == 3  # 10.0/4.1, 10.5/4.15, 20.0/4.5
+    assert conteos['tipo_vino'] == [{'valor': 'Tinto', 'total': 1}, {'valor': 'Blanco', 'total': 1}]
+    assert conteos['region'] == [{'valor': 'Rioja', 'total': 1}, {'valor': 'Rueda', 'total': 1},
+                                 {'valor': 'Priorat', 'total': 1}]
+    assert facetas.conteos(10.0, 20.0, 4.1, 'Tinto')['total'] == 1
+    assert facetas.conteos(10.0, 20.0, 4.1, 'Espumoso')['total'] == 0
+    assert facetas.conteos(20.0, 10.0, 4.0)['total'] == 0
+    # Por encima del tope de la rejilla
+    assert facetas.conteos(10.0, 200.0, 4.0)['total'] == 5
+
+    # Posiciones de los sliders
+    valores = facetas.eje_precio.rejilla.tolist()
+    assert conteos['precio_max']['conteos'][valores.index(10.0)] == 1
+    assert conteos['precio_max']['conteos'][valores.index(10.5)] == 2
+    assert conteos['precio_min']['conteos'][valores.index(10.5)] == 2
+    ratings = facetas.eje_rating.rejilla.tolist()
+    assert conteos['rating_min']['conteos'][ratings.index(4.15)] == 2
+    print(f"✅ €10-20, rating ≥4.1: {conteos['total']} vinos")
+
+
+def test_igual_que_indice():
+    print("🧪 PROBANDO CONTRA IndiceVinos")
+    import app_sommelier
+    df = app_sommelier.gestor_catalogo.actual.df
+    if df.empty:
+        print("❌ No hay datos de vinos")
+        return
+    facetas, indice = FacetasVinos(df), IndiceVinos(df)
+    aleatorio = random.Random(7)
+    for _ in range(200):
+        precio_min, precio_max, rating_min, tipo_vino, _ = normalizar_consulta(
+            aleatorio.uniform(0, 60), aleatorio.uniform(0, 120), aleatorio.uniform(3.8, 5.0),
+            aleatorio.choice(['Todos', 'Tinto', 'Blanco']))
+        conteos = facetas.conteos(precio_min, precio_max, rating_min, tipo_vino)
+        posiciones = indice.consultar(precio_min, precio_max, rating_min, tipo_vino)
+        assert conteos['total'] == len(posiciones)
+        esperado = df['region'].take(posiciones).value_counts().to_dict()
+        assert {r['valor']: r['total'] for r in conteos['region']} == esperado
+        k = aleatorio.randrange(len(facetas.eje_precio.rejilla))
+        precio = facetas.eje_precio.rejilla[k]
+        assert conteos['precio_max']['conteos'][k] == len(indice.consultar(precio_min, precio, rating_min, tipo_vino))
+    print("✅ 200 consultas idénticas a IndiceVinos.consultar")
+
+
+def test_endpoint_facetas():
+    print("🧪 PROBANDO /api/facetas")
+    import app_sommelier
+    cliente = app_sommelier.app.test_client()
+    datos = cliente.get('/api/facetas?precio_min=10&precio_max=30&rating_min=4.1&tipo_vino=tinto').get_json()
+    assert datos['consulta'] == {'precio_min': 10.0, 'precio_max': 30.0, 'rating_min': 4.1, 'tipo_vino': 'Tinto'}
+    assert datos['total'] == sum(t['total'] for t in datos['tipo_vino'] if t['valor'] == 'Tinto')
+    assert len(datos['precio_min']['valores']) == len(datos['precio_min']['conteos'])
+    # Sliders con texto o valores no finitos: 400 con el error, no un 500
+    for consulta in ('precio_min=abc', 'precio_max=nan', 'rating_min=inf'):
+        respuesta = cliente.get(f'/api/facetas?{consulta}')
+        assert respuesta.status_code == 400 and 'error' in respuesta.get_json()
+    print(f"✅ {datos['total']} tintos de €10-30 con rating ≥4.1")
+
+
+if __name__ == "__main__":
+    test_conteos_exactos()
+    test_igual_que_indice()
+    test_endpoint_facetas()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Script para probar el ejecutor acotado de bcrypt y el coste configurable
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+from flask import Flask
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config_sommelier import Config, TestingConfig
+from hash_contrasenas import EjecutorHash, ServicioSaturado
+from models import User, bcrypt
+
+
+def test_rechazo_inmediato_al_saturarse():
+    print("🧪 PROBANDO EJECUTOR SATURADO")
+    ejecutor = EjecutorHash(max_hilos=1, max_cola=1, timeout=5.0)
+    liberar = threading.Event()
+    hilos = [threading.Thread(target=ejecutor.ejecutar, args=(liberar.wait,)) for _ in range(2)]
+    for hilo in hilos:
+        hilo.start()
+    time.sleep(0.05)  # uno calculando y otro en cola
+
+    inicio = time.perf_counter()
+    try:
+        ejecutor.ejecutar(lambda: 'no llega')
+        assert False, "debería rechazarse"
+    except ServicioSaturado:
+        pass
+    assert time.perf_counter() - inicio < 0.05 and ejecutor.rechazadas == 1
+
+    liberar.set()
+    for hilo in hilos:
+        hilo.join()
+    assert ejecutor.ejecutar(lambda x: x * 2, 21) == 42  # las plazas se liberan
+    print("✅ Rechazo inmediato con el ejecutor lleno")
+
+
+def test_timeout():
+    print("🧪 PROBANDO TIMEOUT")
+    ejecutor = EjecutorHash(max_hilos=1, max_cola=0, timeout=0.05)
+    try:
+        ejecutor.ejecutar(time.sleep, 0.3)
+        assert False, "debería rechazarse"
+    except ServicioSaturado:
+        pass
+    # La plaza sigue ocupada hasta que el cálculo termina de verdad
+    try:
+        ejecutor.ejecutar(lambda: None)
+        assert False, "debería rechazarse"
+    except ServicioSaturado:
+        pass
+    time.sleep(0.35)
+    assert ejecutor.ejecutar(lambda: 'ok') == 'ok'
+    print("✅ Operaciones lentas rechazadas sin perder plazas")
+
+
+def test_coste_configurable():
+    print("🧪 PROBANDO COSTE DE BCRYPT")
+    app = Flask(__name__)
+    app.config.from_object(TestingConfig)
+    bcrypt.init_app(app)
+    try:
+        with app.app_context():
+            usuario = User('Ana@Ejemplo.com ', 'secreta123', 'Ana', 'Pérez', date(1990, 1, 1))
+            assert usuario.password_hash.startswith('$2b$04$')  # coste de TestingConfig
+            assert usuario.check_password('secreta123')
+            assert not usuario.check_password('otra')
+    finally:
+        bcrypt.init_app(Flask(__name__))  # vuelve al coste por defecto
+    print(f"✅ Hash con coste {TestingConfig.BCRYPT_LOG_ROUNDS}: {usuario.password_hash[:7]}...")
+
+
+def test_gunicorn_con_hilos():
+    print("🧪 PROBANDO QUE EL DESPLIEGUE PUEDE LLENAR EL EJECUTOR")
+    dockerfile = Path(__file__).parent / 'Dockerfile'
+    cmd = json.loads(next(linea for linea in dockerfile.read_text().splitlines() if linea.startswith('CMD '))[4:])
+    # Con workers síncronos (una petición por proceso) el límite nunca se alcanzaría
+    assert cmd[cmd.index('--worker-class') + 1] == 'gthread'
+    hilos = int(cmd[cmd.index('--threads') + 1])
+    assert hilos > Config.HASH_MAX_HILOS + Config.HASH_MAX_COLA
+    print(f"✅ gthread con {hilos} hilos para {Config.HASH_MAX_HILOS + Config.HASH_MAX_COLA} plazas de bcrypt")
+
+
+if __name__ == "__main__":
+    test_rechazo_inmediato_al_saturarse()
+    test_timeout()
+    test_coste_configurable()
+    test_gunicorn_con_hilos()
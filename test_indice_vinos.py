@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Script para comprobar que el índice columnar filtra igual que el DataFrame
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config_sommelier import get_config
+from indice_vinos import IndiceVinos
+
+
+def filtrar_con_mascaras(df, precio_min, precio_max, rating_min, tipo_vino):
+    """Semántica original de buscar_vinos_similares"""
+    filtrados = df[
+        (df['precio_eur'] >= precio_min) &
+        (df['precio_eur'] <= precio_max) &
+        (df['rating'] >= rating_min)
+    ]
+    if tipo_vino and tipo_vino != "Todos":
+        filtrados = filtrados[filtrados['tipo_vino'] == tipo_vino]
+    return filtrados
+
+
+def test_indice_equivale_a_mascaras():
+    print("🧪 PROBANDO ÍNDICE COLUMNAR DE VINOS")
+    config = get_config('development')
+    if not config.LATEST_CSV:
+        print("❌ No se encontró archivo de datos")
+        return
+
+    df = pd.read_csv(config.LATEST_CSV)
+    indice = IndiceVinos(df)
+    aleatorio = np.random.RandomState(7)
+    tipos = ['Todos', None, 'Tinto', 'Blanco', 'Rosado']
+
+    for _ in range(300):
+        precio_min = float(aleatorio.choice([0, 5, 10, 15, 20, 34.95, 50]))
+        precio_max = precio_min + float(aleatorio.choice([0, 5, 10, 25, 100]))
+        rating_min = float(aleatorio.choice([3.5, 4.0, 4.1, 4.2, 4.526]))
+        tipo_vino = tipos[aleatorio.randint(len(tipos))]
+
+        esperado = filtrar_con_mascaras(df, precio_min, precio_max, rating_min, tipo_vino)
+        posiciones = indice.consultar(precio_min, precio_max, rating_min, tipo_vino)
+        assert list(df.index[posiciones]) == list(esperado.index), (precio_min, precio_max, rating_min, tipo_vino)
+
+    print(f"✅ 300 consultas idénticas al filtrado por máscaras ({len(indice)} vinos indexados)")
+
+
+if __name__ == "__main__":
+    test_indice_equivale_a_mascaras()
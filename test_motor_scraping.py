@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Script para probar el motor común de scraping sin navegador ni red
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from espera_carga import JS_CONTAR_VINOS
+from motor_scraping import (ConfiguracionScraping, FuenteCategorias, FuentePaginacion, FuenteRegiones,
+                            FuenteVarietales, MotorScraping, extraer_vino, tarjetas_vino, url_pagina)
+
+
+def tarjeta(id_vino, texto):
+    return f'<div class="card"><a href="/w/{id_vino}">{texto}</a></div>'
+
+
+def pagina_html(*tarjetas):
+    return '<html><body><a href="/explore?page=2">Página siguiente</a>' + ''.join(tarjetas) + '</body></html>'
+
+
+class DriverFalso:
+    """Lo justo de un webdriver para el motor: get, page_source, scripts y find_elements"""
+
+    def __init__(self, paginas, cargas):
+        self.paginas = paginas
+        self.cargas = cargas
+        self.caido = False
+        self.page_source = ''
+
+    def get(self, url):
+        if self.caido:
+            raise RuntimeError("chrome not reachable")
+        self.cargas.append(url)
+        self.page_source = self.paginas.get(url, pagina_html())
+
+    def execute_script(self, script):
+        if self.caido:
+            raise RuntimeError("invalid session id")
+        if script == JS_CONTAR_VINOS:
+            return self.page_source.count('/w/')
+
+    def find_elements(self, by, selector):
+        return []
+
+    def quit(self):
+        pass
+
+
+def crear_motor(paginas, cargas, carpeta, session_id='prueba', crear_driver=None, **opciones):
+    config = ConfiguracionScraping(carpeta=carpeta, prefijo='prueba', timeout_carga=0.05,
+                                   estable=0, peticiones_por_segundo=None, **opciones)
+    return MotorScraping(config, session_id=session_id,
+                         crear_driver=crear_driver or (lambda: DriverFalso(paginas, cargas)))
+
+
+def test_extraer_vino():
+    print("🧪 PROBANDO EXTRACCIÓN DE UNA TARJETA")
+    vino = extraer_vino('Bodegas Muga Reserva 2019 Rioja, España 4,2 1.234 valoraciones 22,00 € 18,50 €')
+    assert vino['precio_eur'] == 18.5 and vino['precio_original'] == 22.0 and vino['descuento'] == 15.9
+    assert vino['rating'] == 4.2 and vino['num_reviews'] == 1234
+    assert vino['año'] == 2019 and vino['region'] == 'Rioja' and vino['bodega'] == 'Bodegas Muga'
+    assert vino['categoria_calidad'] == 'Reserva' and vino['tipo_vino'] == 'Tinto'
+
+    vino = extraer_vino('Martín Códax Albariño 2022 Rías Baixas España 4.0 (532 ratings) €12.90', 'Blanco')
+    assert vino['precio_eur'] == 12.9 and vino['rating'] == 4.0 and vino['num_reviews'] == 532
+    assert vino['region'] == 'Rías Baixas' and vino['tipo_vino'] == 'Blanco'
+    # 'Castilla y León' no se queda en 'Castilla'; 'España' solo si no hay región concreta
+    assert extraer_vino('Abadía Retuerta Castilla y León 25 €')['region'] == 'Castilla y León'
+    assert extraer_vino('Vino de mesa España 5 €')['region'] == 'España'
+    print("✅ Precio, rebaja, rating, reviews, añada, región y bodega correctos")
+
+
+def test_tarjetas_vino():
+    print("🧪 PROBANDO LOCALIZACIÓN DE TARJETAS")
+    html = pagina_html(
+        tarjeta(1, 'Protos Verdejo 2022 Rueda 4,0 300 valoraciones 11,50 €'),
+        tarjeta(1, 'Protos Verdejo 2022 Rueda 4,0 300 valoraciones 11,50 €'),  # duplicada
+        tarjeta(2, 'Sin precio ni nada interesante aquí'),
+        tarjeta(3, 'Corto 5 €'),
+        tarjeta(4, 'Ver página siguiente de vinos 10 €'),
+        tarjeta(5, 'Pesquera Crianza 2020 Ribera del Duero 4,1 900 valoraciones 21 €'),
+    )
+    tarjetas = tarjetas_vino(html)
+    assert [url for _, url in tarjetas] == ['https://www.vivino.com/w/1', 'https://www.vivino.com/w/5']
+    assert len(tarjetas_vino(html, max_vinos=1)) == 1
+    print(f"✅ {len(tarjetas)} tarjetas válidas de 6 enlaces")
+
+
+def test_fuentes():
+    print("🧪 PROBANDO FUENTES DE URLS")
+    assert url_pagina('https://x/explore', 2) == 'https://x/explore?page=2'
+    assert url_pagina('https://x/explore?a=1', 3) == 'https://x/explore?a=1&page=3'
+    assert url_pagina('https://x/explore?page=1&a=1', 4) == 'https://x/explore?page=4&a=1'
+
+    paginas = list(FuentePaginacion('https://x/explore', 3))
+    assert [p.numero for p in paginas] == [1, 2, 3] and len({p.listado for p in paginas}) == 1
+
+    paginas = list(FuenteCategorias([('A', 'https://x/a'), ('B', 'https://x/b')], paginas=2))
+    assert [(p.categoria, p.numero) for p in paginas] == [('A', 1), ('A', 2), ('B', 1), ('B', 2)]
+
+    regiones = list(FuenteRegiones(['Rueda'], paginas=2, tipo_vino='Blanco'))
+    assert len(regiones) == 6 and all(p.tipo_vino == 'Blanco' for p in regiones)
+    assert 'region_ids%5B%5D=55' in regiones[0].url and 'wine_type_ids%5B%5D=2' in regiones[0].url
+    assert 'q=Rueda+blanco' in regiones[2].url
+
+    varietales = list(FuenteVarietales(['Tempranillo Blanco'], paginas=1))
+    assert varietales[0].categoria == 'Tempranillo Blanco_varietal'
+    assert 'q=Tempranillo+Blanco&' in varietales[0].url
+    print("✅ Paginación, categorías, regiones y varietales generan las URLs esperadas")
+
+
+def test_motor_concurrente_y_checkpoint():
+    print("🧪 PROBANDO MOTOR CONCURRENTE CON CHECKPOINT")
+    carpeta = tempfile.mkdtemp()
+    base = 'https://www.vivino.com/explore?x=1'
+    paginas = {
+        url_pagina(base, 1): pagina_html(tarjeta(1, 'Muga Reserva 2019 Rioja 4,2 100 valoraciones 20 €'),
+                                         tarjeta(2, 'Protos Verdejo 2022 Rueda 4,0 300 valoraciones 11 €')),
+        # El vino 2 se repite entre páginas: solo cuenta una vez
+        url_pagina(base, 2): pagina_html(tarjeta(2, 'Protos Verdejo 2022 Rueda 4,0 300 valoraciones 11 €'),
+                                         tarjeta(3, 'Pesquera Crianza 2020 Ribera del Duero 4,1 9 valoraciones 21 €')),
+        # La página 3 está vacía: el listado se acaba ahí
+        url_pagina(base, 5): pagina_html(tarjeta(9, 'Nunca se llega a esta página 2020 Toro 4,0 10 €')),
+    }
+    cargas = []
+    motor = crear_motor(paginas, cargas, carpeta, concurrencia=1, checkpoint_cada=1)
+    datos = motor.ejecutar([FuentePaginacion(base, 5)])
+    assert sorted(v['url'][-3:] for v in datos) == ['w/1', 'w/2', 'w/3']
+    assert url_pagina(base, 4) not in cargas and url_pagina(base, 5) not in cargas
+    assert [v['posicion_global'] for v in datos] == [1, 2, 3]
+
+    with open(motor.ruta_checkpoint(), encoding='utf-8') as f:
+        estado = json.load(f)
+    assert len(estado['datos']) == 3 and len(estado['paginas_completadas']) == 3
+
+    # Misma sesión: se reanuda sin volver a cargar las páginas hechas
+    cargas_reanudadas = []
+    motor = crear_motor(paginas, cargas_reanudadas, carpeta)
+    assert len(motor.datos_extraidos) == 3
+    motor.ejecutar([FuentePaginacion(base, 5), FuenteCategorias([('Nueva', 'https://www.vivino.com/explore?y=1')])])
+    assert cargas_reanudadas == ['https://www.vivino.com/explore?y=1&page=1']
+
+    # Varios navegadores a la vez: mismos vinos, sin duplicados y con tope de vinos
+    cargas = []
+    motor = crear_motor(paginas, cargas, tempfile.mkdtemp(), concurrencia=3, max_vinos=2)
+    datos = motor.ejecutar([FuentePaginacion(base, 2)])
+    assert len(datos) == 2 and len({v['url'] for v in datos}) == 2
+
+    archivo, historico = motor.guardar_csv()
+    assert os.path.exists(archivo) and historico is None
+    print(f"✅ Páginas deduplicadas, paginación cortada en la página vacía y sesión reanudada")
+
+
+def test_motor_recupera_navegador_caido():
+    print("🧪 PROBANDO CAÍDA DE UN NAVEGADOR A MITAD DE CRAWL")
+    base = 'https://www.vivino.com/explore?x=1'
+    paginas = {url_pagina(base, n): pagina_html(tarjeta(n, f'Vino número {n} 2020 Rioja 4,0 10 valoraciones 1{n} €'))
+               for n in range(1, 7)}
+    cargas = []
+    drivers = []
+    lock = threading.Lock()
+
+    class DriverQueSeCae(DriverFalso):
+        def get(self, url):
+            # El navegador que haga la tercera carga muere en ella (solo una vez)
+            with lock:
+                if len(cargas) == 2 and not any(d.caido for d in drivers):
+                    self.caido = True
+            super().get(url)
+
+    def crear_driver():
+        drivers.append(DriverQueSeCae(paginas, cargas))
+        return drivers[-1]
+
+    motor = crear_motor(paginas, cargas, tempfile.mkdtemp(), crear_driver=crear_driver, concurrencia=2)
+    datos = motor.ejecutar([FuentePaginacion(base, 6)])
+    assert sorted(v['pagina'] for v in datos) == [1, 2, 3, 4, 5, 6]
+    assert motor.pool.reciclados == 1 and len(drivers) == motor.pool.creados >= 2
+    print(f"✅ 6/6 páginas con {motor.pool.reciclados} navegador reciclado")
+
+
+if __name__ == "__main__":
+    test_extraer_vino()
+    test_tarjetas_vino()
+    test_fuentes()
+    test_motor_concurrente_y_checkpoint()
+    test_motor_recupera_navegador_caido()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Script para probar el perfil ligero de Chrome sin abrir ningún navegador
+"""
+
+import os
+import sys
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from espera_carga import JS_CONTAR_VINOS, EsperaCarga
+from perfil_navegador import (URLS_BLOQUEADAS, bloquear_recursos, medir_perfil, memoria_driver,
+                              memoria_procesos, opciones_chrome)
+
+
+class DriverCDP:
+    """Driver falso que apunta los comandos CDP y sirve páginas con 10 vinos"""
+
+    def __init__(self, con_cdp=True):
+        self.con_cdp = con_cdp
+        self.comandos = []
+        self.cerrado = False
+        self.page_source = ''
+
+    def execute_cdp_cmd(self, comando, parametros):
+        if not self.con_cdp:
+            raise RuntimeError("CDP no disponible en este navegador")
+        self.comandos.append((comando, parametros))
+
+    def get(self, url):
+        self.page_source = ''.join(f'<a href="/w/{n}">vino</a>' for n in range(10))
+
+    def execute_script(self, script):
+        if script == JS_CONTAR_VINOS:
+            return self.page_source.count('/w/')
+
+    def quit(self):
+        self.cerrado = True
+
+
+def test_opciones_ligero():
+    print("🧪 PROBANDO OPCIONES DEL PERFIL LIGERO")
+    ligero = opciones_chrome(ligero=True)
+    assert ligero.page_load_strategy == 'eager'
+    prefs = ligero.experimental_options['prefs']
+    assert prefs['profile.managed_default_content_settings.images'] == 2
+    assert prefs['profile.default_content_setting_values']['notifications'] == 2
+    assert '--blink-settings=imagesEnabled=false' in ligero.arguments and '--headless' in ligero.arguments
+
+    completo = opciones_chrome(headless=False, ligero=False)
+    assert completo.page_load_strategy == 'normal'
+    assert 'profile.managed_default_content_settings.images' not in completo.experimental_options['prefs']
+    assert '--headless' not in completo.arguments
+    print("✅ Ligero: eager, sin imágenes; completo: carga normal")
+
+
+def test_bloquear_recursos():
+    print("🧪 PROBANDO BLOQUEO DE RECURSOS POR CDP")
+    for patron in ('*.woff2', '*.jpg?*', '*google-analytics.com*', '*.mp4'):
+        assert patron in URLS_BLOQUEADAS
+    assert not any('vivino' in patron for patron in URLS_BLOQUEADAS)
+
+    driver = DriverCDP()
+    assert bloquear_recursos(driver)
+    assert driver.comandos == [('Network.enable', {}), ('Network.setBlockedURLs', {'urls': URLS_BLOQUEADAS})]
+    # Sin CDP (p. ej. un navegador remoto antiguo) se sigue sin bloqueo
+    assert not bloquear_recursos(DriverCDP(con_cdp=False))
+    print(f"✅ {len(URLS_BLOQUEADAS)} patrones bloqueados")
+
+
+def test_medir_perfil():
+    print("🧪 PROBANDO MEDICIÓN DE CARGA Y MEMORIA")
+    # La memoria de este mismo proceso y sus hijos, leída de /proc
+    memoria = memoria_procesos(os.getpid())
+    assert memoria is None or memoria > 0
+    assert memoria_procesos(-1) is None
+    assert memoria_driver(DriverCDP()) is None  # sin proceso de chromedriver
+
+    drivers = []
+    resultado = medir_perfil(['https://x/1', 'https://x/2'], crear=lambda: drivers.append(DriverCDP()) or drivers[-1],
+                             espera=EsperaCarga(timeout=0.05, estable=0))
+    assert resultado['paginas'] == 2 and resultado['vinos_por_pagina'] == 10
+    assert resultado['segundos_por_pagina'] < 1 and drivers[0].cerrado
+    print(f"✅ {resultado['segundos_por_pagina']} s/página; este proceso usa {memoria} MB")
+
+
+if __name__ == "__main__":
+    test_opciones_ligero()
+    test_bloquear_recursos()
+    test_medir_perfil()
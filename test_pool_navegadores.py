@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Script para probar el pool de navegadores y el limitador por host
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pool_navegadores import LimitadorPeticiones, LimitadorPorHost, PoolNavegadores
+
+
+class NavegadorFalso:
+    """Navegador que puede 'caerse': a partir de entonces ningún comando responde"""
+
+    def __init__(self, numero):
+        self.numero = numero
+        self.caido = False
+        self.cerrado = False
+
+    def execute_script(self, script):
+        if self.caido:
+            raise RuntimeError("invalid session id")
+        return 1
+
+    def quit(self):
+        self.cerrado = True
+
+
+def fabrica(creados):
+    """crear_driver que apunta los navegadores creados; los huecos del pool lo llaman desde varios hilos"""
+    lock = threading.Lock()
+
+    def crear():
+        with lock:
+            navegador = NavegadorFalso(len(creados))
+            creados.append(navegador)
+        return navegador
+    return crear
+
+
+def esperar_todos(funcion, veces):
+    hilos = [threading.Thread(target=funcion) for _ in range(veces)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return time.perf_counter() - inicio
+
+
+def test_limitadores():
+    print("🧪 PROBANDO LIMITADORES DE PETICIONES")
+    # 6 turnos separados 20 ms: el último sale a los 100 ms aunque lleguen todos a la vez
+    duracion = esperar_todos(LimitadorPeticiones(50).esperar, 6)
+    assert duracion >= 0.09
+
+    # Por host: dos sitios no comparten turnos
+    limitador = LimitadorPorHost(10)
+    urls = iter(['https://a.com/1', 'https://b.com/1', 'https://a.com/2', 'https://b.com/2'])
+    duracion_hosts = esperar_todos(lambda: limitador.esperar(next(urls)), 4)
+    assert 0.09 <= duracion_hosts < 0.25  # compartiendo turnos serían 300 ms
+    print(f"✅ Mismo host: {duracion * 1000:.0f} ms para 6; dos hosts: {duracion_hosts * 1000:.0f} ms para 2+2")
+
+
+def test_pool_reutiliza_navegadores():
+    print("🧪 PROBANDO REUTILIZACIÓN DE NAVEGADORES")
+    creados = []
+    pool = PoolNavegadores(fabrica(creados), tamaño=3)
+
+    def procesar(driver, tarea):
+        time.sleep(0.01)
+        return (driver.numero, tarea * 2)
+
+    resultados, fallidas = pool.procesar(range(20), procesar)
+    assert sorted(r[1] for _, r in resultados) == [t * 2 for t in range(20)] and not fallidas
+    # Segunda tanda con los mismos navegadores
+    pool.procesar(range(5), procesar)
+    assert len(creados) == 3 and pool.creados == 3
+    assert len({numero for _, (numero, _) in resultados}) > 1  # trabajo repartido
+    assert pool.cerrar() == 3 and all(n.cerrado for n in creados)
+    print(f"✅ 25 tareas con {len(creados)} navegadores reutilizados")
+
+
+def test_pool_recupera_caidas():
+    print("🧪 PROBANDO RECUPERACIÓN DE NAVEGADORES CAÍDOS")
+    creados = []
+    pool = PoolNavegadores(fabrica(creados), tamaño=2, max_reintentos=2)
+    caidas = {3, 7}
+    hechas = []
+    lock = threading.Lock()
+
+    def procesar(driver, tarea):
+        with lock:
+            cae = tarea in caidas
+            caidas.discard(tarea)
+        if cae:
+            # El navegador muere a mitad de página: solo la primera vez
+            driver.caido = True
+            raise RuntimeError("chrome not reachable")
+        if tarea == 9:
+            raise ValueError("página rota")  # falla siempre, sin tirar el navegador
+        hechas.append(tarea)
+        return tarea
+
+    resultados, fallidas = pool.procesar(range(12), procesar)
+    # Ninguna página se pierde por una caída; la que falla siempre se descarta tras los reintentos
+    assert sorted(hechas) == [t for t in range(12) if t != 9]
+    assert [t for t, _ in fallidas] == [9]
+    # Cada caída recicla su navegador; cuántos se abren depende de qué hilo coja cada página
+    assert pool.reciclados == 2 and len(creados) == pool.creados
+    assert all(n.cerrado for n in creados if n.caido) and sum(n.caido for n in creados) == 2
+    assert pool.reintentos == 2 + 2
+    pool.cerrar()
+    print(f"✅ {pool.reciclados} navegadores reciclados, {len(hechas)} páginas completas, 1 descartada")
+
+
+if __name__ == "__main__":
+    test_limitadores()
+    test_pool_reutiliza_navegadores()
+    test_pool_recupera_caidas()
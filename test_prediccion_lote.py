@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Script para comprobar que la predicción por lotes coincide con la individual
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app_sommelier
+from prediccion_vinos import construir_caracteristicas, predecir_calidad_lote
+from registro_modelos import ArtefactosModelo
+
+CARACTERISTICAS = [
+    'precio_eur', 'log_precio', 'rating', 'rating_normalizado', 'año', 'antiguedad',
+    'num_reviews', 'log_reviews', 'region_especifica_encoded', 'rango_precio_encoded',
+    'rango_rating_encoded', 'epoca_encoded', 'bodega_simplificada_encoded',
+    'precio_rating_ratio', 'precio_por_año',
+]
+
+
+def crear_modelo_completo(df):
+    """Modelo de 15 características entrenado sobre el propio catálogo"""
+    region = df['region'].fillna('España')
+    categorias = {
+        'region_especifica': region.where(region != 'España', 'Otras Regiones'),
+        'rango_precio': pd.Series(['Económico', 'Medio', 'Premium', 'Lujo']),
+        'rango_rating': pd.Series(['Bueno', 'Muy Bueno', 'Excelente']),
+        'epoca': pd.Series(['Millennium', 'Década 2010', 'Modernos', 'Recientes']),
+        'bodega_simplificada': df['bodega'].fillna('Desconocida').str.split().str[:2].str.join(' '),
+    }
+    label_encoders = {col: LabelEncoder().fit(valores.astype(str)) for col, valores in categorias.items()}
+    label_encoders['objetivo'] = LabelEncoder().fit(['Bueno', 'Excelente', 'Muy Bueno'])
+    info = {'caracteristicas': CARACTERISTICAS, 'label_encoders': label_encoders}
+
+    artefactos = ArtefactosModelo('completo', 'prueba', None, StandardScaler(), None, info)
+    X = construir_caracteristicas(df, artefactos)[CARACTERISTICAS].to_numpy()
+    y = np.digitize(df['rating'].to_numpy(), [4.0, 4.2])
+    artefactos.scaler.fit(X)
+    artefactos.modelo = RandomForestClassifier(n_estimators=10, random_state=0).fit(artefactos.scaler.transform(X), y)
+    return artefactos
+
+
+def test_lote_igual_que_individual():
+    print("🧪 PROBANDO PREDICCIÓN POR LOTES")
+    df = app_sommelier.df_vinos.dropna(subset=['precio_eur', 'rating', 'año']).head(80)
+    if df.empty:
+        print("❌ No hay datos de vinos")
+        return
+
+    artefactos = crear_modelo_completo(df)
+    lote = predecir_calidad_lote(df, artefactos)
+
+    get_model_original = app_sommelier.get_model
+    app_sommelier.get_model = lambda nombre, version=None: artefactos
+    try:
+        for (i, vino), (_, esperado) in zip(df.iterrows(), lote.iterrows()):
+            prediccion, confianza = app_sommelier.predecir_calidad_vino_completo(
+                vino['precio_eur'], vino['rating'], int(vino['año']),
+                vino['bodega'], vino['region'], vino['num_reviews'])
+            assert prediccion == esperado['prediccion'], (i, prediccion, esperado['prediccion'])
+            assert abs(confianza - esperado['confianza']) < 1e-9
+    finally:
+        app_sommelier.get_model = get_model_original
+    print(f"✅ {len(df)} vinos: lote idéntico a la predicción individual")
+
+
+def test_endpoint_lote_valida_entrada():
+    print("🧪 PROBANDO /api/predecir/lote")
+    cliente = app_sommelier.app.test_client()
+    respuesta = cliente.post('/api/predecir/lote', json={'precio': 10})
+    assert respuesta.status_code == 400
+    respuesta = cliente.post('/api/predecir/lote', json=[{'precio': 10, 'rating': 4.1}])
+    assert respuesta.status_code == 400
+    assert 'año' in respuesta.get_json()['detalles'][0]
+    print("✅ Entradas inválidas rechazadas con 400")
+
+
+if __name__ == "__main__":
+    test_lote_igual_que_individual()
+    test_endpoint_lote_valida_entrada()
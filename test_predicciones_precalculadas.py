@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Script para probar las predicciones precalculadas cuando datos_scraping/ no admite escritura
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import predicciones_precalculadas
+from predicciones_precalculadas import GestorPredicciones, cargar_predicciones, ruta_predicciones
+
+
+def crear_artefactos():
+    X = np.random.RandomState(0).rand(60, 3) * [50, 1, 1000] + [5, 4, 0]
+    le_target = LabelEncoder()
+    y = le_target.fit_transform(np.resize(['Bueno', 'Excelente'], 60))
+    scaler = StandardScaler().fit(X)
+    modelo = RandomForestClassifier(n_estimators=5, random_state=42).fit(scaler.transform(X), y)
+    return SimpleNamespace(nombre='vivino', version=1, modelo=modelo, scaler=scaler, label_encoder=le_target)
+
+
+def crear_df():
+    return pd.DataFrame({'url': [f'https://www.vivino.com/w/{n}' for n in range(5)],
+                         'precio_eur': [10.0, 20.0, 30.0, 40.0, None],
+                         'rating': [4.0, 4.2, 4.4, 4.1, 4.3],
+                         'num_reviews': [100, 200, 300, 400, 500]})
+
+
+def test_guardado_en_cache_si_datos_no_admite_escritura():
+    print("🧪 PROBANDO PREDICCIONES CON datos_scraping/ DE SOLO LECTURA")
+    base = Path(tempfile.mkdtemp())
+    # Un CSV cuyo directorio no se puede crear hace fallar la escritura junto a él
+    (base / 'datos_scraping').write_text('no es un directorio')
+    ruta_csv = base / 'datos_scraping' / 'vinos.csv'
+    cache = base / 'cache'
+    original = predicciones_precalculadas.Config.CACHE_DIR
+    predicciones_precalculadas.Config.CACHE_DIR = cache
+    try:
+        df, artefactos = crear_df(), crear_artefactos()
+        gestor = GestorPredicciones('vivino')
+        gestor._ruta_csv, gestor._df = ruta_csv, df
+        predicciones = gestor.actualizar(artefactos)
+        assert predicciones is not None and gestor.vigentes(artefactos, df) is predicciones
+        assert ruta_predicciones(ruta_csv, 'vivino', 1, cache).exists()
+        assert predicciones.prediccion[4] is None and predicciones.prediccion[0] in ('Bueno', 'Excelente')
+
+        # Otro worker las lee de la caché sin recalcular
+        leidas = cargar_predicciones(ruta_csv, df, artefactos)
+        assert list(leidas.prediccion) == list(predicciones.prediccion)
+
+        # Sin ningún directorio escribible se quedan en memoria
+        predicciones_precalculadas.Config.CACHE_DIR = base / 'datos_scraping' / 'cache'
+        artefactos.version = 2
+        predicciones = gestor.actualizar(artefactos)
+        assert predicciones is not None and gestor.vigentes(artefactos, df) is predicciones
+    finally:
+        predicciones_precalculadas.Config.CACHE_DIR = original
+    print("✅ Artefacto en la caché de la app y, si tampoco se puede, predicciones en memoria")
+
+
+def test_solo_se_conservan_las_versiones_retenidas():
+    print("🧪 PROBANDO QUE LAS RECARGAS NO ACUMULAN ARTEFACTOS")
+    ruta_csv = Path(tempfile.mkdtemp()) / 'vinos.csv'
+    df, artefactos = crear_df(), crear_artefactos()
+    gestor = GestorPredicciones('vivino')
+    gestor._ruta_csv, gestor._df = ruta_csv, df
+    # Otro CSV y otro modelo en el mismo directorio no se tocan
+    ajenos = [ruta_predicciones(ruta_csv.with_name('otros.csv'), 'vivino', 1),
+              ruta_predicciones(ruta_csv, 'completo', 1)]
+    for ajeno in ajenos:
+        ajeno.write_text('url\n')
+    for version in range(1, 6):
+        artefactos.version = version
+        gestor.actualizar(artefactos)
+        time.sleep(0.01)  # mtimes distintos
+    retenidas = predicciones_precalculadas.Config.MODEL_VERSIONS_RETENIDAS
+    quedan = sorted(ruta.name for ruta in ruta_csv.parent.glob('predicciones_vivino_v*__vinos.csv'))
+    assert quedan == [ruta_predicciones(ruta_csv, 'vivino', v).name for v in range(6 - retenidas, 6)]
+    assert all(ajeno.exists() for ajeno in ajenos)
+    print(f"✅ Tras 5 versiones quedan {len(quedan)} artefactos: {quedan}")
+
+
+if __name__ == "__main__":
+    test_guardado_en_cache_si_datos_no_admite_escritura()
+    test_solo_se_conservan_las_versiones_retenidas()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Script para probar el ranking vectorizado de recomendaciones
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config_sommelier import Config
+from ranking_vinos import CARACTERISTICAS_RANKING, MatrizRanking, vector_pesos
+
+
+def crear_catalogo(n, semilla=0):
+    rng = np.random.RandomState(semilla)
+    return pd.DataFrame({
+        'rating': rng.uniform(3.8, 4.8, n).round(2),
+        'num_reviews': rng.randint(1, 5000, n).astype(float),
+        'posicion_global': np.arange(1, n + 1, dtype=float),
+        'precio_eur': rng.uniform(5, 100, n).round(2),
+    })
+
+
+def test_top_k_igual_que_orden_completo():
+    print("🧪 PROBANDO TOP-K CON ARGPARTITION")
+    df = crear_catalogo(20000)
+    ranking = MatrizRanking(df)
+    pesos = vector_pesos(Config.FEATURE_WEIGHTS)
+    candidatos = np.flatnonzero(df['precio_eur'].between(10, 40).to_numpy())
+
+    top = ranking.top_k(candidatos, pesos, 6)
+    puntuaciones = ranking.matriz[candidatos] @ pesos
+    esperado = candidatos[np.argsort(-puntuaciones, kind='stable')[:6]]
+    assert top.tolist() == esperado.tolist()
+    assert ranking.top_k(candidatos[:3], pesos, 6).size == 3
+    assert ranking.top_k(candidatos[:0], pesos, 6).size == 0
+    print(f"✅ Top 6 de {len(candidatos)} candidatos: {top.tolist()}")
+
+
+def test_pesos_por_gusto():
+    print("🧪 PROBANDO PESOS POR GUSTO")
+    assert len(vector_pesos(Config.FEATURE_WEIGHTS)) == len(CARACTERISTICAS_RANKING)
+    for gusto in Config.GUSTOS:
+        pesos = vector_pesos(Config.FEATURE_WEIGHTS, Config.PESOS_POR_GUSTO.get(gusto))
+        assert abs(pesos.sum() - 1) < 1e-9, gusto
+
+    df = crear_catalogo(2000, semilla=1)
+    ranking = MatrizRanking(df)
+    todos = np.arange(len(df))
+    economico = ranking.top_k(todos, vector_pesos(Config.FEATURE_WEIGHTS, Config.PESOS_POR_GUSTO['economico']), 6)
+    premium = ranking.top_k(todos, vector_pesos(Config.FEATURE_WEIGHTS, Config.PESOS_POR_GUSTO['premium']), 6)
+    assert df['precio_eur'].iloc[economico].mean() < df['precio_eur'].iloc[premium].mean()
+    assert df['rating'].iloc[premium].mean() >= df['rating'].iloc[economico].mean()
+    print("✅ 'economico' elige vinos más baratos y 'premium' mejor valorados")
+
+
+if __name__ == "__main__":
+    test_top_k_igual_que_orden_completo()
+    test_pesos_por_gusto()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Script para probar el registro de modelos y la recarga en caliente
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from registro_modelos import RegistroModelos
+
+
+def crear_modelo_vivino(directorio, clases):
+    """Entrena un modelo mínimo con el formato de 'modelos generados'"""
+    X = np.random.RandomState(0).rand(60, 3) * [50, 1, 1000] + [5, 4, 0]
+    y = np.resize(clases, 60)
+    le_target = LabelEncoder()
+    y_encoded = le_target.fit_transform(y)
+    scaler = StandardScaler().fit(X)
+    clf = RandomForestClassifier(n_estimators=5, random_state=42).fit(scaler.transform(X), y_encoded)
+    joblib.dump({'model': clf, 'le_target': le_target}, directorio / 'modelo_random_forest_vivino.pkl')
+    joblib.dump(scaler, directorio / 'scaler_vivino.pkl')
+
+
+def crear_config(directorio):
+    class ConfigPrueba:
+        VIVINO_MODEL_FILE = directorio / 'modelo_random_forest_vivino.pkl'
+        VIVINO_SCALER_FILE = directorio / 'scaler_vivino.pkl'
+        MODEL_VERSIONS_RETENIDAS = 3
+    return ConfigPrueba
+
+
+def test_registro_carga_una_vez():
+    print("🧪 PROBANDO REGISTRO DE MODELOS")
+    directorio = Path(tempfile.mkdtemp())
+    crear_modelo_vivino(directorio, ['Bueno', 'Excelente'])
+    registro = RegistroModelos(crear_config(directorio))
+
+    primero = registro.get_model('vivino')
+    segundo = registro.get_model('vivino')
+    assert primero is segundo, "El modelo se cargó dos veces"
+    assert registro.get_model('vivino', primero.version) is primero
+    print(f"✅ Modelo compartido entre peticiones: {primero}")
+
+
+def test_recarga_en_caliente():
+    print("🧪 PROBANDO RECARGA EN CALIENTE")
+    directorio = Path(tempfile.mkdtemp())
+    crear_modelo_vivino(directorio, ['Bueno', 'Excelente'])
+    registro = RegistroModelos(crear_config(directorio))
+    recargas = []
+    registro.al_recargar(lambda nombre, artefactos: recargas.append(artefactos.version))
+
+    # Una petición "en curso" conserva su referencia
+    en_curso = registro.get_model('vivino')
+
+    time.sleep(0.01)
+    crear_modelo_vivino(directorio, ['Bueno', 'Muy Bueno', 'Excelente'])
+    os.utime(directorio / 'scaler_vivino.pkl', (time.time() + 5, time.time() + 5))
+    assert list(registro.modelos_modificados()) == ['vivino']
+
+    nuevo = registro.recargar('vivino')
+    assert registro.get_model('vivino') is nuevo
+    assert en_curso is not nuevo
+    assert list(en_curso.label_encoder.classes_) == ['Bueno', 'Excelente']
+    assert len(nuevo.label_encoder.classes_) == 3
+    assert recargas == [nuevo.version]
+    print(f"✅ Versión anterior {en_curso.version} intacta, nueva {nuevo.version} publicada")
+
+
+def test_version_invalida_no_se_publica():
+    print("🧪 PROBANDO VALIDACIÓN DE ARTEFACTOS")
+    directorio = Path(tempfile.mkdtemp())
+    crear_modelo_vivino(directorio, ['Bueno', 'Excelente'])
+    registro = RegistroModelos(crear_config(directorio))
+    activo = registro.get_model('vivino')
+
+    # Scaler incompatible (4 características en lugar de 3)
+    joblib.dump(StandardScaler().fit(np.random.rand(10, 4)), directorio / 'scaler_vivino.pkl')
+    try:
+        registro.recargar('vivino')
+        raise AssertionError("Se publicó un modelo incoherente")
+    except ValueError as e:
+        print(f"✅ Versión rechazada: {e}")
+    assert registro.get_model('vivino') is activo
+
+
+if __name__ == "__main__":
+    test_registro_carga_una_vez()
+    test_recarga_en_caliente()
+    test_version_invalida_no_se_publica()
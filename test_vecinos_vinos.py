@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Script para probar el índice de vinos parecidos y /api/vinos/<id>/similares
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Configurar path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dataset_vinos import CatalogoVinos
+from vecinos_vinos import GestorVecinos, IndiceVecinos
+
+
+def crear_dataset():
+    return pd.DataFrame({
+        'precio_eur': [10.0, 10.5, 10.5, 60.0, 11.0],
+        'rating': [4.1, 4.1, 4.1, 4.7, 4.0],
+        'num_reviews': [100.0, 120.0, 120.0, 3000.0, None],
+        'año': pd.array([2020, 2020, 2020, 2015, None], dtype='Int64'),
+        'region': ['Rioja', 'Rioja', 'Rioja', 'Priorat', 'Rioja'],
+        'tipo_vino': ['Tinto', 'Tinto', 'Tinto', 'Tinto', 'Blanco'],
+        'clave_vino': np.array([1, 2, 2, 3, 4], dtype=np.int64),
+    })
+
+
+def test_vecinos_mas_cercanos():
+    print("🧪 PROBANDO VECINOS MÁS CERCANOS")
+    indice = IndiceVecinos(crear_dataset())
+    assert len(indice) == 4  # la copia de la clave 2 no entra
+
+    posiciones, distancias = indice.similares(1, 2)
+    assert posiciones.tolist() == [1, 4], posiciones  # mismo tipo y región antes que el blanco
+    assert np.all(np.diff(distancias) >= 0)
+    assert indice.similares(99, 3) is None
+    assert len(indice.similares(1, 10)[0]) == 3  # nunca se devuelve a sí mismo
+
+    # Vinos distintos con las mismas características: empatan a distancia 0 con el
+    # propio vino y nunca se devuelven más de k
+    iguales = pd.DataFrame({'precio_eur': [10.0] * 5, 'rating': [4.1] * 5, 'num_reviews': [100.0] * 5,
+                            'año': [2020] * 5, 'region': ['Rioja'] * 5, 'tipo_vino': ['Tinto'] * 5,
+                            'clave_vino': np.arange(1, 6, dtype=np.int64)})
+    indice_iguales = IndiceVecinos(iguales)
+    for clave in range(1, 6):
+        for k in (1, 2, 3):
+            posiciones_iguales, distancias_iguales = indice_iguales.similares(clave, k)
+            assert len(posiciones_iguales) == len(distancias_iguales) == k
+            assert clave - 1 not in posiciones_iguales.tolist()
+    print(f"✅ Vecinos de la clave 1: {posiciones.tolist()} (distancias {np.round(distancias, 3).tolist()})")
+
+
+def test_reconstruccion_en_segundo_plano():
+    print("🧪 PROBANDO RECONSTRUCCIÓN AL RECARGAR")
+    gestor = GestorVecinos()
+    anterior = CatalogoVinos(crear_dataset())
+    gestor.construir(anterior)
+    nuevo = CatalogoVinos(crear_dataset().head(3))
+    gestor.al_recargar(nuevo)
+    for _ in range(100):
+        if gestor.actual[0] is nuevo:
+            break
+        time.sleep(0.01)
+    catalogo, indice = gestor.actual
+    assert catalogo is nuevo and len(indice) == 2
+    print("✅ El índice nuevo se publica junto a su catálogo")
+
+
+def test_endpoint_similares():
+    print("🧪 PROBANDO /api/vinos/<id>/similares")
+    import app_sommelier
+    cliente = app_sommelier.app.test_client()
+    assert cliente.get('/api/vinos/12345/similares').status_code == 404
+    catalogo = app_sommelier.gestor_catalogo.actual
+    if catalogo.df.empty:
+        print("❌ No hay datos de vinos")
+        return
+    assert cliente.get('/api/vinos/no-es-un-id/similares').status_code == 404
+    # Las claves de 64 bits viajan como texto: un cliente JS no las redondea
+    clave = str(int(catalogo.df['clave_vino'].iloc[0]))
+    datos = cliente.get(f'/api/vinos/{clave}/similares?k=4').get_json()
+    assert datos['vino']['clave_vino'] == clave
+    assert datos['total'] == 4 and all(v['clave_vino'] != clave for v in datos['similares'])
+    # El id de una respuesta sirve tal cual para pedir sus vecinos
+    otra = datos['similares'][0]['clave_vino']
+    assert isinstance(otra, str) and cliente.get(f'/api/vinos/{otra}/similares').status_code == 200
+    print(f"✅ {datos['total']} vinos parecidos a {datos['vino']['nombre_limpio']}")
+
+
+if __name__ == "__main__":
+    test_vecinos_mas_cercanos()
+    test_reconstruccion_en_segundo_plano()
+    test_endpoint_similares()
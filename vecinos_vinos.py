@@ -0,0 +1,112 @@
+# Índice espacial para "vinos parecidos a este"
+"""
+KD-tree (``sklearn.neighbors.KDTree``) sobre características estandarizadas
+de cada vino:
+
+- log(precio), rating, log(1 + reviews) y añada, estandarizados (media 0,
+  desviación 1; los nulos toman la media);
+- ``region`` y ``tipo_vino`` en one-hot (0/1).
+
+Solo entra una fila por ``clave_vino``: los vecinos de un vino son siempre
+vinos distintos y nunca una copia de él mismo.
+
+El índice se construye junto al catálogo. Cuando el catálogo se recarga, el
+nuevo índice se construye en segundo plano. Mientras tanto se sigue
+respondiendo con el par (catálogo, índice) anterior, que es coherente.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+CARACTERISTICAS_NUMERICAS = ['precio_eur', 'rating', 'num_reviews', 'año']
+CARACTERISTICAS_CATEGORICAS = ['region', 'tipo_vino']
+
+
+def _estandarizar(valores):
+    valores = np.asarray(valores, dtype=np.float64)
+    validos = ~np.isnan(valores)
+    if not validos.any():
+        return np.zeros(len(valores))
+    media = valores[validos].mean()
+    desviacion = valores[validos].std()
+    valores = np.where(validos, valores, media)
+    return (valores - media) / desviacion if desviacion > 0 else valores - media
+
+
+def calcular_caracteristicas(df):
+    """Matriz de características (filas alineadas con df) para el KD-tree"""
+    def numerica(columna):
+        if columna not in df.columns:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df[columna], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+    precio = numerica('precio_eur')
+    bloques = [
+        _estandarizar(np.log(np.where(precio > 0, precio, np.nan))),
+        _estandarizar(numerica('rating')),
+        _estandarizar(np.log1p(numerica('num_reviews'))),
+        _estandarizar(numerica('año')),
+    ]
+    for columna in CARACTERISTICAS_CATEGORICAS:
+        if columna in df.columns:
+            one_hot = pd.get_dummies(df[columna].astype(object), dtype=np.float64).to_numpy()
+            bloques.extend(one_hot.T)
+    return np.column_stack(bloques) if len(df) else np.zeros((0, len(bloques)))
+
+
+class IndiceVecinos:
+    """KD-tree de vinos únicos con búsqueda por clave_vino"""
+
+    def __init__(self, df):
+        if 'clave_vino' in df.columns:
+            unicos = ~df['clave_vino'].duplicated().to_numpy()
+            self.claves = df['clave_vino'].to_numpy()[unicos]
+        else:
+            unicos = np.ones(len(df), dtype=bool)
+            self.claves = np.arange(len(df), dtype=np.int64)
+        self.posiciones = np.flatnonzero(unicos)
+        self.por_clave = {clave: i for i, clave in enumerate(self.claves.tolist())}
+        self.caracteristicas = calcular_caracteristicas(df)[self.posiciones]
+        self.arbol = KDTree(self.caracteristicas) if len(self.posiciones) else None
+
+    def __len__(self):
+        return len(self.posiciones)
+
+    def posicion(self, clave):
+        """Posición en el dataset del vino con esa clave, o None"""
+        fila = self.por_clave.get(clave)
+        return None if fila is None else int(self.posiciones[fila])
+
+    def similares(self, clave, k):
+        """(posiciones, distancias) de los k vinos más cercanos, o None si la clave no existe"""
+        fila = self.por_clave.get(clave)
+        if fila is None or self.arbol is None:
+            return None
+        distancias, filas = self.arbol.query(self.caracteristicas[fila:fila + 1], k=min(k + 1, len(self.posiciones)))
+        distancias, filas = distancias[0], filas[0]
+        # Con empates a distancia 0 el propio vino puede no salir entre los k + 1
+        otros = filas != fila
+        return self.posiciones[filas[otros]][:k], distancias[otros][:k]
+
+
+class GestorVecinos:
+    """Par (catálogo, índice) activo; el índice de un catálogo nuevo se construye en segundo plano"""
+
+    def __init__(self):
+        self.actual = None
+        self._lock = threading.Lock()
+
+    def construir(self, catalogo):
+        indice = IndiceVecinos(catalogo.df)
+        with self._lock:
+            # Una construcción más lenta de un catálogo anterior no pisa a una más reciente
+            if self.actual is None or self.actual[0].cargado_en <= catalogo.cargado_en:
+                self.actual = (catalogo, indice)
+        print(f"🧭 Índice de vecinos construido: {len(indice)} vinos únicos")
+        return indice
+
+    def al_recargar(self, catalogo):
+        threading.Thread(target=self.construir, args=(catalogo,),
+                         name='indice-vecinos', daemon=True).start()
@@ -0,0 +1,65 @@
+# Vigilancia de archivos para recargas en caliente
+"""
+Hilo genérico que detecta cambios en archivos por fecha de modificación.
+
+Un cambio solo se aplica cuando la firma de los archivos se mantiene estable
+durante un intervalo completo, para no leer un archivo a medio escribir. Lo
+usan el registro de modelos y el catálogo de vinos.
+"""
+import os
+import threading
+
+
+def firma_archivos(rutas):
+    """Tupla (ruta, mtime, tamaño) de los archivos; cambia cuando se reescriben"""
+    firma = []
+    for ruta in rutas:
+        if ruta is None:
+            continue
+        try:
+            stat = os.stat(ruta)
+            firma.append((str(ruta), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            firma.append((str(ruta), None, None))
+    return tuple(firma)
+
+
+class VigilanteCambios(threading.Thread):
+    """Comprueba cada `intervalo` segundos qué elementos han cambiado y los recarga.
+
+    - ``detectar()`` devuelve ``{clave: firma}`` con los elementos modificados.
+    - ``aplicar(clave)`` carga la nueva versión; si lanza una excepción, la
+      versión activa sigue sirviendo y se reintenta en la próxima vuelta.
+    """
+
+    def __init__(self, nombre, detectar, aplicar, intervalo):
+        super().__init__(name=nombre, daemon=True)
+        self.detectar = detectar
+        self.aplicar = aplicar
+        self.intervalo = intervalo
+        self.pid = os.getpid()
+        self._parar = threading.Event()
+        self._pendientes = {}  # clave -> firma vista en la comprobación anterior
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            self.comprobar()
+
+    def comprobar(self):
+        for clave, firma in self.detectar().items():
+            if self._pendientes.get(clave) != firma:
+                # Primera vez que vemos esta firma: esperar a que se estabilice
+                self._pendientes[clave] = firma
+                continue
+            try:
+                self.aplicar(clave)
+                self._pendientes.pop(clave, None)
+            except Exception as e:
+                print(f"⚠️ Nueva versión de '{clave}' descartada: {e}")
+
+    def activo_en_este_proceso(self):
+        # Tras un fork (gunicorn --preload) el hilo del padre no existe en el hijo
+        return self.pid == os.getpid() and self.is_alive()
+
+    def detener(self):
+        self._parar.set()